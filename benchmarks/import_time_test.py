@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+PROJECT_DIRECTORY = os.path.dirname(BENCHMARK_DIRECTORY)
+STUB_DIRECTORY = os.path.join(BENCHMARK_DIRECTORY, 'stubs')
+PACKAGE_NAME = 'mouse_position_storage_import'
+FILES_COPIED_TO_PACKAGE = shutil.ignore_patterns('.git', 'positions', 'data', '__pycache__')
+#Generous enough for slow machines while still failing if importing starts loading positions or slow standard library modules
+IMPORT_TIME_BUDGET_IN_SECONDS = 0.5
+WARM_UP_TIMEOUT_IN_SECONDS = 10
+#Runs in a fresh interpreter so that modules imported by the tests do not hide what importing the mouse position storage imports
+#Talon loads every module in the user directory as part of a package, so every module is imported that way, including the benchmarks
+#Test files are left out because Talon cannot import the top level ones and unittest itself imports argparse. json is only imported after measuring
+IMPORT_SCRIPT = '''
+import importlib, os, sys, threading, time, traceback
+sys.path.insert(0, sys.argv[1])
+sys.path.insert(0, sys.argv[2])
+module_names = []
+for directory, _, filenames in os.walk(os.path.join(sys.argv[2], '{package}')):
+    for filename in sorted(filenames):
+        if filename.endswith('.py') and not filename.endswith('_test.py'):
+            module_path = os.path.relpath(os.path.join(directory, filename[:-len('.py')]), sys.argv[2])
+            module_names.append(module_path.replace(os.sep, '.').replace('.__init__', ''))
+modules_before_import = set(sys.modules)
+threads_before_import = threading.active_count()
+failed_modules = []
+start = time.perf_counter()
+import talon
+for module_name in sorted(module_names):
+    try:
+        importlib.import_module(module_name)
+    except Exception:
+        traceback.print_exc()
+        failed_modules.append(module_name)
+import_duration = time.perf_counter() - start
+new_modules = sorted(set(sys.modules) - modules_before_import)
+mouse_storage = sys.modules['{package}.mouse_storage']
+result = {{
+    'import_duration': import_duration,
+    'new_modules': new_modules,
+    'failed_modules': failed_modules,
+    'new_thread_count': threading.active_count() - threads_before_import,
+    'loaded_before_ready': mouse_storage.commands.position_storage is not None or bool(mouse_storage.commands.reference_points),
+}}
+for handler in talon.event_handlers['ready']:
+    handler()
+deadline = time.perf_counter() + {timeout}
+while not mouse_storage.commands.reference_points and time.perf_counter() < deadline:
+    time.sleep(0.01)
+with mouse_storage.commands.position_lock:
+    result['loaded_after_ready'] = mouse_storage.commands.position_storage is not None and bool(mouse_storage.commands.reference_points)
+    result['warm_position_count'] = len(mouse_storage.commands.position_index.get_stored_positions_with_name('stored'))
+import json
+print(json.dumps(result))
+'''
+
+
+class TestImportTime(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.package_directory = os.path.join(self.directory.name, PACKAGE_NAME)
+        shutil.copytree(PROJECT_DIRECTORY, self.package_directory, ignore = FILES_COPIED_TO_PACKAGE)
+        position_directory = os.path.join(self.package_directory, 'positions', 'stored')
+        os.makedirs(position_directory)
+        with open(os.path.join(position_directory, '0.txt'), 'w') as position_file:
+            position_file.write('(1, 2)\nPositionRelativity.ABSOLUTE')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def import_mouse_storage(self):
+        script = IMPORT_SCRIPT.format(package = PACKAGE_NAME, timeout = WARM_UP_TIMEOUT_IN_SECONDS)
+        completed_process = subprocess.run([sys.executable, '-c', script, STUB_DIRECTORY, self.directory.name], check = True, capture_output = True, text = True)
+        return json.loads(completed_process.stdout.splitlines()[-1])
+
+    def test_import_stays_within_budget(self):
+        result = self.import_mouse_storage()
+        self.assertLess(result['import_duration'], IMPORT_TIME_BUDGET_IN_SECONDS)
+
+    def test_import_loads_nothing_until_ready(self):
+        result = self.import_mouse_storage()
+        self.assertFalse(result['loaded_before_ready'])
+        self.assertEqual(0, result['new_thread_count'])
+        self.assertFalse(os.path.exists(os.path.join(self.package_directory, 'data')))
+
+    def test_import_skips_modules_only_needed_later(self):
+        result = self.import_mouse_storage()
+        for module_name in ['sqlite3', 'tempfile', 'json', 'argparse']:
+            self.assertNotIn(module_name, result['new_modules'])
+
+    def test_every_module_imports_only_within_package(self):
+        result = self.import_mouse_storage()
+        project_module_names = {filename[:-len('.py')] for filename in os.listdir(PROJECT_DIRECTORY) if filename.endswith('.py')}
+        self.assertEqual([], result['failed_modules'])
+        self.assertEqual([], [module_name for module_name in result['new_modules'] if module_name in project_module_names])
+
+    def test_ready_warms_up_positions_in_background(self):
+        result = self.import_mouse_storage()
+        self.assertTrue(result['loaded_after_ready'])
+        self.assertEqual(1, result['warm_position_count'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#Compares the position file parser against the parser it replaced, which used an exception to reject every line that was not a context field
+#Example: python benchmarks/parser_benchmark.py --files 2000
+import os
+import sys
+import time
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+PROJECT_DIRECTORY = os.path.dirname(BENCHMARK_DIRECTORY)
+
+
+#Talon loads every file in the user directory, so the project is only put on the module path and imported when the benchmark runs
+def import_project_modules():
+    global MousePosition, PositionContext, PositionFileData, PositionRelativity, ContextDataNotFound, STORED_POSITION_RELATIVITY_START, text_from_string_after_substring
+    sys.path.insert(0, PROJECT_DIRECTORY)
+    from project_types import MousePosition, PositionContext, PositionFileData, PositionRelativity, ContextDataNotFound, STORED_POSITION_RELATIVITY_START, text_from_string_after_substring
+
+class LegacyPositionFileData:
+    def __init__(self, path):
+        self.position = None
+        self.context = PositionContext()
+        self.relativity = PositionRelativity.ABSOLUTE
+        with open(path, 'r') as position_file:
+            for line in position_file:
+                self._get_data_from_line(line.rstrip('\n\r'))
+
+    def _get_data_from_line(self, line):
+        try:
+            self.context.receive_field_from_line(line)
+            return
+        except ContextDataNotFound:
+            pass
+        if line.startswith(STORED_POSITION_RELATIVITY_START):
+            self.relativity = PositionRelativity[text_from_string_after_substring(line, STORED_POSITION_RELATIVITY_START)]
+            return
+        if line:
+            self.position = legacy_position_from_text(line)
+
+def legacy_position_from_text(text):
+    horizontal_start = text.index(MousePosition.STRING_START) + 1
+    horizontal_ending = text.index(MousePosition.COORDINATE_SEPARATOR)
+    horizontal = int(text[horizontal_start : horizontal_ending])
+    vertical_start = horizontal_ending + 1
+    vertical_ending = text.index(MousePosition.STRING_ENDING)
+    vertical = int(text[vertical_start : vertical_ending])
+    return MousePosition(horizontal, vertical)
+
+def create_position_files(directory, count):
+    paths = []
+    relativities = list(PositionRelativity)
+    for number in range(count):
+        context = PositionContext(f'application {number % 7}', f'part {number}' if number % 2 else '', 'editing' if number % 3 == 0 else '')
+        data = PositionFileData.from_values(MousePosition(number, -number), context, relativities[number % len(relativities)])
+        path = os.path.join(directory, f'{number}.txt')
+        with open(path, 'w') as position_file:
+            position_file.write(data.get_file_text())
+        paths.append(path)
+    return paths
+
+def describe(data):
+    context = data.context
+    return (data.position.get_horizontal(), data.position.get_vertical(), context.app, context.title_part, context.mouse_position_mode, data.relativity)
+
+def time_parser(parser, paths, repetitions):
+    best_duration = None
+    for _ in range(repetitions):
+        start_time = time.perf_counter()
+        for path in paths:
+            parser(path)
+        duration = time.perf_counter() - start_time
+        if best_duration is None or duration < best_duration:
+            best_duration = duration
+    return best_duration
+
+def main():
+    import argparse
+    import tempfile
+    import_project_modules()
+    parser = argparse.ArgumentParser(description = 'Compares the current position file parser with the legacy parser')
+    parser.add_argument('--files', type = int, default = 2000)
+    parser.add_argument('--repetitions', type = int, default = 5)
+    arguments = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = create_position_files(directory, arguments.files)
+        for path in paths:
+            if describe(PositionFileData(path)) != describe(LegacyPositionFileData(path)):
+                raise AssertionError(f'The parsers disagree about {path}')
+        legacy_duration = time_parser(LegacyPositionFileData, paths, arguments.repetitions)
+        current_duration = time_parser(PositionFileData, paths, arguments.repetitions)
+    print(f'legacy parser: {legacy_duration/arguments.files*1_000_000:.2f}us per file')
+    print(f'current parser: {current_duration/arguments.files*1_000_000:.2f}us per file')
+    print(f'speedup: {legacy_duration/current_duration:.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#Measures how storing, updating, removing, and walking to mouse positions scale with the number of stored positions outside of Talon using the simulated platform
+#Example: python benchmarks/storage_benchmark.py --names 100 --contexts 20 --output results.json --compare previous_results.json
+import builtins
+import contextlib
+import os
+import platform
+import random
+import sys
+import time
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+PROJECT_DIRECTORY = os.path.dirname(BENCHMARK_DIRECTORY)
+SYSTEM_CALLS = {
+    os: ['stat', 'lstat', 'listdir', 'scandir', 'mkdir', 'makedirs', 'remove', 'replace', 'rename'],
+    builtins: ['open'],
+}
+
+
+#Talon loads every file in the user directory, so the project is only put on the module path and imported when the benchmark runs
+def import_project_modules():
+    global MousePosition, PositionContext, PositionFileData, PositionRelativity, PositionIndex, PositionCommands, PositionSettings, SimulatedPlatform, ActiveWindow, WINDOW_RECTANGLE
+    sys.path.insert(0, PROJECT_DIRECTORY)
+    from project_types import MousePosition, PositionContext, PositionFileData, PositionRelativity
+    from position_index import PositionIndex
+    from position_commands import PositionCommands, PositionSettings
+    from platform_adapter import SimulatedPlatform, ActiveWindow
+    from window_geometry import WindowRectangle
+    WINDOW_RECTANGLE = WindowRectangle(0, 0, 1920, 1080)
+
+#Counts calls to the functions that reach the filesystem while active
+class SystemCallCounter:
+    def __init__(self):
+        self.counts = {}
+        self.original_functions = []
+
+    def __enter__(self):
+        for module, function_names in SYSTEM_CALLS.items():
+            for function_name in function_names:
+                original_function = getattr(module, function_name)
+                self.original_functions.append((module, function_name, original_function))
+                setattr(module, function_name, self._create_counting_function(function_name, original_function))
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        for module, function_name, original_function in self.original_functions:
+            setattr(module, function_name, original_function)
+        self.original_functions = []
+
+    def _create_counting_function(self, function_name, original_function):
+        def counting_function(*arguments, **keyword_arguments):
+            self.counts[function_name] = self.counts.get(function_name, 0) + 1
+            return original_function(*arguments, **keyword_arguments)
+        return counting_function
+
+def compute_percentile(sorted_values, percentile):
+    index = round(percentile/100*(len(sorted_values) - 1))
+    return sorted_values[index]
+
+#Times the operation once for every set of arguments while discarding anything it prints
+def measure(operation, arguments_list):
+    durations = []
+    with open(os.devnull, 'w') as null_output, contextlib.redirect_stdout(null_output), SystemCallCounter() as counter:
+        for arguments in arguments_list:
+            start_time = time.perf_counter()
+            operation(*arguments)
+            durations.append(time.perf_counter() - start_time)
+    return summarize(durations, counter.counts)
+
+def summarize(durations, system_call_counts):
+    sorted_durations_in_microseconds = sorted(duration*1_000_000 for duration in durations)
+    operation_count = len(durations)
+    return {
+        'operations': operation_count,
+        'p50_microseconds': compute_percentile(sorted_durations_in_microseconds, 50),
+        'p99_microseconds': compute_percentile(sorted_durations_in_microseconds, 99),
+        'mean_microseconds': sum(sorted_durations_in_microseconds)/operation_count,
+        'system_calls_per_operation': {name: count/operation_count for name, count in sorted(system_call_counts.items())},
+    }
+
+#Runs the commands against a store in the directory so that the benchmark never touches the real positions directory
+def create_commands(directory, backend, compact_index):
+    return PositionCommands(SimulatedPlatform(), PositionSettings({'backend': backend, 'compact_index': compact_index}), directory)
+
+def create_context(context_number):
+    app = f'application {context_number//4}'
+    title_part = f'part {context_number}' if context_number % 2 else ''
+    mode = 'editing' if context_number % 4 >= 2 else ''
+    return PositionContext(app, title_part, mode)
+
+def create_synthetic_positions(commands, name_count, context_count):
+    storage = commands.get_position_storage()
+    locations = []
+    for name_number in range(name_count):
+        name = f'name {name_number}'
+        for context_number in range(context_count):
+            position = MousePosition(name_number, context_number)
+            data = PositionFileData.from_values(position, create_context(context_number), PositionRelativity.WINDOW)
+            location = storage.create_location(name)
+            storage.write(name, location, data)
+            locations.append(location)
+    commands.position_index.load(storage)
+    return locations
+
+def create_active_contexts(context_count, count, generator):
+    active_contexts = []
+    for _ in range(count):
+        context_number = generator.randrange(context_count)
+        title = f'window showing part {context_number}'
+        mode = generator.choice(['', 'editing'])
+        active_contexts.append(PositionContext(f'application {context_number//4}', title, mode))
+    return active_contexts
+
+def set_active_window(commands, context):
+    commands.platform.set_active_window(ActiveWindow(context.app, context.title_part, WINDOW_RECTANGLE))
+    commands.set_manually_set_mouse_position_mode(context.mouse_position_mode)
+
+def walk(commands, name, context):
+    set_active_window(commands, context)
+    commands.go_to_mouse_position(name)
+
+def store_update_and_remove(commands, name):
+    commands.store_current_mouse_position_with_name(name)
+    commands.update_mouse_position_with_name(name)
+    commands.remove_mouse_position_with_name(name)
+
+def load_index(commands):
+    index = PositionIndex(compact = commands.get_position_index().is_compact())
+    index.load(commands.get_position_storage())
+
+def run_benchmarks(arguments, directory):
+    commands = create_commands(directory, arguments.backend, arguments.compact_index)
+    generator = random.Random(arguments.seed)
+    locations = create_synthetic_positions(commands, arguments.names, arguments.contexts)
+    names = [f'name {generator.randrange(arguments.names)}' for _ in range(arguments.iterations)]
+    active_contexts = create_active_contexts(arguments.contexts, arguments.iterations, generator)
+    results = {
+        'index_load': measure(load_index, [(commands,)]*arguments.load_iterations),
+        'best_match_lookup': measure(commands.get_location_with_specified_name_best_matching_context, list(zip(names, active_contexts))),
+        'walk': measure(walk, [(commands, name, context) for name, context in zip(names, active_contexts)]),
+        'store_update_remove': measure(store_update_and_remove, [(commands, f'new name {number}') for number in range(arguments.iterations)]),
+    }
+    if arguments.backend == 'FILES':
+        paths = [generator.choice(locations) for _ in range(arguments.iterations)]
+        results['position_file_parse'] = measure(PositionFileData, [(path,) for path in paths])
+    commands.close_position_storage()
+    return results
+
+def compare_results(results, previous_results):
+    for benchmark_name, result in results.items():
+        previous_result = previous_results.get(benchmark_name)
+        if not previous_result:
+            continue
+        for statistic in ['p50_microseconds', 'p99_microseconds']:
+            change = (result[statistic] - previous_result[statistic])/previous_result[statistic]*100
+            print(f'{benchmark_name} {statistic}: {previous_result[statistic]:.1f} -> {result[statistic]:.1f} ({change:+.1f}%)')
+
+def print_results(results):
+    for benchmark_name, result in results.items():
+        system_calls = ', '.join(f'{name} {count:.2f}' for name, count in result['system_calls_per_operation'].items())
+        print(f'{benchmark_name}: p50 {result["p50_microseconds"]:.1f}us p99 {result["p99_microseconds"]:.1f}us calls per operation: {system_calls or "none"}')
+
+def parse_arguments():
+    import argparse
+    parser = argparse.ArgumentParser(description = 'Benchmarks the mouse position storage outside of Talon')
+    parser.add_argument('--names', type = int, default = 50, help = 'How many position names to generate')
+    parser.add_argument('--contexts', type = int, default = 20, help = 'How many contexts to generate for every name')
+    parser.add_argument('--iterations', type = int, default = 1000, help = 'How many times to run every operation')
+    parser.add_argument('--load-iterations', type = int, default = 5, help = 'How many times to load the whole index')
+    parser.add_argument('--backend', choices = ['FILES', 'DATABASE'], default = 'FILES')
+    parser.add_argument('--compact-index', action = 'store_true', help = 'Keep the stored positions in columns instead of one object per position')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--output', help = 'Path to save the results as JSON')
+    parser.add_argument('--compare', help = 'Path to results saved by a previous run to compare against')
+    return parser.parse_args()
+
+def main():
+    import json
+    import tempfile
+    import_project_modules()
+    arguments = parse_arguments()
+    with tempfile.TemporaryDirectory() as directory:
+        results = run_benchmarks(arguments, directory)
+    print_results(results)
+    if arguments.compare:
+        with open(arguments.compare, 'r') as previous_results_file:
+            compare_results(results, json.load(previous_results_file)['results'])
+    if arguments.output:
+        report = {
+            'parameters': vars(arguments),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }
+        with open(arguments.output, 'w') as output_file:
+            json.dump(report, output_file, indent = 4)
+
+if __name__ == '__main__':
+    main()
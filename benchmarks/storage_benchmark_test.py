@@ -0,0 +1,27 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'storage_benchmark.py')
+
+
+class TestStorageBenchmark(unittest.TestCase):
+    def test_saves_results_for_every_benchmark(self):
+        for backend in ['FILES', 'DATABASE']:
+            with tempfile.TemporaryDirectory() as directory:
+                output_path = os.path.join(directory, 'results.json')
+
+                subprocess.run([sys.executable, BENCHMARK_PATH, '--names', '3', '--contexts', '4', '--iterations', '5', '--load-iterations', '1',
+                    '--backend', backend, '--output', output_path], check = True, capture_output = True)
+
+                with open(output_path, 'r') as output_file:
+                    results = json.load(output_file)['results']
+                self.assertIn('walk', results)
+                self.assertEqual(5, results['best_match_lookup']['operations'])
+
+
+if __name__ == '__main__':
+    unittest.main()
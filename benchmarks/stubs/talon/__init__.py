@@ -0,0 +1,82 @@
+#A minimal stand in for the talon module so that the mouse position storage can be imported and benchmarked outside of Talon
+
+class _Namespace:
+    pass
+
+class _Setting:
+    def __init__(self, name, default):
+        self.name = name
+        self.value = default
+    def get(self):
+        return self.value
+
+settings_by_name = {}
+
+class Module:
+    def setting(self, name, type = None, default = None, desc = ''):
+        setting = _Setting(name, default)
+        settings_by_name[name] = setting
+        return setting
+
+    def action_class(self, action_class):
+        for name, action in vars(action_class).items():
+            if callable(action) and not name.startswith('_'):
+                setattr(actions.user, name, action)
+        return action_class
+
+class _Rectangle:
+    def __init__(self, left, top, width, height):
+        self.left = left
+        self.top = top
+        self.x = left
+        self.y = top
+        self.width = width
+        self.height = height
+
+class _Application:
+    def __init__(self, name):
+        self.name = name
+
+class _Window:
+    def __init__(self, app_name, title, rectangle):
+        self.app = _Application(app_name)
+        self.title = title
+        self.rect = rectangle
+
+active_window = _Window('application', 'title', _Rectangle(0, 0, 1920, 1080))
+screens = [_Namespace()]
+screens[0].rect = _Rectangle(0, 0, 1920, 1080)
+mouse_position = [0, 0]
+notifications = []
+event_handlers = {}
+
+def _register(event, handler):
+    event_handlers.setdefault(event, []).append(handler)
+
+def _mouse_move(horizontal, vertical):
+    mouse_position[0] = horizontal
+    mouse_position[1] = vertical
+
+actions = _Namespace()
+actions.user = _Namespace()
+actions.app = _Namespace()
+actions.app.notify = lambda *arguments, **keyword_arguments: notifications.append(arguments)
+actions.mouse_move = _mouse_move
+actions.mouse_click = lambda button = 0: None
+actions.sleep = lambda duration: None
+
+ctrl = _Namespace()
+ctrl.mouse_pos = lambda: (mouse_position[0], mouse_position[1])
+
+ui = _Namespace()
+ui.active_window = lambda: active_window
+ui.register = _register
+ui.screens = lambda: screens
+
+app = _Namespace()
+app.register = _register
+
+cron = _Namespace()
+cron.interval = lambda interval, callback: None
+cron.after = lambda delay, callback: None
+cron.cancel = lambda job: None
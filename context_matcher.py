@@ -0,0 +1,100 @@
+from collections import deque
+
+
+#Finds every pattern contained in a text with a single pass over the text
+class AhoCorasickAutomaton:
+    def __init__(self, patterns):
+        self.transitions = [{}]
+        self.failures = [0]
+        self.outputs = [set()]
+        for pattern in patterns:
+            self._add_pattern(pattern)
+        self._compute_failures()
+
+    def _add_pattern(self, pattern):
+        state = 0
+        for character in pattern:
+            if character not in self.transitions[state]:
+                self.transitions.append({})
+                self.failures.append(0)
+                self.outputs.append(set())
+                self.transitions[state][character] = len(self.transitions) - 1
+            state = self.transitions[state][character]
+        self.outputs[state].add(pattern)
+
+    def _compute_failures(self):
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                failure = self.failures[state]
+                while failure and character not in self.transitions[failure]:
+                    failure = self.failures[failure]
+                self.failures[next_state] = self.transitions[failure].get(character, 0)
+                if self.failures[next_state] == next_state:
+                    self.failures[next_state] = 0
+                self.outputs[next_state] |= self.outputs[self.failures[next_state]]
+
+    def find_matches(self, text: str):
+        matches = set()
+        state = 0
+        for character in text:
+            while state and character not in self.transitions[state]:
+                state = self.failures[state]
+            state = self.transitions[state].get(character, 0)
+            if self.outputs[state]:
+                matches |= self.outputs[state]
+        return matches
+
+#Candidates sorted from most to least specific along with an automaton over their title parts
+class CandidateList:
+    def __init__(self, stored_positions):
+        self.stored_positions = sorted(stored_positions, key = lambda stored_position: stored_position.get_context().compute_specificity(), reverse = True)
+        self.automaton = None
+
+    def find_first_matching_title(self, title: str):
+        matching_title_parts = self._get_title_parts_in(title)
+        for stored_position in self.stored_positions:
+            title_part = stored_position.get_context().title_part
+            if not title_part or title_part in matching_title_parts:
+                return stored_position
+        return None
+
+    def _get_title_parts_in(self, title):
+        if self.automaton is None:
+            title_parts = [stored_position.get_context().title_part for stored_position in self.stored_positions]
+            self.automaton = AhoCorasickAutomaton([title_part for title_part in title_parts if title_part])
+        return self.automaton.find_matches(title)
+
+#The candidates for a single mouse position mode bucketed by application
+class ModeBucket:
+    def __init__(self, stored_positions):
+        application_independent = []
+        application_specific = {}
+        for stored_position in stored_positions:
+            app = stored_position.get_context().app
+            if app:
+                application_specific.setdefault(app, []).append(stored_position)
+            else:
+                application_independent.append(stored_position)
+        self.application_independent = CandidateList(application_independent)
+        self.application_specific = {app: CandidateList(candidates + application_independent) for app, candidates in application_specific.items()}
+
+    def get_candidates(self, app: str):
+        return self.application_specific.get(app, self.application_independent)
+
+#Finds the most specific stored position matching a context while only considering stored positions with the same mode and a compatible application
+class ContextMatcher:
+    def __init__(self, stored_positions):
+        stored_positions_by_mode = {}
+        for stored_position in stored_positions:
+            mode = stored_position.get_context().mouse_position_mode
+            stored_positions_by_mode.setdefault(mode, []).append(stored_position)
+        self.buckets = {mode: ModeBucket(candidates) for mode, candidates in stored_positions_by_mode.items()}
+
+    def find_best_match(self, context):
+        if context.mouse_position_mode not in self.buckets:
+            return None
+        candidates = self.buckets[context.mouse_position_mode].get_candidates(context.app)
+        return candidates.find_first_matching_title(context.title_part)
@@ -0,0 +1,83 @@
+from context_matcher import *
+from position_index import StoredPosition
+from project_types import *
+
+import random
+import unittest
+
+
+class TestAhoCorasickAutomaton(unittest.TestCase):
+    def test_finds_overlapping_patterns(self):
+        automaton = AhoCorasickAutomaton(['he', 'she', 'his', 'hers'])
+
+        matches = automaton.find_matches('ushers')
+
+        self.assertEqual({'he', 'she', 'hers'}, matches)
+    def test_finds_nothing_without_patterns(self):
+        automaton = AhoCorasickAutomaton([])
+
+        self.assertEqual(set(), automaton.find_matches('text'))
+    def test_matches_agree_with_substring_check(self):
+        generator = random.Random(0)
+        patterns = [''.join(generator.choice('ab') for _ in range(generator.randint(1, 4))) for _ in range(20)]
+        automaton = AhoCorasickAutomaton(patterns)
+        for _ in range(100):
+            text = ''.join(generator.choice('abc') for _ in range(generator.randint(0, 12)))
+
+            expected = {pattern for pattern in patterns if pattern in text}
+
+            self.assertEqual(expected, automaton.find_matches(text))
+
+def create_stored_position(app, title_part, mode):
+    context = PositionContext(app, title_part, mode)
+    data = PositionFileData.from_values(MousePosition(0, 0), context, PositionRelativity.ABSOLUTE)
+    return StoredPosition('', data)
+
+def find_best_match_specificity_by_scanning(stored_positions, context):
+    matching_specificities = [stored_position.get_context().compute_specificity() for stored_position in stored_positions \
+        if stored_position.get_context().matches_position_context(context)]
+    return max(matching_specificities, default = None)
+
+class TestContextMatcher(unittest.TestCase):
+    def test_mode_beats_application(self):
+        stored_positions = [create_stored_position('app', 'title', ''), create_stored_position('', '', 'mode')]
+        matcher = ContextMatcher(stored_positions)
+
+        best_match = matcher.find_best_match(PositionContext('app', 'the title', 'mode'))
+
+        self.assertIs(stored_positions[1], best_match)
+    def test_application_independent_position_matches_any_application(self):
+        stored_positions = [create_stored_position('', '', ''), create_stored_position('app', '', '')]
+        matcher = ContextMatcher(stored_positions)
+
+        best_match = matcher.find_best_match(PositionContext('other', 'title', ''))
+
+        self.assertIs(stored_positions[0], best_match)
+    def test_no_match_for_unknown_mode(self):
+        matcher = ContextMatcher([create_stored_position('', '', '')])
+
+        self.assertIsNone(matcher.find_best_match(PositionContext('app', 'title', 'mode')))
+    def test_agrees_with_scanning_every_position(self):
+        generator = random.Random(1)
+        apps = ['', 'editor', 'browser']
+        title_parts = ['', 'main', 'settings', 'tab']
+        modes = ['', 'drawing']
+        stored_positions = [create_stored_position(app, title_part, mode) for app in apps for title_part in title_parts for mode in modes \
+            if generator.random() < 0.5]
+        matcher = ContextMatcher(stored_positions)
+        for _ in range(200):
+            title = ' '.join(generator.sample(['main', 'settings', 'tab', 'window'], generator.randint(0, 3)))
+            context = PositionContext(generator.choice(apps[1:] + ['other']), title, generator.choice(modes))
+
+            best_match = matcher.find_best_match(context)
+
+            expected_specificity = find_best_match_specificity_by_scanning(stored_positions, context)
+            if expected_specificity is None:
+                self.assertIsNone(best_match)
+            else:
+                self.assertTrue(best_match.get_context().matches_position_context(context))
+                self.assertEqual(expected_specificity, best_match.get_context().compute_specificity())
+
+
+if __name__ == '__main__':
+    unittest.main()
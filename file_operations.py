@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+TEMPORARY_FILE_PREFIX = '.'
+TEMPORARY_FILE_SUFFIX = '.tmp'
+REPLACE_ATTEMPTS = 10
+REPLACE_RETRY_DELAY_IN_SECONDS = 0.01
+
+
+#Writes the text to a hidden temporary file next to the destination and then renames it over the destination so readers never see a partially written file
+def write_file_atomically(path: str, text: str):
+    #Imported here because tempfile is slow to import and only needed once the first position is saved
+    import tempfile
+    directory, filename = os.path.split(path)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir = directory, prefix = TEMPORARY_FILE_PREFIX + filename, suffix = TEMPORARY_FILE_SUFFIX)
+    try:
+        with os.fdopen(file_descriptor, 'w') as temporary_file:
+            temporary_file.write(text)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        replace_file(temporary_path, path)
+    except BaseException:
+        remove_file_if_exists(temporary_path)
+        raise
+
+#Windows refuses to replace a file another process has open, so the replace is retried briefly before giving up
+def replace_file(source: str, destination: str):
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            os.replace(source, destination)
+            return
+        except PermissionError:
+            if attempt == REPLACE_ATTEMPTS - 1:
+                raise
+            time.sleep(REPLACE_RETRY_DELAY_IN_SECONDS)
+
+def remove_file_if_exists(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def is_temporary_file(filename: str):
+    return filename.startswith(TEMPORARY_FILE_PREFIX) and filename.endswith(TEMPORARY_FILE_SUFFIX)
+
+#Holds an advisory lock on a file so that only one thread in one process at a time runs the guarded code
+#Reentrant within a thread. Processes that do not take the lock are not stopped
+class InterProcessFileLock:
+    def __init__(self, path: str):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.lock_file = None
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        try:
+            if self.depth == 0:
+                self._lock_file()
+        except BaseException:
+            self.thread_lock.release()
+            raise
+        self.depth += 1
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.depth -= 1
+        try:
+            if self.depth == 0:
+                self._unlock_file()
+        finally:
+            self.thread_lock.release()
+
+    def _lock_file(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+        lock_file = open(self.path, 'a+')
+        try:
+            lock_whole_file(lock_file)
+        except BaseException:
+            lock_file.close()
+            raise
+        self.lock_file = lock_file
+
+    def _unlock_file(self):
+        try:
+            unlock_whole_file(self.lock_file)
+        finally:
+            self.lock_file.close()
+            self.lock_file = None
+
+def lock_whole_file(lock_file):
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        return
+    lock_file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+def unlock_whole_file(lock_file):
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        return
+    lock_file.seek(0)
+    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
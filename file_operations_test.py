@@ -0,0 +1,68 @@
+from file_operations import *
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+
+
+INCREMENT_COUNT = 200
+
+#Reads, increments, and rewrites a counter while holding the lock so that increments are lost if two holders overlap
+def increment_counter(counter_path, lock_path):
+    lock = InterProcessFileLock(lock_path)
+    for _ in range(INCREMENT_COUNT):
+        with lock:
+            with open(counter_path, 'r') as counter_file:
+                count = int(counter_file.read())
+            with open(counter_path, 'w') as counter_file:
+                counter_file.write(str(count + 1))
+
+class TestWriteFileAtomically(unittest.TestCase):
+    def test_replaces_existing_file_without_leaving_temporary_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, '0.txt')
+            with open(path, 'w') as file:
+                file.write('old text')
+
+            write_file_atomically(path, 'new text')
+
+            with open(path, 'r') as file:
+                self.assertEqual('new text', file.read())
+            self.assertEqual(['0.txt'], os.listdir(directory))
+    def test_temporary_files_are_recognized(self):
+        self.assertTrue(is_temporary_file('.0.txtabc123.tmp'))
+        self.assertFalse(is_temporary_file('0.txt'))
+
+class TestInterProcessFileLock(unittest.TestCase):
+    def test_processes_and_threads_never_hold_lock_together(self):
+        with tempfile.TemporaryDirectory() as directory:
+            counter_path = os.path.join(directory, 'counter')
+            lock_path = os.path.join(directory, 'locks', '.lock')
+            with open(counter_path, 'w') as counter_file:
+                counter_file.write('0')
+            process_context = multiprocessing.get_context('spawn')
+            workers = [process_context.Process(target = increment_counter, args = (counter_path, lock_path)) for _ in range(2)]
+            workers += [threading.Thread(target = increment_counter, args = (counter_path, lock_path)) for _ in range(2)]
+
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+            with open(counter_path, 'r') as counter_file:
+                self.assertEqual(4*INCREMENT_COUNT, int(counter_file.read()))
+    def test_lock_is_reentrant(self):
+        with tempfile.TemporaryDirectory() as directory:
+            lock = InterProcessFileLock(os.path.join(directory, '.lock'))
+
+            with lock:
+                with lock:
+                    pass
+
+            self.assertIsNone(lock.lock_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import contextlib
+import threading
+import time
+from collections import deque
+
+NO_MEASUREMENT = contextlib.nullcontext()
+
+
+#The timings and counts recorded while running a single command
+class CommandRecord:
+    def __init__(self, name: str):
+        self.name = name
+        self.duration = 0
+        self.phase_durations = {}
+        self.counts = {}
+
+class _CommandMeasurement:
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.record = CommandRecord(name)
+        self.start_time = 0
+
+    def __enter__(self):
+        self.instrumentation.thread_state.record = self.record
+        self.start_time = self.instrumentation.clock()
+        return self.record
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.record.duration = self.instrumentation.clock() - self.start_time
+        self.instrumentation.thread_state.record = None
+        self.instrumentation.records.append(self.record)
+
+class _PhaseMeasurement:
+    def __init__(self, instrumentation, record, name):
+        self.instrumentation = instrumentation
+        self.record = record
+        self.name = name
+        self.start_time = 0
+
+    def __enter__(self):
+        self.start_time = self.instrumentation.clock()
+
+    def __exit__(self, exception_type, exception, traceback):
+        duration = self.instrumentation.clock() - self.start_time
+        self.record.phase_durations[self.name] = self.record.phase_durations.get(self.name, 0) + duration
+
+#Records how long the phases of commands take in a bounded buffer of recent commands while enabled and does almost nothing while disabled
+#Only work done on the thread running a command counts toward that command
+class Instrumentation:
+    FILES_OPENED = 'files opened'
+    def __init__(self, capacity: int = 1000, clock = time.perf_counter):
+        self.enabled = False
+        self.clock = clock
+        self.records = deque(maxlen = capacity)
+        self.thread_state = threading.local()
+
+    def enable(self):
+        self.enabled = True
+    def disable(self):
+        self.enabled = False
+    def clear(self):
+        self.records.clear()
+
+    #Commands started while another command is being measured count as part of the outer command
+    def command(self, name: str):
+        if not self.enabled or self._get_current_record() is not None:
+            return NO_MEASUREMENT
+        return _CommandMeasurement(self, name)
+
+    def phase(self, name: str):
+        record = self._get_current_record()
+        if record is None:
+            return NO_MEASUREMENT
+        return _PhaseMeasurement(self, record, name)
+
+    def count(self, name: str, amount: int = 1):
+        record = self._get_current_record()
+        if record is not None:
+            record.counts[name] = record.counts.get(name, 0) + amount
+
+    def count_file_opened(self):
+        self.count(Instrumentation.FILES_OPENED)
+
+    def _get_current_record(self):
+        return getattr(self.thread_state, 'record', None)
+
+    def summarize(self):
+        records_by_command = {}
+        for record in self.records:
+            records_by_command.setdefault(record.name, []).append(record)
+        return {name: summarize_command_records(records) for name, records in records_by_command.items()}
+
+    def format_summary(self):
+        lines = []
+        for name, summary in self.summarize().items():
+            lines.append(f'{name} ({summary["commands"]} commands): {format_statistics(summary["total"])}')
+            for phase_name, statistics in summary['phases'].items():
+                lines.append(f'    {phase_name}: {format_statistics(statistics)}')
+            for count_name, statistics in summary['counts'].items():
+                lines.append(f'    {count_name} per command: mean {statistics["mean"]:.2f} max {statistics["max"]}')
+        return '\n'.join(lines)
+
+def summarize_command_records(records):
+    phase_names = {phase_name for record in records for phase_name in record.phase_durations}
+    count_names = {count_name for record in records for count_name in record.counts}
+    return {
+        'commands': len(records),
+        'total': compute_duration_statistics([record.duration for record in records]),
+        'phases': {phase_name: compute_duration_statistics([record.phase_durations.get(phase_name, 0) for record in records]) for phase_name in sorted(phase_names)},
+        'counts': {count_name: compute_count_statistics([record.counts.get(count_name, 0) for record in records]) for count_name in sorted(count_names)},
+    }
+
+def compute_duration_statistics(durations):
+    sorted_durations_in_milliseconds = sorted(duration*1000 for duration in durations)
+    return {
+        'p50': compute_percentile(sorted_durations_in_milliseconds, 50),
+        'p90': compute_percentile(sorted_durations_in_milliseconds, 90),
+        'p99': compute_percentile(sorted_durations_in_milliseconds, 99),
+        'max': sorted_durations_in_milliseconds[-1],
+    }
+
+def compute_count_statistics(counts):
+    return {'mean': sum(counts)/len(counts), 'max': max(counts)}
+
+def compute_percentile(sorted_values, percentile):
+    index = round(percentile/100*(len(sorted_values) - 1))
+    return sorted_values[index]
+
+def format_statistics(statistics):
+    return ' '.join(f'{name} {value:.3f}ms' for name, value in statistics.items())
+
+instrumentation = Instrumentation()
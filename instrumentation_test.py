@@ -0,0 +1,58 @@
+from instrumentation import *
+
+import unittest
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0
+    def __call__(self):
+        return self.time
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.instrumentation = Instrumentation(capacity = 3, clock = self.clock)
+        self.instrumentation.enable()
+    def test_records_phase_durations_and_counts(self):
+        with self.instrumentation.command('walk'):
+            with self.instrumentation.phase('lookup'):
+                self.clock.time += 0.002
+            self.instrumentation.count_file_opened()
+            self.clock.time += 0.001
+
+        summary = self.instrumentation.summarize()['walk']
+
+        self.assertEqual(1, summary['commands'])
+        self.assertAlmostEqual(3, summary['total']['p50'])
+        self.assertAlmostEqual(2, summary['phases']['lookup']['p99'])
+        self.assertEqual(1, summary['counts'][Instrumentation.FILES_OPENED]['max'])
+    def test_keeps_only_most_recent_commands(self):
+        for _ in range(5):
+            with self.instrumentation.command('walk'):
+                pass
+
+        self.assertEqual(3, self.instrumentation.summarize()['walk']['commands'])
+    def test_records_nothing_while_disabled(self):
+        self.instrumentation.disable()
+
+        with self.instrumentation.command('walk'):
+            with self.instrumentation.phase('lookup'):
+                self.instrumentation.count_file_opened()
+
+        self.assertEqual({}, self.instrumentation.summarize())
+        self.assertEqual('', self.instrumentation.format_summary())
+    def test_nested_command_counts_as_outer_command(self):
+        with self.instrumentation.command('route'):
+            with self.instrumentation.command('walk'):
+                with self.instrumentation.phase('lookup'):
+                    self.clock.time += 0.001
+
+        summary = self.instrumentation.summarize()
+
+        self.assertEqual(['route'], list(summary.keys()))
+        self.assertIn('lookup', summary['route']['phases'])
+
+
+if __name__ == '__main__':
+    unittest.main()
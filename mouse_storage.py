@@ -1,304 +1,223 @@
-import os
-
-from talon import Module, actions, ui, ctrl
-
-from .project_types import *
-
-
-
-MOUSE_STORAGE_FOLDER_NAME = 'positions'
-PROJECT_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
-MOUSE_STORAGE_DIRECTORY = os.path.join(PROJECT_DIRECTORY, MOUSE_STORAGE_FOLDER_NAME)
-DATA_DIRECTORY = os.path.join(PROJECT_DIRECTORY, "data")
-
-module = Module()
-
-application_specific = module.setting(
-    'mouse_position_storage_application_specific',
-    type = bool,
-    default = True,
-    desc = 'Whether or not stored mouse positions should be stored as application specific',
-)
-
-require_title_contains = module.setting(
-    'mouse_position_storage_title',
-    type = str,
-    default = '',
-    desc = 'If not empty, mouse positions are stored requiring this string present in the application title.'
-)
-
-default_mouse_position_mode = module.setting(
-    'mouse_position_storage_default_mode',
-    type = str,
-    default = '',
-    desc = 'Mouse positions can be mode specific. This setting is used as the mode when none is set manually.',
-)
-
-require_mode = module.setting(
-    'mouse_position_storage_required_mode',
-    type = str,
-    default = '',
-    desc = 'Stored mouse positions require this mouse position storage mode',
-)
-
-relativity = module.setting(
-    'mouse_position_storage_relativity',
-    type = str,
-    default = 'ABSOLUTE',
-    desc = 'Describes what mouse positions are stored relative to. The default is relative to the upper left corner of the main monitor',
-)
-
-manually_set_mouse_position_mode = ''
-
-def get_mouse_position_mode():
-    if not manually_set_mouse_position_mode:
-        return default_mouse_position_mode.get()
-    return manually_set_mouse_position_mode
-
-def get_required_mode():
-    if require_mode.get():
-        return require_mode.get()
-    return default_mouse_position_mode.get()
-
-@module.action_class
-class Actions:
-    def mouse_position_storage_current_application_name() -> str:
-        '''Returns the current application name'''
-        window = ui.active_window()
-        return window.app.name
-    def mouse_position_storage_current_window_title() -> str:
-        '''Returns the current window title'''
-        return ui.active_window().title
-    def mouse_position_storage_current_window_position() -> MousePosition:
-        '''Returns the upper left hand corner of the active window'''
-        window = ui.active_window()
-        rectangle = window.rect
-        horizontal = rectangle.left
-        vertical = rectangle.top
-        return MousePosition(horizontal, vertical)
-
-    def mouse_position_storage_update_manually_set_mode(new_mode: str):
-        '''Updates the mouse position storage manually set mode, which overrides the default mode'''
-        global manually_set_mouse_position_mode
-        manually_set_mouse_position_mode  = new_mode
-
-    def mouse_position_storage_store_position_with_name(name: str):
-        '''Stores a mouse position with the specified name assuming a position with the same context does not already exist'''
-        store_current_mouse_position_with_name(name)
-    def mouse_positions_storage_update_position_with_name(name: str):
-        '''If a mouse position with the same name exists for the active context, the action updates it'''
-        update_mouse_position_with_name(name)
-    def mouse_positions_storage_remove_position_with_name(name: str):
-        '''If a mouse position with the same name exists for the active context, the action updates it'''
-        remove_mouse_position_with_name(name)
-    def mouse_positions_storage_go_to_position(name: str):
-        '''Goes to the mouse position stored with the specified name with the most specific matching context'''
-        go_to_mouse_position(name)
-    def mouse_positions_storage_update_reference_position():
-        '''Updates the mouse stored reference position with current mouse location'''
-        position = get_reference_point()
-        position.set_to_current_mouse_position()
-   
-
-def create_directory_if_nonexistent(directory):
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-
-
-def store_current_mouse_position_with_name(name):
-    position = get_mouse_position()
-    directory = get_mouse_position_directory_from_name(name)
-    create_directory_if_nonexistent(directory)
-    if no_position_in_directory_with_same_context(directory):
-        store_mouse_position_at_directory(position, directory)
-    else:
-        tell_user_must_use_update_commands_to_overwrite_position(name)
-
-def tell_user_must_use_update_commands_to_overwrite_position(name):
-    actions.app.notify(f'Cannot overwrite position {name} with this command. Instead use storage update {name}')
-
-def get_mouse_position():
-    horizontal, vertical = ctrl.mouse_pos()
-    position = MousePosition(horizontal, vertical)
-    return position
-
-def get_mouse_position_directory_from_name(name):
-    return os.path.join(MOUSE_STORAGE_DIRECTORY, name)
-
-def update_mouse_position_with_name(name):
-    directory = get_mouse_position_directory_from_name(name)
-    path = get_directory_path_with_active_storage_context_if_exists(directory)
-    if path:
-        position = get_mouse_position()
-        store_mouse_position_at_path(position, path)
-    else:
-        tell_user_position_unavailable_with_name(name)
-def tell_user_position_unavailable_with_name(name):
-    actions.app.notify(f'The position {name} does not exist in an active context!')
-   
-
-def store_mouse_position_at_directory(position, directory):
-    path = get_mouse_position_storage_path_from_directory(directory)
-    store_mouse_position_at_path(position, path)
-
-def get_mouse_position_storage_path_from_directory(directory):
-    path = get_directory_path_with_active_storage_context_if_exists(directory)
-    if not path:
-        return get_new_mouse_position_storage_path_for(directory)
-    return path
-
-def get_new_mouse_position_storage_path_for(directory):
-    existing_paths = os.listdir(directory)
-    path = ''
-    for i in range(len(existing_paths) + 1):
-        filename = str(i) + '.txt'
-        path = os.path.join(directory, filename)
-        if not os.path.exists(path):
-            return path
-    return path
-
-def no_position_in_directory_with_same_context(directory):
-    return get_directory_path_with_active_storage_context_if_exists(directory) == ''
-
-def get_directory_path_with_active_storage_context_if_exists(directory):
-    if not os.path.isdir(directory):
-        return ''
-    existing_paths = os.listdir(directory)
-    active_context = get_active_storage_context()
-    for path in existing_paths:
-        data = PositionFileData(os.path.join(directory, path))
-        context = data.get_context()
-        if context == active_context:
-            return os.path.join(directory, path)
-    return ''
-
-def store_mouse_position_at_path(position, path):
-    with open(path, 'w') as position_file:
-        context = get_active_storage_context()
-        context_string = str(context)
-        print(f'Storing mouse position at path {path} with context {context_string}')
-        position_file.write(context_string)
-        if relativity.get() == 'WINDOW':
-            position = get_position_relative_to_active_window(position)
-        elif relativity.get() == 'MOUSE':
-            position = get_position_relative_to_reference_point(position)
-        position_file.write(str(position) + '\n')
-        position_relativity = get_active_storage_relativity()
-        position_file.write(str(position_relativity))
-
-def get_active_storage_relativity():
-    return PositionRelativity[relativity.get()]
-
-def get_active_storage_context():
-    application = ''
-    if stored_position_should_be_application_specific():
-        application = actions.user.mouse_position_storage_current_application_name()
-    required_title_part = ''
-    if stored_position_should_be_title_specific():
-        required_title_part = require_title_contains.get()
-    required_mode = get_required_mode()
-    context = PositionContext(application, required_title_part, required_mode)
-    return context
-
-def stored_position_should_be_application_specific():
-    return application_specific.get()
-def stored_position_should_be_title_specific():
-    return stored_position_should_be_application_specific() and require_title_contains.get()
-
-def go_to_mouse_position(name):
-    active_context = get_active_context()
-    position, position_relativity = get_position_and_relativity_with_specified_name_best_matching_context(name, active_context)
-    if position_relativity == PositionRelativity.WINDOW:
-        position = make_position_relative_to_window_absolute(position)
-    elif position_relativity == PositionRelativity.MOUSE:
-        position = make_position_relative_to_reference_point_absolute(position)
-    horizontal = position.get_horizontal()
-    vertical = position.get_vertical()
-    actions.mouse_move(horizontal, vertical)
-
-def remove_mouse_position_with_name(name):
-    active_context = get_active_context()
-    path = get_path_with_specified_name_best_matching_context(name, active_context)
-    if path:
-        try:
-            remove_position_at_path(path)
-        except:
-            actions.app.notify(f'Error! Could not remove position with name {name}!')
-    else:
-        tell_user_position_unavailable_with_name(name)
-    actions.app.notify(f'Removed position with name {name} from the act of context!')
-
-def remove_position_at_path(path):
-    if mouse_position_filepath_in_correct_directory(path):
-        os.remove(path)
-    else:
-        actions.app.notify('Warning! The mouse position storage position removal code was used to try to remove a file outside the mouse position storage!')
-        print(f'Warning! The mouse position storage position removal code was used to try to remove a file outside the mouse position storage at path: {path}')
-
-
-def mouse_position_filepath_in_correct_directory(path):
-    current_folder = os.path.dirname(path)
-    folder_of_current_folder = os.path.dirname(current_folder)
-    return folder_of_current_folder == MOUSE_STORAGE_DIRECTORY
-
-def get_active_context():
-    application = actions.user.mouse_position_storage_current_application_name()
-    title = actions.user.mouse_position_storage_current_window_title()
-    mode = get_mouse_position_mode()
-    context = PositionContext(application, title, mode)
-    return context
-
-def get_path_with_specified_name_best_matching_context(name, context):
-    directory = get_mouse_position_directory_from_name(name)
-    best_match_path = ''
-    best_match_specificity = 0
-    for filename in os.listdir(directory):
-        data = get_data_from_directory_and_filename(directory, filename)
-        data_context = data.get_context()
-        if data_context.matches_position_context(context):
-            specificity = data_context.compute_specificity()
-            if specificity >= best_match_specificity:
-                best_match_specificity = specificity
-                best_match_path = os.path.join(directory, filename)
-    return best_match_path
-
-def get_position_with_specified_name_best_matching_context(name, context):
-    data = get_data_with_specified_name_best_matching_context(name, context)
-    return data.get_position()
-
-def get_data_with_specified_name_best_matching_context(name, context):
-    best_match_path = get_path_with_specified_name_best_matching_context(name, context)
-    data = PositionFileData(best_match_path)
-    return data
-
-def get_position_and_relativity_with_specified_name_best_matching_context(name, context):
-    data = get_data_with_specified_name_best_matching_context(name, context)
-    return data.get_position(), data.get_relativity()
-       
-def get_data_from_directory_and_filename(directory, filename):
-    path = os.path.join(directory, filename)
-    data = PositionFileData(path)
-    return data
-
-
-def get_position_relative_to_active_window(position):
-    window_position = actions.user.mouse_position_storage_current_window_position()
-    relative_position = position - window_position
-    return relative_position
-
-def get_position_relative_to_reference_point(position):
-    reference_point_file = get_reference_point()
-    reference_point = reference_point_file.get()
-    return position - reference_point
-
-def make_position_relative_to_window_absolute(position):
-    window_position = actions.user.mouse_position_storage_current_window_position()
-    absolute_position = position + window_position
-    return absolute_position
-   
-def make_position_relative_to_reference_point_absolute(position):
-    current_position = get_mouse_position()
-    return position + current_position
-
-def get_reference_point():
-   return MousePositionFile(DATA_DIRECTORY, "reference point")
+import atexit
+import os
+
+from talon import Module, actions, ui, ctrl, app, cron
+
+from .project_types import *
+from .position_commands import PositionCommands, DEFAULT_SETTINGS
+from .platform_adapter import ActiveWindow
+from .window_geometry import WindowRectangle
+from .screen_geometry import ScreenGeometry
+from .instrumentation import instrumentation
+
+
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+SETTING_PREFIX = 'mouse_position_storage_'
+EXIT_SAVE_TIMEOUT_IN_SECONDS = 5
+WINDOW_RECTANGLE_EVENTS = ['win_move', 'win_resize']
+
+module = Module()
+
+talon_settings = {}
+
+def add_setting(name, setting_type, description):
+    talon_settings[name] = module.setting(
+        SETTING_PREFIX + name,
+        type = setting_type,
+        default = DEFAULT_SETTINGS[name],
+        desc = description,
+    )
+
+add_setting('application_specific', bool, 'Whether or not stored mouse positions should be stored as application specific')
+add_setting('title', str, 'If not empty, mouse positions are stored requiring this string present in the application title.')
+add_setting('default_mode', str, 'Mouse positions can be mode specific. This setting is used as the mode when none is set manually.')
+add_setting('required_mode', str, 'Stored mouse positions require this mouse position storage mode')
+add_setting('relativity', str, 'Describes what mouse positions are stored relative to. The default is relative to the upper left corner of the main monitor. SCREEN stores positions as fractions of the screen they are on so that they survive screen arrangement and resolution changes')
+add_setting('window_anchor', str, 'What part of the window positions stored relative to the window are relative to. TOP_LEFT, TOP_RIGHT, BOTTOM_LEFT, and BOTTOM_RIGHT use that corner while PROPORTIONAL stores positions as fractions of the window size so that they follow the window when it is resized')
+add_setting('backend', str, 'Where mouse positions are stored. FILES stores every position as its own file in the positions directory while DATABASE stores every position in a single SQLite database')
+add_setting('window_context_cache_lifetime', int, 'How many milliseconds the active application name, window title, and window position are remembered when no window event invalidates them first. 0 disables remembering them')
+add_setting('reference_point', str, 'The name of the reference point that positions stored relative to the mouse are stored relative to. The default reference point is used when this is empty')
+add_setting('write_behind', bool, 'Whether or not stored mouse position changes are saved on a background thread instead of making commands wait for the disk')
+add_setting('file_watch_interval', int, 'How many milliseconds to wait between checking the positions directory for position files changed outside of Talon. 0 disables checking. Changes take effect after restarting Talon')
+add_setting('nearby_distance', int, 'How many pixels away from the cursor a stored position can be while still counting as the position the cursor is on')
+add_setting('name_tolerance', float, 'When walking to a name that is not stored, the fraction of its characters that can differ from a stored name for that name to be used instead. 0 only allows names that start with the dictated name')
+add_setting('import_conflict_policy', str, 'What importing does with a position whose name and context are already stored. SKIP keeps the stored position, OVERWRITE replaces it, and SPECIFICITY is another name for OVERWRITE. Positions with a different context than every stored position with the same name are always imported')
+add_setting('compact_index', bool, 'Whether the stored positions are kept in memory as columns of numbers instead of one object per position, which uses less memory with many positions. Takes effect the next time the positions are loaded')
+
+#Reads the settings of the position commands from the Talon settings named with the setting prefix
+class TalonSettings:
+    def get(self, name: str):
+        return talon_settings[name].get()
+
+#Runs the position commands inside Talon. The active window is described through actions so that they can be overridden
+class TalonPlatform:
+    def get_active_application_name(self):
+        return actions.user.mouse_position_storage_current_application_name()
+    def get_active_window_title(self):
+        return actions.user.mouse_position_storage_current_window_title()
+    def get_active_window_rectangle(self):
+        return actions.user.mouse_position_storage_current_window_rectangle()
+
+    def get_mouse_position(self):
+        horizontal, vertical = ctrl.mouse_pos()
+        return MousePosition(horizontal, vertical)
+
+    def move_mouse(self, position: MousePosition):
+        actions.mouse_move(position.get_horizontal(), position.get_vertical())
+
+    def click(self, button: int):
+        actions.mouse_click(button)
+
+    def sleep(self, milliseconds: int):
+        actions.sleep(f'{milliseconds}ms')
+
+    def notify(self, message: str):
+        actions.app.notify(message)
+
+    #Screens without names are identified by their order
+    def get_screens(self):
+        return [create_screen_geometry(index, screen) for index, screen in enumerate(ui.screens())]
+
+    def register(self, event: str, handler):
+        if event in WINDOW_RECTANGLE_EVENTS:
+            ui.register(event, lambda window: handle_active_window_event(window, handler))
+        else:
+            ui.register(event, handler)
+
+def handle_active_window_event(window, handler):
+    if window == ui.active_window():
+        handler(ActiveWindow(window.app.name, window.title, create_window_rectangle(window.rect)))
+
+def create_window_rectangle(rectangle):
+    return WindowRectangle(rectangle.left, rectangle.top, rectangle.width, rectangle.height)
+
+def create_screen_geometry(index, screen):
+    rectangle = screen.rect
+    identity = getattr(screen, 'name', '') or str(index)
+    return ScreenGeometry(identity, rectangle.x, rectangle.y, rectangle.width, rectangle.height)
+
+commands = PositionCommands(TalonPlatform(), TalonSettings(), PROJECT_DIRECTORY)
+
+def start_watching_position_files():
+    interval = talon_settings['file_watch_interval'].get()
+    if interval > 0:
+        cron.interval(f'{interval}ms', commands.reload_externally_changed_positions)
+
+app.register('ready', commands.start_warming_up)
+app.register('ready', start_watching_position_files)
+atexit.register(commands.wait_until_position_changes_saved, EXIT_SAVE_TIMEOUT_IN_SECONDS)
+
+@module.action_class
+class Actions:
+    def mouse_position_storage_current_application_name() -> str:
+        '''Returns the current application name'''
+        window = ui.active_window()
+        return window.app.name
+    def mouse_position_storage_current_window_title() -> str:
+        '''Returns the current window title'''
+        return ui.active_window().title
+    def mouse_position_storage_current_window_rectangle() -> WindowRectangle:
+        '''Returns the position and size of the active window'''
+        return create_window_rectangle(ui.active_window().rect)
+
+    def mouse_position_storage_update_manually_set_mode(new_mode: str):
+        '''Updates the mouse position storage manually set mode, which overrides the default mode'''
+        commands.set_manually_set_mouse_position_mode(new_mode)
+
+    def mouse_position_storage_store_position_with_name(name: str):
+        '''Stores a mouse position with the specified name assuming a position with the same context does not already exist'''
+        with instrumentation.command('store'):
+            commands.store_current_mouse_position_with_name(name)
+    def mouse_positions_storage_update_position_with_name(name: str):
+        '''If a mouse position with the same name exists for the active context, the action updates it'''
+        with instrumentation.command('update'):
+            commands.update_mouse_position_with_name(name)
+    def mouse_positions_storage_remove_position_with_name(name: str):
+        '''If a mouse position with the same name exists for the active context, the action updates it'''
+        with instrumentation.command('remove'):
+            commands.remove_mouse_position_with_name(name)
+    def mouse_position_storage_undo():
+        '''Undoes the most recent change to the stored mouse positions that has not been undone'''
+        commands.undo_position_change()
+    def mouse_position_storage_redo():
+        '''Redoes the most recently undone change to the stored mouse positions'''
+        commands.redo_position_change()
+    def mouse_positions_storage_go_to_position(name: str):
+        '''Goes to the mouse position stored with the specified name with the most specific matching context'''
+        with instrumentation.command('walk'):
+            commands.go_to_mouse_position(name)
+    def mouse_positions_storage_update_reference_position():
+        '''Updates the mouse stored reference position with current mouse location'''
+        commands.update_reference_point()
+    def mouse_positions_storage_update_named_reference_position(name: str):
+        '''Updates the mouse stored reference position with the specified name with current mouse location'''
+        commands.update_reference_point(name)
+    def mouse_position_storage_migrate_files_to_database():
+        '''Copies every mouse position stored as a file into the mouse position database'''
+        commands.migrate_position_files_to_database()
+
+    def mouse_position_storage_export_application_positions():
+        '''Saves every position stored for the active application to a JSON Lines file named after the application in the exchange directory'''
+        commands.export_application_positions()
+    def mouse_position_storage_export_all_positions():
+        '''Saves every stored position to a JSON Lines file in the exchange directory'''
+        commands.export_all_positions()
+    def mouse_position_storage_import_positions(name: str):
+        '''Stores every position in the JSON Lines file with the specified name in the exchange directory'''
+        with instrumentation.command('import'):
+            commands.import_positions_from_exchange_file(name)
+
+    def mouse_position_storage_start_route(name: str):
+        '''Starts recording a new route with the specified name, replacing any route with that name'''
+        commands.start_recording_route(name)
+    def mouse_position_storage_edit_route(name: str):
+        '''Starts recording more steps for the existing route with the specified name'''
+        commands.edit_route(name)
+    def mouse_position_storage_add_route_step(position_name: str):
+        '''Adds a step moving to the stored position with the specified name to the route being recorded'''
+        commands.add_step_to_recorded_route(position_name, False)
+    def mouse_position_storage_add_route_click_step(position_name: str):
+        '''Adds a step moving to the stored position with the specified name and clicking there to the route being recorded'''
+        commands.add_step_to_recorded_route(position_name, True)
+    def mouse_position_storage_set_route_step_delay(delay_in_milliseconds: int):
+        '''Sets how many milliseconds to wait after the last step of the route being recorded'''
+        commands.set_last_recorded_route_step_delay(delay_in_milliseconds)
+    def mouse_position_storage_remove_last_route_step():
+        '''Removes the last step of the route being recorded'''
+        commands.remove_last_recorded_route_step()
+    def mouse_position_storage_stop_recording_route():
+        '''Stops recording the route being recorded'''
+        commands.stop_recording_route()
+    def mouse_position_storage_play_route(name: str):
+        '''Moves through every step of the route with the specified name using the stored positions best matching the active context'''
+        with instrumentation.command('route'):
+            commands.play_route(name)
+    def mouse_position_storage_delete_route(name: str):
+        '''Deletes the route with the specified name'''
+        commands.delete_route(name)
+
+    def mouse_position_storage_name_position_here():
+        '''Tells the user which stored position valid in the active context the cursor is on or nearest to'''
+        with instrumentation.command('what is here'):
+            commands.name_position_near_cursor()
+    def mouse_position_storage_go_to_nearest_position_in_direction(direction: str):
+        '''Goes to the nearest stored position valid in the active context in the specified direction (left, right, up, or down) from the cursor'''
+        with instrumentation.command('walk direction'):
+            commands.go_to_nearest_position_in_direction(direction)
+    def mouse_position_storage_list_positions_in_active_window():
+        '''Tells the user the names of the stored positions valid in the active context that are inside the active window'''
+        commands.list_positions_in_active_window()
+
+    def mouse_position_storage_start_timing():
+        '''Starts recording how long the phases of mouse position storage commands take'''
+        instrumentation.enable()
+    def mouse_position_storage_stop_timing():
+        '''Stops recording how long the phases of mouse position storage commands take'''
+        instrumentation.disable()
+    def mouse_position_storage_dump_timing_summary():
+        '''Prints percentiles for how long the phases of recently recorded mouse position storage commands took and saves them to the data directory'''
+        commands.dump_timing_summary()
+    def mouse_position_storage_show_lookup_cache_statistics():
+        '''Tells the user how many position lookups were answered by the cache of recent best matches'''
+        commands.show_lookup_cache_statistics()
@@ -0,0 +1,108 @@
+import bisect
+
+
+#Finds every word within an edit distance of a query without comparing the query against every word
+#Words are never removed from the tree because the name index filters out names that no longer exist
+class BKTree:
+    def __init__(self):
+        self.root = None
+        self.words = set()
+
+    def add(self, word: str):
+        if word in self.words:
+            return
+        self.words.add(word)
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node_word, children = self.root
+        while True:
+            distance = compute_edit_distance(word, node_word)
+            if distance not in children:
+                children[distance] = (word, {})
+                return
+            node_word, children = children[distance]
+
+    #Returns (distance, word) pairs for every word within the maximum distance of the word
+    def find_within_distance(self, word: str, maximum_distance: int):
+        if self.root is None:
+            return []
+        result = []
+        nodes_to_visit = [self.root]
+        while nodes_to_visit:
+            node_word, children = nodes_to_visit.pop()
+            distance = compute_edit_distance(word, node_word)
+            if distance <= maximum_distance:
+                result.append((distance, node_word))
+            for child_distance in range(distance - maximum_distance, distance + maximum_distance + 1):
+                if child_distance in children:
+                    nodes_to_visit.append(children[child_distance])
+        return result
+
+#Resolves dictated names that do not exactly match a stored name to the stored name they were most likely meant to be
+class NameIndex:
+    def __init__(self):
+        self.names = set()
+        self.sorted_names = []
+        self.tree = BKTree()
+
+    def add(self, name: str):
+        if name in self.names:
+            return
+        self.names.add(name)
+        bisect.insort(self.sorted_names, name)
+        self.tree.add(name)
+
+    def remove(self, name: str):
+        if name not in self.names:
+            return
+        self.names.remove(name)
+        del self.sorted_names[bisect.bisect_left(self.sorted_names, name)]
+
+    def has_name(self, name: str):
+        return name in self.names
+
+    def find_names_with_prefix(self, prefix: str):
+        start = bisect.bisect_left(self.sorted_names, prefix)
+        result = []
+        for name in self.sorted_names[start:]:
+            if not name.startswith(prefix):
+                break
+            result.append(name)
+        return result
+
+    #Returns every name tied for the smallest edit distance from the name that is within the maximum distance
+    def find_closest_names(self, name: str, maximum_distance: int):
+        matches = [(distance, match) for distance, match in self.tree.find_within_distance(name, maximum_distance) if match in self.names]
+        if not matches:
+            return []
+        smallest_distance = min(distance for distance, _ in matches)
+        return sorted(match for distance, match in matches if distance == smallest_distance)
+
+    #Returns the exact name if it exists, otherwise the only closest name within the maximum distance, otherwise the only name starting with it
+    #Returns None when no name matches confidently enough
+    def resolve(self, name: str, maximum_distance: int):
+        if name in self.names:
+            return name
+        if maximum_distance > 0:
+            closest_names = self.find_closest_names(name, maximum_distance)
+            if len(closest_names) == 1:
+                return closest_names[0]
+            if closest_names:
+                return None
+        names_with_prefix = self.find_names_with_prefix(name)
+        if name and len(names_with_prefix) == 1:
+            return names_with_prefix[0]
+        return None
+
+def compute_edit_distance(first: str, second: str):
+    if len(first) < len(second):
+        first, second = second, first
+    previous_row = list(range(len(second) + 1))
+    for first_index, first_character in enumerate(first, 1):
+        current_row = [first_index]
+        for second_index, second_character in enumerate(second, 1):
+            substitution_cost = previous_row[second_index - 1] + (first_character != second_character)
+            current_row.append(min(previous_row[second_index] + 1, current_row[second_index - 1] + 1, substitution_cost))
+        previous_row = current_row
+    return previous_row[-1]
@@ -0,0 +1,72 @@
+from name_index import *
+
+import random
+import string
+import unittest
+
+
+def create_random_name(generator):
+    return ''.join(generator.choice(string.ascii_lowercase[:6]) for _ in range(generator.randrange(1, 8)))
+
+class TestEditDistance(unittest.TestCase):
+    def test_known_distances(self):
+        self.assertEqual(0, compute_edit_distance('button', 'button'))
+        self.assertEqual(3, compute_edit_distance('kitten', 'sitting'))
+        self.assertEqual(4, compute_edit_distance('', 'walk'))
+        self.assertEqual(1, compute_edit_distance('submit', 'summit'))
+
+class TestBKTree(unittest.TestCase):
+    def test_matches_comparing_against_every_word(self):
+        generator = random.Random(7)
+        words = {create_random_name(generator) for _ in range(300)}
+        tree = BKTree()
+        for word in words:
+            tree.add(word)
+        for _ in range(50):
+            query = create_random_name(generator)
+            for maximum_distance in range(3):
+                expected = sorted((compute_edit_distance(query, word), word) for word in words if compute_edit_distance(query, word) <= maximum_distance)
+
+                self.assertEqual(expected, sorted(tree.find_within_distance(query, maximum_distance)))
+
+class TestNameIndex(unittest.TestCase):
+    def create_index(self, names):
+        index = NameIndex()
+        for name in names:
+            index.add(name)
+        return index
+
+    def test_exact_name_wins(self):
+        index = self.create_index(['save', 'slave'])
+
+        self.assertEqual('save', index.resolve('save', 2))
+    def test_resolves_closest_name(self):
+        index = self.create_index(['submit', 'cancel', 'close'])
+
+        self.assertEqual('submit', index.resolve('summit', 2))
+    def test_tied_names_are_not_resolved(self):
+        index = self.create_index(['cat', 'bat'])
+
+        self.assertIsNone(index.resolve('hat', 1))
+    def test_resolves_unique_prefix(self):
+        index = self.create_index(['address bar', 'bookmarks', 'bookmark bar'])
+
+        self.assertEqual('address bar', index.resolve('address', 1))
+        self.assertIsNone(index.resolve('book', 1))
+    def test_removed_names_are_not_resolved(self):
+        index = self.create_index(['submit', 'cancel'])
+
+        index.remove('submit')
+
+        self.assertIsNone(index.resolve('summit', 2))
+        self.assertEqual(['cancel'], index.find_names_with_prefix(''))
+    def test_readded_name_is_resolved(self):
+        index = self.create_index(['submit'])
+        index.remove('submit')
+
+        index.add('submit')
+
+        self.assertEqual('submit', index.resolve('summit', 2))
+
+if __name__ == '__main__':
+    unittest.main()
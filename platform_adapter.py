@@ -0,0 +1,133 @@
+try:
+    from .project_types import MousePosition
+    from .window_geometry import WindowRectangle
+    from .screen_geometry import ScreenGeometry
+except ImportError:
+    from project_types import MousePosition
+    from window_geometry import WindowRectangle
+    from screen_geometry import ScreenGeometry
+
+
+#A platform is everything the mouse position storage needs from the computer it runs on. Every platform provides:
+#get_active_application_name() -> str
+#get_active_window_title() -> str
+#get_active_window_rectangle() -> WindowRectangle
+#get_mouse_position() -> MousePosition
+#move_mouse(position: MousePosition)
+#click(button: int)
+#sleep(milliseconds: int)
+#notify(message: str)
+#get_screens() -> list of ScreenGeometry with the main screen first
+#register(event: str, handler) for the Talon window events app_activate, win_focus, win_title, win_move, win_resize, and screen_change
+#Handlers of win_move and win_resize receive the ActiveWindow and are only called for the active window
+#Inside Talon the platform in mouse_storage.py uses the talon module while SimulatedPlatform runs anywhere
+
+#The application, title, and rectangle of the active window
+class ActiveWindow:
+    def __init__(self, application_name: str, title: str, rectangle: WindowRectangle):
+        self.application_name = application_name
+        self.title = title
+        self.rectangle = rectangle
+
+    def get_application_name(self):
+        return self.application_name
+    def get_title(self):
+        return self.title
+    def get_rectangle(self):
+        return self.rectangle
+
+#A platform that runs without Talon for testing and profiling the mouse position storage
+#The active window follows a script of windows that become active at given times on a virtual clock that only moves when told to or while sleeping
+#The cursor is virtual, and mouse moves, clicks, and notifications are recorded instead of performed. Moves and clicks are recorded as (horizontal, vertical) pairs
+#Window events are delivered like Talon delivers them to the handlers registered for them
+class SimulatedPlatform:
+    def __init__(self, window: ActiveWindow = None, screens: list = None):
+        self.time = 0
+        self.scheduled_windows = []
+        self.active_window = window if window is not None else ActiveWindow('', '', WindowRectangle(0, 0, 1920, 1080))
+        self.screens = screens if screens is not None else [ScreenGeometry('0', 0, 0, 1920, 1080)]
+        self.mouse_position = MousePosition(0, 0)
+        self.mouse_moves = []
+        self.clicks = []
+        self.notifications = []
+        self.event_handlers = {}
+
+    def get_active_window(self):
+        return self.active_window
+    def get_active_application_name(self):
+        return self.active_window.get_application_name()
+    def get_active_window_title(self):
+        return self.active_window.get_title()
+    def get_active_window_rectangle(self):
+        return self.active_window.get_rectangle()
+
+    def get_mouse_position(self):
+        return self.mouse_position
+
+    def move_mouse(self, position: MousePosition):
+        self.mouse_position = position
+        self.mouse_moves.append(convert_position_to_pair(position))
+
+    #Moves the cursor like the user would without recording a mouse move
+    def place_cursor(self, position: MousePosition):
+        self.mouse_position = position
+
+    def click(self, button: int = 0):
+        self.clicks.append((convert_position_to_pair(self.mouse_position), button))
+
+    def sleep(self, milliseconds: int):
+        self.advance_time(milliseconds/1000)
+
+    def notify(self, message: str):
+        self.notifications.append(message)
+
+    def get_last_notification(self):
+        if not self.notifications:
+            return None
+        return self.notifications[-1]
+
+    def get_screens(self):
+        return self.screens
+
+    def set_screens(self, screens: list):
+        self.screens = screens
+        self._deliver_event('screen_change', None)
+
+    def get_time(self):
+        return self.time
+
+    #Makes the window active once the virtual clock reaches the time
+    def schedule_window(self, time: float, window: ActiveWindow):
+        self.scheduled_windows.append((time, window))
+        self.scheduled_windows.sort(key = lambda scheduled_window: scheduled_window[0])
+        self._activate_scheduled_windows()
+
+    def advance_time(self, seconds: float):
+        self.time += seconds
+        self._activate_scheduled_windows()
+
+    def set_active_window(self, window: ActiveWindow):
+        previous_window = self.active_window
+        self.active_window = window
+        if window.get_application_name() != previous_window.get_application_name():
+            self._deliver_event('app_activate', window)
+            self._deliver_event('win_focus', window)
+        elif window.get_title() != previous_window.get_title():
+            self._deliver_event('win_title', window)
+        if window.get_rectangle() != previous_window.get_rectangle():
+            self._deliver_event('win_move', window)
+
+    def register(self, event: str, handler):
+        self.event_handlers.setdefault(event, []).append(handler)
+
+    def _activate_scheduled_windows(self):
+        while self.scheduled_windows and self.scheduled_windows[0][0] <= self.time:
+            _, window = self.scheduled_windows.pop(0)
+            self.set_active_window(window)
+
+    def _deliver_event(self, event, argument):
+        for handler in self.event_handlers.get(event, []):
+            handler(argument)
+
+def convert_position_to_pair(position: MousePosition):
+    return position.get_horizontal(), position.get_vertical()
@@ -0,0 +1,60 @@
+from platform_adapter import *
+
+import unittest
+
+
+def create_window(application_name, title = 'title', rectangle = None):
+    return ActiveWindow(application_name, title, rectangle if rectangle is not None else WindowRectangle(0, 0, 800, 600))
+
+class TestSimulatedPlatform(unittest.TestCase):
+    def test_scheduled_windows_become_active_as_time_passes(self):
+        platform = SimulatedPlatform(create_window('first'))
+        platform.schedule_window(1, create_window('second'))
+        platform.schedule_window(3, create_window('third'))
+
+        platform.advance_time(2)
+
+        self.assertEqual('second', platform.get_active_application_name())
+        platform.sleep(1000)
+        self.assertEqual('third', platform.get_active_application_name())
+    def test_window_changes_deliver_events(self):
+        platform = SimulatedPlatform(create_window('app'))
+        events = []
+        for event in ['app_activate', 'win_focus', 'win_title', 'win_move']:
+            platform.register(event, lambda window, event = event: events.append(event))
+
+        platform.set_active_window(create_window('app', 'other title'))
+        platform.set_active_window(create_window('other app', 'other title'))
+        platform.set_active_window(create_window('other app', 'other title', WindowRectangle(5, 5, 800, 600)))
+
+        self.assertEqual(['win_title', 'app_activate', 'win_focus', 'win_move'], events)
+    def test_rectangle_event_receives_active_window(self):
+        platform = SimulatedPlatform(create_window('app'))
+        rectangles = []
+        platform.register('win_move', lambda window: rectangles.append(window.get_rectangle()))
+
+        platform.set_active_window(create_window('app', rectangle = WindowRectangle(10, 20, 300, 400)))
+
+        self.assertEqual([WindowRectangle(10, 20, 300, 400)], rectangles)
+    def test_records_mouse_moves_and_clicks(self):
+        platform = SimulatedPlatform()
+        platform.place_cursor(MousePosition(1, 2))
+        platform.move_mouse(MousePosition(3, 4))
+        platform.click(0)
+
+        self.assertEqual([(3, 4)], platform.mouse_moves)
+        self.assertEqual([((3, 4), 0)], platform.clicks)
+        self.assertEqual((3, 4), convert_position_to_pair(platform.get_mouse_position()))
+    def test_changing_screens_delivers_event(self):
+        platform = SimulatedPlatform()
+        changes = []
+        platform.register('screen_change', changes.append)
+
+        platform.set_screens([ScreenGeometry('wide', 0, 0, 3840, 1080)])
+
+        self.assertEqual(1, len(changes))
+        self.assertEqual('wide', platform.get_screens()[0].get_identity())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+from array import array
+
+try:
+    from .project_types import *
+except ImportError:
+    from project_types import *
+
+
+#Gives every distinct context a small integer id so that columns can refer to contexts without storing them again
+class ContextTable:
+    def __init__(self):
+        self.contexts = []
+        self.context_ids = {}
+
+    def get_id(self, context: PositionContext):
+        if context not in self.context_ids:
+            self.context_ids[context] = len(self.contexts)
+            self.contexts.append(PositionContext(context.app, context.title_part, context.mouse_position_mode))
+        return self.context_ids[context]
+
+    def get_context(self, context_id: int):
+        return self.contexts[context_id]
+
+    def __len__(self):
+        return len(self.contexts)
+
+#Stores many positions as parallel arrays of coordinates, relativities, window anchors, and context ids instead of one object per position
+#Positions are only turned back into objects when a row is read. Screen identities are interned strings shared between rows
+#Released rows are reused by later appends so that replacing positions does not grow the columns
+class PositionColumns:
+    def __init__(self, context_table: ContextTable = None):
+        self.context_table = context_table if context_table is not None else ContextTable()
+        self.horizontals = array('l')
+        self.verticals = array('l')
+        self.relativities = array('b')
+        self.anchors = array('b')
+        self.context_ids = array('l')
+        self.screens = []
+        self.released_rows = []
+
+    def append(self, data: PositionFileData):
+        if self.released_rows:
+            row = self.released_rows.pop()
+            self._write_row(row, data)
+            return row
+        position = data.get_position()
+        self.horizontals.append(position.get_horizontal())
+        self.verticals.append(position.get_vertical())
+        self.relativities.append(data.get_relativity().value)
+        self.anchors.append(data.get_anchor().value)
+        self.context_ids.append(self.context_table.get_id(data.get_context()))
+        self.screens.append(sys.intern(data.get_screen()))
+        return len(self.horizontals) - 1
+
+    def _write_row(self, row, data):
+        position = data.get_position()
+        self.horizontals[row] = position.get_horizontal()
+        self.verticals[row] = position.get_vertical()
+        self.relativities[row] = data.get_relativity().value
+        self.anchors[row] = data.get_anchor().value
+        self.context_ids[row] = self.context_table.get_id(data.get_context())
+        self.screens[row] = sys.intern(data.get_screen())
+
+    def release(self, row: int):
+        self.released_rows.append(row)
+
+    def get_position(self, row: int):
+        return MousePosition(self.horizontals[row], self.verticals[row])
+
+    def get_context(self, row: int):
+        return self.context_table.get_context(self.context_ids[row])
+
+    def get_relativity(self, row: int):
+        return PositionRelativity(self.relativities[row])
+
+    def get_data(self, row: int):
+        return PositionFileData.from_values(self.get_position(row), self.get_context(row), self.get_relativity(row), self.screens[row], WindowAnchor(self.anchors[row]))
+
+    def find_rows_with_context(self, context: PositionContext):
+        if context not in self.context_table.context_ids:
+            return []
+        context_id = self.context_table.get_id(context)
+        released_rows = set(self.released_rows)
+        return [row for row, row_context_id in enumerate(self.context_ids) if row_context_id == context_id and row not in released_rows]
+
+    def __len__(self):
+        return len(self.horizontals) - len(self.released_rows)
@@ -0,0 +1,75 @@
+from position_columns import *
+from position_index import PositionIndex
+
+import tracemalloc
+import unittest
+
+
+POSITION_COUNT = 10000
+
+def create_data(number):
+    context = PositionContext(f'application {number % 10}', f'part {number % 50}', 'editing' if number % 2 else '')
+    return PositionFileData.from_values(MousePosition(number, -number), context, PositionRelativity.WINDOW)
+
+def measure_allocated_bytes(create):
+    tracemalloc.start()
+    try:
+        result = create()
+        allocated_bytes, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return allocated_bytes, result
+
+class TestPositionColumns(unittest.TestCase):
+    def test_rows_read_back_as_stored(self):
+        columns = PositionColumns()
+        rows = [columns.append(create_data(number)) for number in range(100)]
+
+        data = columns.get_data(rows[37])
+
+        self.assertEqual(37, data.get_position().get_horizontal())
+        self.assertEqual(-37, data.get_position().get_vertical())
+        self.assertEqual(PositionContext('application 7', 'part 37', 'editing'), data.get_context())
+        self.assertEqual(PositionRelativity.WINDOW, data.get_relativity())
+    def test_equal_contexts_share_an_id(self):
+        columns = PositionColumns()
+        for number in range(1000):
+            columns.append(create_data(number))
+
+        self.assertEqual(1000, len(columns))
+        self.assertEqual(50, len(columns.context_table))
+    def test_finds_rows_with_context(self):
+        columns = PositionColumns()
+        for number in range(200):
+            columns.append(create_data(number))
+
+        rows = columns.find_rows_with_context(PositionContext('application 3', 'part 3', 'editing'))
+
+        self.assertEqual([3, 53, 103, 153], rows)
+        self.assertEqual([], columns.find_rows_with_context(PositionContext('missing')))
+
+class TestMemoryFootprint(unittest.TestCase):
+    def test_columns_use_far_less_memory_than_objects(self):
+        object_bytes, _ = measure_allocated_bytes(lambda: [create_data(number) for number in range(POSITION_COUNT)])
+        contexts = [create_data(number).get_context() for number in range(50)]
+        def create_columns():
+            columns = PositionColumns()
+            for number in range(POSITION_COUNT):
+                columns.append(PositionFileData.from_values(MousePosition(number, -number), contexts[number % 50], PositionRelativity.WINDOW))
+            return columns
+        column_bytes, _ = measure_allocated_bytes(create_columns)
+
+        self.assertLess(column_bytes*4, object_bytes)
+    def test_compact_index_uses_less_memory_than_objects(self):
+        def load_index(compact):
+            index = PositionIndex(compact = compact)
+            for number in range(POSITION_COUNT):
+                index.store(f'name {number//50}', f'location {number}', create_data(number))
+            return index
+        object_bytes, _ = measure_allocated_bytes(lambda: load_index(False))
+        column_bytes, _ = measure_allocated_bytes(lambda: load_index(True))
+
+        self.assertLess(column_bytes*1.25, object_bytes)
+
+if __name__ == '__main__':
+    unittest.main()
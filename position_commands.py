@@ -0,0 +1,740 @@
+import functools
+import os
+import threading
+
+try:
+    from .project_types import *
+    from .position_index import PositionIndex
+    from .position_journal import PositionJournal, JournalEntry
+    from .position_storage import DirectoryPositionStorage, DatabasePositionStorage, WriteBehindPositionStorage, PositionStorageError, migrate_positions
+    from .write_behind import WriteBehindQueue
+    from .position_file_watcher import PositionFileWatcher
+    from .window_context_cache import ActiveWindowContextCache
+    from .routes import Route, RouteStep, RouteStorage, RouteFormatError
+    from .window_geometry import make_position_relative_to_window, make_window_relative_position_absolute
+    from .screen_geometry import ScreenGeometryCache
+    from .spatial_index import SpatialGrid, DIRECTIONS, compute_distance
+    from .instrumentation import instrumentation
+except ImportError:
+    from project_types import *
+    from position_index import PositionIndex
+    from position_journal import PositionJournal, JournalEntry
+    from position_storage import DirectoryPositionStorage, DatabasePositionStorage, WriteBehindPositionStorage, PositionStorageError, migrate_positions
+    from write_behind import WriteBehindQueue
+    from position_file_watcher import PositionFileWatcher
+    from window_context_cache import ActiveWindowContextCache
+    from routes import Route, RouteStep, RouteStorage, RouteFormatError
+    from window_geometry import make_position_relative_to_window, make_window_relative_position_absolute
+    from screen_geometry import ScreenGeometryCache
+    from spatial_index import SpatialGrid, DIRECTIONS, compute_distance
+    from instrumentation import instrumentation
+
+
+MOUSE_STORAGE_FOLDER_NAME = 'positions'
+DATA_FOLDER_NAME = 'data'
+DATABASE_FILENAME = 'positions.sqlite3'
+DEFAULT_REFERENCE_POINT_NAME = 'reference point'
+NAMED_REFERENCE_POINT_FOLDER_NAME = 'reference points'
+ROUTE_FOLDER_NAME = 'routes'
+EXCHANGE_FOLDER_NAME = 'exchange'
+EXCHANGE_FILE_EXTENSION = '.jsonl'
+JOURNAL_FOLDER_NAME = 'journal'
+ALL_POSITIONS_EXCHANGE_NAME = 'all positions'
+TIMING_SUMMARY_FILENAME = 'timing summary.txt'
+
+#The value of every setting when it has not been changed. Inside Talon these are the settings named mouse_position_storage_ followed by the setting name
+DEFAULT_SETTINGS = {
+    'application_specific': True,
+    'title': '',
+    'default_mode': '',
+    'required_mode': '',
+    'relativity': 'ABSOLUTE',
+    'window_anchor': 'TOP_LEFT',
+    'backend': 'FILES',
+    'window_context_cache_lifetime': 2000,
+    'reference_point': '',
+    'write_behind': True,
+    'file_watch_interval': 2000,
+    'nearby_distance': 30,
+    'name_tolerance': 0.25,
+    'import_conflict_policy': 'SKIP',
+    'compact_index': False,
+}
+
+#Settings that can be changed directly for running the mouse position storage outside of Talon
+class PositionSettings:
+    def __init__(self, values: dict = None):
+        self.values = dict(DEFAULT_SETTINGS)
+        if values:
+            self.values.update(values)
+
+    def get(self, name: str):
+        return self.values[name]
+
+    def set(self, name: str, value):
+        self.values[name] = value
+
+#Commands can run on different threads, so every method that reads or changes the stored positions holds the position lock
+def holding_position_lock(method):
+    @functools.wraps(method)
+    def method_holding_position_lock(self, *arguments, **keyword_arguments):
+        with self.position_lock:
+            return method(self, *arguments, **keyword_arguments)
+    return method_holding_position_lock
+
+#Everything the mouse position storage commands do, independent of Talon
+#The platform moves the mouse, tells the user things, and describes the active window and screens. See platform_adapter.py
+#The settings provide get(name) for every name in DEFAULT_SETTINGS
+#Positions and data are kept in the positions and data folders of the project directory
+class PositionCommands:
+    def __init__(self, platform, settings, project_directory: str):
+        self.platform = platform
+        self.settings = settings
+        self.mouse_storage_directory = os.path.join(project_directory, MOUSE_STORAGE_FOLDER_NAME)
+        self.data_directory = os.path.join(project_directory, DATA_FOLDER_NAME)
+        self.database_path = os.path.join(self.data_directory, DATABASE_FILENAME)
+        self.named_reference_point_directory = os.path.join(self.data_directory, NAMED_REFERENCE_POINT_FOLDER_NAME)
+        self.exchange_directory = os.path.join(self.data_directory, EXCHANGE_FOLDER_NAME)
+        self.journal_directory = os.path.join(self.data_directory, JOURNAL_FOLDER_NAME)
+        self.timing_summary_path = os.path.join(self.data_directory, TIMING_SUMMARY_FILENAME)
+        self.manually_set_mouse_position_mode = ''
+        self.position_lock = threading.RLock()
+        self.position_index = PositionIndex()
+        self.position_storage = None
+        self.position_storage_backend = ''
+        self.position_journal = None
+        self.write_queue = WriteBehindQueue()
+        self.position_file_watcher = PositionFileWatcher(self.mouse_storage_directory)
+        self.reference_points = {}
+        self.route_storage = RouteStorage(os.path.join(self.data_directory, ROUTE_FOLDER_NAME))
+        self.recorded_route = None
+        self.window_context_cache = ActiveWindowContextCache(
+            {
+                ActiveWindowContextCache.APPLICATION_NAME: lambda: self._query_active_window(self.platform.get_active_application_name),
+                ActiveWindowContextCache.TITLE: lambda: self._query_active_window(self.platform.get_active_window_title),
+                ActiveWindowContextCache.RECTANGLE: lambda: self._query_active_window(self.platform.get_active_window_rectangle),
+            },
+            self.get_window_context_cache_lifetime_in_seconds,
+        )
+        self.screen_geometry_cache = ScreenGeometryCache(self._query_screen_geometry)
+        #The grid of absolute positions for the active context is reused until the context, the active window rectangle, the screens, or the stored positions change
+        self.spatial_grid = None
+        self.spatial_grid_key = None
+        self._register_platform_events()
+
+    def _register_platform_events(self):
+        self.platform.register('win_focus', self.invalidate_window_context_cache)
+        self.platform.register('app_activate', self.invalidate_window_context_cache)
+        self.platform.register('win_title', self.invalidate_cached_window_title)
+        self.platform.register('win_move', self.update_cached_window_rectangle)
+        self.platform.register('win_resize', self.update_cached_window_rectangle)
+        self.platform.register('screen_change', self.invalidate_screen_geometry_cache)
+
+    @holding_position_lock
+    def get_position_storage(self):
+        if self.position_storage is None or self.position_storage_backend != self.settings.get('backend'):
+            self.close_position_storage()
+            self.position_storage_backend = self.settings.get('backend')
+            self.position_storage = self.create_position_storage(self.position_storage_backend)
+            #Locations differ between backends, so every backend gets its own journal
+            self.position_journal = PositionJournal(os.path.join(self.journal_directory, self.position_storage_backend), write_queue = self.write_queue if self.settings.get('write_behind') else None)
+            self.load_position_index()
+        return self.position_storage
+
+    def get_position_journal(self):
+        self.get_position_storage()
+        return self.position_journal
+
+    def load_position_index(self):
+        with instrumentation.phase('index load'):
+            if self.position_storage_backend == 'FILES':
+                self.position_file_watcher.reset()
+            self.position_index.set_compact(self.settings.get('compact_index'))
+            self.position_index.load(self.position_storage)
+
+    def get_position_index(self):
+        self.get_position_storage()
+        return self.position_index
+
+    def create_position_storage(self, backend_name):
+        storage = self.create_position_storage_without_write_behind(backend_name)
+        if self.settings.get('write_behind'):
+            return WriteBehindPositionStorage(storage, self.write_queue)
+        return storage
+
+    def create_position_storage_without_write_behind(self, backend_name):
+        if backend_name == 'DATABASE':
+            return DatabasePositionStorage(self.database_path)
+        if backend_name != 'FILES':
+            print(f'Unknown mouse position storage backend {backend_name}. Storing mouse positions as files instead.')
+        return DirectoryPositionStorage(self.mouse_storage_directory)
+
+    def close_position_storage(self):
+        if self.position_storage is not None:
+            self.position_storage.close()
+
+    #Returns whether every stored mouse position change was saved to disk before the timeout
+    def wait_until_position_changes_saved(self, timeout = None):
+        return self.write_queue.wait_until_flushed(timeout)
+
+    #Rereads only the position files changed outside of this process, leaving files with unsaved changes from this process alone
+    #The files are read without the position lock so that commands never wait on the search. Files this process changed after they were read are left for the next search
+    def reload_externally_changed_positions(self):
+        if self.position_storage is None or self.position_storage_backend != 'FILES':
+            return
+        changes = self.position_file_watcher.find_changes(self.write_queue.has_pending)
+        if changes:
+            self.apply_externally_changed_positions(changes)
+
+    @holding_position_lock
+    def apply_externally_changed_positions(self, changes):
+        for name, path, data in changes:
+            if self.write_queue.has_pending(path) or not self.position_file_watcher.is_unchanged_since_found(path):
+                continue
+            self.position_index.remove_location(path)
+            if data:
+                self.position_index.store(name, path, data)
+
+    #Loads the stored positions and the active reference point in the background so that they are ready by the first command
+    #Every command loads whatever the warm up has not loaded yet on first access, so starting one before the warm up finishes only waits for it
+    def start_warming_up(self):
+        threading.Thread(target = self.warm_up, name = 'mouse position storage warm up', daemon = True).start()
+
+    def warm_up(self):
+        try:
+            self.get_position_storage()
+            self.get_reference_point(self.settings.get('reference_point'))
+        except Exception as exception:
+            print(f'Failed to load the stored mouse positions in the background: {exception}')
+
+    def get_window_context_cache_lifetime_in_seconds(self):
+        return self.settings.get('window_context_cache_lifetime')/1000
+
+    def _query_active_window(self, query):
+        with instrumentation.phase('window query'):
+            return query()
+
+    def invalidate_window_context_cache(self, argument = None):
+        self.window_context_cache.invalidate()
+    def invalidate_cached_window_title(self, window = None):
+        self.window_context_cache.invalidate(ActiveWindowContextCache.TITLE)
+    #Moving or resizing the active window reports its new rectangle so that it does not need to be queried again
+    def update_cached_window_rectangle(self, window):
+        self.window_context_cache.set(ActiveWindowContextCache.RECTANGLE, window.get_rectangle())
+
+    def _query_screen_geometry(self):
+        with instrumentation.phase('screen query'):
+            return self.platform.get_screens()
+
+    #Positions stored relative to a screen move with it, so the grid of absolute positions is built again as well
+    def invalidate_screen_geometry_cache(self, screen = None):
+        self.screen_geometry_cache.invalidate()
+        self.spatial_grid_key = None
+
+    def set_manually_set_mouse_position_mode(self, mode: str):
+        self.manually_set_mouse_position_mode = mode
+
+    def get_mouse_position_mode(self):
+        if not self.manually_set_mouse_position_mode:
+            return self.settings.get('default_mode')
+        return self.manually_set_mouse_position_mode
+
+    def get_required_mode(self):
+        if self.settings.get('required_mode'):
+            return self.settings.get('required_mode')
+        return self.settings.get('default_mode')
+
+    def notify(self, message):
+        self.platform.notify(message)
+
+    def get_mouse_position(self):
+        return self.platform.get_mouse_position()
+
+    def move_mouse(self, position):
+        self.platform.move_mouse(position)
+
+    @holding_position_lock
+    def store_current_mouse_position_with_name(self, name):
+        position = self.get_mouse_position()
+        if self.no_position_with_name_in_active_storage_context(name):
+            with instrumentation.phase('storage'):
+                location = self.get_position_storage().create_location(name)
+            self.store_mouse_position_at_location(name, position, location)
+        else:
+            self.tell_user_must_use_update_commands_to_overwrite_position(name)
+
+    def tell_user_must_use_update_commands_to_overwrite_position(self, name):
+        self.notify(f'Cannot overwrite position {name} with this command. Instead use storage update {name}')
+
+    @holding_position_lock
+    def update_mouse_position_with_name(self, name):
+        location = self.get_location_with_name_and_active_storage_context_if_exists(name)
+        if location is not None:
+            position = self.get_mouse_position()
+            self.store_mouse_position_at_location(name, position, location)
+        else:
+            self.tell_user_position_unavailable_with_name(name)
+    def tell_user_position_unavailable_with_name(self, name):
+        self.notify(f'The position {name} does not exist in an active context!')
+
+    def no_position_with_name_in_active_storage_context(self, name):
+        return self.get_location_with_name_and_active_storage_context_if_exists(name) is None
+
+    def get_location_with_name_and_active_storage_context_if_exists(self, name):
+        active_context = self.get_active_storage_context()
+        with instrumentation.phase('lookup'):
+            stored_position = self.get_position_index().get_stored_position_with_context(name, active_context)
+        if stored_position:
+            return stored_position.get_location()
+        return None
+
+    def store_mouse_position_at_location(self, name, position, location):
+        context = self.get_active_storage_context()
+        print(f'Storing mouse position {name} at location {location} with context {context}')
+        screen_identity = ''
+        anchor = WindowAnchor.TOP_LEFT
+        relativity = self.settings.get('relativity')
+        if relativity == 'WINDOW':
+            anchor = self.get_active_window_anchor()
+            position = self.get_position_relative_to_active_window(position, anchor)
+        elif relativity == 'MOUSE':
+            position = self.get_position_relative_to_reference_point(position)
+        elif relativity == 'SCREEN':
+            screen = self.screen_geometry_cache.find_screen_containing(position)
+            screen_identity = screen.get_identity()
+            position = screen.normalize(position)
+        position_relativity = self.get_active_storage_relativity()
+        data = PositionFileData.from_values(position, context, position_relativity, screen_identity, anchor)
+        old_data = self.get_data_at_location(location)
+        with instrumentation.phase('storage'):
+            self.get_position_storage().write(name, location, data)
+        self.get_position_index().store(name, location, data)
+        self.get_position_journal().record(JournalEntry(name, location, old_data, data))
+
+    def get_data_at_location(self, location):
+        stored_position = self.get_position_index().get_stored_position_at_location(location)
+        if stored_position:
+            return stored_position.get_data()
+        return None
+
+    def get_active_storage_relativity(self):
+        return PositionRelativity[self.settings.get('relativity')]
+
+    def get_active_window_anchor(self):
+        anchor_name = self.settings.get('window_anchor')
+        if anchor_name not in WindowAnchor.__members__:
+            print(f'Unknown mouse position storage window anchor {anchor_name}. Storing positions relative to the top left corner instead.')
+            return WindowAnchor.TOP_LEFT
+        return WindowAnchor[anchor_name]
+
+    def get_active_storage_context(self):
+        with instrumentation.phase('active context'):
+            application = ''
+            if self.stored_position_should_be_application_specific():
+                application = self.window_context_cache.get_application_name()
+            required_title_part = ''
+            if self.stored_position_should_be_title_specific():
+                required_title_part = self.settings.get('title')
+            required_mode = self.get_required_mode()
+            context = PositionContext(application, required_title_part, required_mode)
+        return context
+
+    def stored_position_should_be_application_specific(self):
+        return self.settings.get('application_specific')
+    def stored_position_should_be_title_specific(self):
+        return self.stored_position_should_be_application_specific() and self.settings.get('title')
+
+    @holding_position_lock
+    def go_to_mouse_position(self, name):
+        active_context = self.get_active_context()
+        name = self.resolve_dictated_name(name)
+        data = self.get_data_with_specified_name_best_matching_context(name, active_context)
+        if not data:
+            self.tell_user_position_unavailable_with_name(name)
+            return
+        with instrumentation.phase('absolute position'):
+            position = self.get_absolute_position(data, self.get_mouse_position)
+        with instrumentation.phase('mouse move'):
+            self.move_mouse(position)
+
+    def resolve_dictated_name(self, name):
+        maximum_distance = int(len(name)*self.settings.get('name_tolerance'))
+        with instrumentation.phase('name resolution'):
+            resolved_name = self.get_position_index().resolve_name(name, maximum_distance)
+        if resolved_name is None:
+            return name
+        if resolved_name != name:
+            print(f'Using the mouse position {resolved_name} for the dictated name {name}')
+        return resolved_name
+
+    def get_absolute_position(self, data, get_current_mouse_position):
+        position, position_relativity = data.get_position(), data.get_relativity()
+        if position_relativity == PositionRelativity.WINDOW:
+            position = self.make_position_relative_to_window_absolute(position, data.get_anchor())
+        elif position_relativity == PositionRelativity.MOUSE:
+            position = self.make_position_relative_to_reference_point_absolute(position, get_current_mouse_position())
+        elif position_relativity == PositionRelativity.SCREEN:
+            position = self.screen_geometry_cache.find_screen_with_identity(data.get_screen()).make_absolute(position)
+        return position
+
+    @holding_position_lock
+    def remove_mouse_position_with_name(self, name):
+        active_context = self.get_active_context()
+        with instrumentation.phase('lookup'):
+            stored_position = self.get_position_index().get_best_match(name, active_context)
+        if stored_position:
+            try:
+                self.remove_stored_position(name, stored_position)
+            except PositionStorageError as exception:
+                self.notify('Warning! The mouse position storage position removal code was used to try to remove a position outside the mouse position storage!')
+                print(f'Warning! {exception}')
+                return
+            except:
+                self.notify(f'Error! Could not remove position with name {name}!')
+                return
+        else:
+            self.tell_user_position_unavailable_with_name(name)
+            return
+        self.notify(f'Removed position with name {name} from the act of context!')
+
+    def remove_stored_position(self, name, stored_position):
+        with instrumentation.phase('storage'):
+            self.get_position_storage().remove(name, stored_position.get_location())
+        self.get_position_index().remove(name, stored_position.get_context())
+        self.get_position_journal().record(JournalEntry(name, stored_position.get_location(), stored_position.get_data(), None))
+
+    @holding_position_lock
+    def undo_position_change(self):
+        journal = self.get_position_journal()
+        entry = journal.get_next_undo()
+        if entry is None:
+            self.notify('There are no mouse position changes to undo!')
+            return
+        if not self.location_holds_journaled_data(entry, entry.get_new_data()):
+            self.tell_user_journaled_position_changed_elsewhere('undo', entry)
+            return
+        journal.undo()
+        self.apply_journaled_position(entry, entry.get_old_data())
+        self.notify(f'Undid {entry.describe_change()} position {entry.get_name()}')
+
+    @holding_position_lock
+    def redo_position_change(self):
+        journal = self.get_position_journal()
+        entry = journal.get_next_redo()
+        if entry is None:
+            self.notify('There are no undone mouse position changes to redo!')
+            return
+        if not self.location_holds_journaled_data(entry, entry.get_old_data()):
+            self.tell_user_journaled_position_changed_elsewhere('redo', entry)
+            return
+        journal.redo()
+        self.apply_journaled_position(entry, entry.get_new_data())
+        self.notify(f'Redid {entry.describe_change()} position {entry.get_name()}')
+
+    #Imports, reloaded position files, and other processes change positions without journaling them and freed locations get reused,
+    #so a journaled change is only applied while its location still holds what the journal expects
+    def location_holds_journaled_data(self, entry, expected_data):
+        stored_position = self.get_position_index().get_stored_position_at_location(entry.get_location())
+        if stored_position is None or expected_data is None:
+            return stored_position is None and expected_data is None
+        return stored_position.get_data().get_file_text() == expected_data.get_file_text()
+
+    def tell_user_journaled_position_changed_elsewhere(self, command, entry):
+        self.notify(f'Cannot {command} {entry.describe_change()} position {entry.get_name()} because the position was changed without storage commands since')
+
+    #Puts the data back at the location of the journal entry, removing the position there if the data is None
+    def apply_journaled_position(self, entry, data):
+        name, location = entry.get_name(), entry.get_location()
+        with instrumentation.phase('storage'):
+            if data is None:
+                self.get_position_storage().remove(name, location)
+            else:
+                self.get_position_storage().write(name, location, data)
+        if data is None:
+            self.get_position_index().remove_location(location)
+        else:
+            self.get_position_index().store(name, location, data)
+
+    def get_active_context(self):
+        with instrumentation.phase('active context'):
+            application = self.window_context_cache.get_application_name()
+            title = self.window_context_cache.get_title()
+            mode = self.get_mouse_position_mode()
+            context = PositionContext(application, title, mode)
+        return context
+
+    def get_location_with_specified_name_best_matching_context(self, name, context):
+        stored_position = self.get_position_index().get_best_match(name, context)
+        if stored_position:
+            return stored_position.get_location()
+        return None
+
+    def get_data_with_specified_name_best_matching_context(self, name, context):
+        with instrumentation.phase('lookup'):
+            stored_position = self.get_position_index().get_best_match(name, context)
+        if stored_position:
+            return stored_position.get_data()
+        return None
+
+    def get_position_relative_to_active_window(self, position, anchor = WindowAnchor.TOP_LEFT):
+        return make_position_relative_to_window(position, self.window_context_cache.get_rectangle(), anchor)
+
+    def get_position_relative_to_reference_point(self, position):
+        reference_point_file = self.get_reference_point(self.settings.get('reference_point'))
+        reference_point = reference_point_file.get()
+        return position - reference_point
+
+    def make_position_relative_to_window_absolute(self, position, anchor = WindowAnchor.TOP_LEFT):
+        return make_window_relative_position_absolute(position, self.window_context_cache.get_rectangle(), anchor)
+
+    def make_position_relative_to_reference_point_absolute(self, position, current_position):
+        return position + current_position
+
+    @holding_position_lock
+    def get_reference_point(self, name = ''):
+        if name not in self.reference_points:
+            self.reference_points[name] = self.create_reference_point_file(name)
+        return self.reference_points[name]
+
+    def create_reference_point_file(self, name):
+        if name:
+            return MousePositionFile(self.named_reference_point_directory, name)
+        return MousePositionFile(self.data_directory, DEFAULT_REFERENCE_POINT_NAME)
+
+    def update_reference_point(self, name = ''):
+        self.get_reference_point(name).set(self.get_mouse_position())
+
+    @holding_position_lock
+    def migrate_position_files_to_database(self):
+        self.wait_until_position_changes_saved()
+        source = DirectoryPositionStorage(self.mouse_storage_directory)
+        self.get_position_storage()
+        if self.position_storage_backend == 'DATABASE':
+            migrated_count = migrate_positions(source, self.position_storage)
+            self.load_position_index()
+        else:
+            destination = DatabasePositionStorage(self.database_path)
+            migrated_count = migrate_positions(source, destination)
+            destination.close()
+        self.notify(f'Migrated {migrated_count} mouse positions to the database')
+
+    def get_exchange_file_path(self, name):
+        return os.path.join(self.exchange_directory, name + EXCHANGE_FILE_EXTENSION)
+
+    def export_application_positions(self):
+        application_name = self.window_context_cache.get_application_name()
+        self.export_positions_to_exchange_file(application_name, application_name)
+
+    def export_all_positions(self):
+        self.export_positions_to_exchange_file(ALL_POSITIONS_EXCHANGE_NAME)
+
+    #Position exchange is imported when first used since it is only needed for sharing positions
+    @holding_position_lock
+    def export_positions_to_exchange_file(self, name, app = None):
+        PositionFilter, export_positions = import_position_exchange('PositionFilter', 'export_positions')
+        storage = self.get_position_storage()
+        if not os.path.exists(self.exchange_directory):
+            os.makedirs(self.exchange_directory)
+        path = self.get_exchange_file_path(name)
+        with open(path, 'w') as output_file:
+            exported_count = export_positions(storage, output_file, PositionFilter(app = app))
+        self.notify(f'Exported {exported_count} mouse positions to {path}')
+
+    @holding_position_lock
+    def import_positions_from_exchange_file(self, name):
+        import_positions, = import_position_exchange('import_positions')
+        path = self.get_exchange_file_path(name)
+        if not os.path.exists(path):
+            self.notify(f'The position file {path} does not exist!')
+            return
+        conflict_policy = self.get_import_conflict_policy()
+        storage = self.get_position_storage()
+        try:
+            with open(path, 'r') as input_file:
+                imported_count, skipped_count = import_positions(input_file, storage, self.get_position_index(), conflict_policy, path)
+        except PositionFileFormatError as exception:
+            self.notify(f'Error! Stopped importing mouse positions at a malformed line in {path}!')
+            print(exception)
+            return
+        self.notify(f'Imported {imported_count} mouse positions and skipped {skipped_count}')
+
+    def get_import_conflict_policy(self):
+        ConflictPolicy, = import_position_exchange('ConflictPolicy')
+        policy_name = self.settings.get('import_conflict_policy')
+        if policy_name not in ConflictPolicy.__members__:
+            print(f'Unknown mouse position import conflict policy {policy_name}. Skipping conflicting positions instead.')
+            return ConflictPolicy.SKIP
+        return ConflictPolicy[policy_name]
+
+    def start_recording_route(self, name):
+        self.recorded_route = Route(name)
+        self.route_storage.save(self.recorded_route)
+        self.notify(f'Recording route {name}')
+
+    def edit_route(self, name):
+        route = self.get_route_with_name(name)
+        if route:
+            self.recorded_route = route
+            self.notify(f'Recording more steps for route {name}')
+
+    def add_step_to_recorded_route(self, position_name, should_click):
+        if self.recorded_route_exists():
+            self.recorded_route.add_step(RouteStep(position_name, should_click))
+            self.route_storage.save(self.recorded_route)
+
+    def set_last_recorded_route_step_delay(self, delay_in_milliseconds):
+        if self.recorded_route_exists():
+            self.recorded_route.set_last_step_delay(delay_in_milliseconds)
+            self.route_storage.save(self.recorded_route)
+
+    def remove_last_recorded_route_step(self):
+        if self.recorded_route_exists():
+            self.recorded_route.remove_last_step()
+            self.route_storage.save(self.recorded_route)
+
+    def stop_recording_route(self):
+        if self.recorded_route_exists():
+            self.notify(f'Stopped recording route {self.recorded_route.get_name()}')
+            self.recorded_route = None
+
+    def recorded_route_exists(self):
+        if self.recorded_route is None:
+            self.notify('No route is being recorded!')
+            return False
+        return True
+
+    def delete_route(self, name):
+        if self.recorded_route is not None and self.recorded_route.get_name() == name:
+            self.recorded_route = None
+        if self.route_storage.delete(name):
+            self.notify(f'Deleted route {name}')
+        else:
+            self.tell_user_route_unavailable_with_name(name)
+
+    def get_route_with_name(self, name):
+        try:
+            route = self.route_storage.get(name)
+        except RouteFormatError as exception:
+            self.notify(f'Error! Could not read route {name}!')
+            print(exception)
+            return None
+        if not route:
+            self.tell_user_route_unavailable_with_name(name)
+        return route
+
+    def tell_user_route_unavailable_with_name(self, name):
+        self.notify(f'The route {name} does not exist!')
+
+    def play_route(self, name):
+        route = self.get_route_with_name(name)
+        if not route:
+            return
+        resolved_steps = self.resolve_route_steps(route)
+        if resolved_steps is None:
+            return
+        with instrumentation.phase('route playback'):
+            for position, step in resolved_steps:
+                self.move_mouse(position)
+                if step.get_should_click():
+                    self.platform.click(0)
+                if step.get_delay_in_milliseconds():
+                    self.platform.sleep(step.get_delay_in_milliseconds())
+
+    #Resolves every step against the active context up front so that playing the route does not wait on lookups between steps
+    @holding_position_lock
+    def resolve_route_steps(self, route):
+        active_context = self.get_active_context()
+        current_position = self.get_mouse_position()
+        resolved_steps = []
+        for step in route.get_steps():
+            data = self.get_data_with_specified_name_best_matching_context(step.get_position_name(), active_context)
+            if not data:
+                self.tell_user_position_unavailable_with_name(step.get_position_name())
+                return None
+            previous_position = current_position
+            current_position = self.get_absolute_position(data, lambda: previous_position)
+            resolved_steps.append((current_position, step))
+        return resolved_steps
+
+    def dump_timing_summary(self):
+        summary = instrumentation.format_summary()
+        if not summary:
+            self.notify('No mouse position storage timings have been recorded!')
+            return
+        print(summary)
+        if not os.path.exists(self.data_directory):
+            os.makedirs(self.data_directory)
+        with open(self.timing_summary_path, 'w') as summary_file:
+            summary_file.write(summary)
+        self.notify(f'Saved the mouse position storage timing summary to {self.timing_summary_path}')
+
+    @holding_position_lock
+    def show_lookup_cache_statistics(self):
+        cache = self.get_position_index().get_best_match_cache()
+        hit_count = cache.get_hit_count()
+        lookup_count = hit_count + cache.get_miss_count()
+        hit_percentage = round(100*hit_count/lookup_count) if lookup_count else 0
+        self.notify(f'{hit_count} of {lookup_count} position lookups ({hit_percentage}%) used cached matches. {len(cache)} matches are cached.')
+
+    def get_spatial_grid(self):
+        active_context = self.get_active_context()
+        index = self.get_position_index()
+        key = (active_context, self.window_context_cache.get_rectangle(), index.get_version())
+        if key != self.spatial_grid_key:
+            with instrumentation.phase('spatial index'):
+                self.spatial_grid = self.create_spatial_grid(index, active_context)
+            self.spatial_grid_key = key
+        return self.spatial_grid
+
+    #Positions stored relative to the mouse move with the cursor, so they are left out
+    def create_spatial_grid(self, index, active_context):
+        grid = SpatialGrid()
+        for name in index.get_names():
+            stored_position = index.get_best_match_without_caching(name, active_context)
+            if stored_position is None or stored_position.get_data().get_relativity() == PositionRelativity.MOUSE:
+                continue
+            grid.insert(self.get_absolute_position(stored_position.get_data(), self.get_mouse_position), name)
+        return grid
+
+    @holding_position_lock
+    def name_position_near_cursor(self):
+        cursor_position = self.get_mouse_position()
+        nearest = self.get_spatial_grid().find_nearest(cursor_position)
+        if not nearest:
+            self.notify('No stored positions exist in the active context!')
+            return
+        position, name = nearest
+        distance = compute_distance(cursor_position, position)
+        if distance <= self.settings.get('nearby_distance'):
+            self.notify(f'The cursor is on {name}')
+        else:
+            self.notify(f'The nearest position is {name}, {round(distance)} pixels away')
+
+    @holding_position_lock
+    def go_to_nearest_position_in_direction(self, direction):
+        if direction not in DIRECTIONS:
+            self.notify(f'Unknown direction {direction}! Use left, right, up, or down')
+            return
+        nearest = self.get_spatial_grid().find_nearest_in_direction(self.get_mouse_position(), direction)
+        if not nearest:
+            self.notify(f'No stored position is {direction} of the cursor!')
+            return
+        position, _ = nearest
+        with instrumentation.phase('mouse move'):
+            self.move_mouse(position)
+
+    @holding_position_lock
+    def list_positions_in_active_window(self):
+        rectangle = self.window_context_cache.get_rectangle()
+        entries = self.get_spatial_grid().find_in_rectangle(rectangle.left, rectangle.top, rectangle.left + rectangle.width, rectangle.top + rectangle.height)
+        if not entries:
+            self.notify('No stored positions are inside the active window!')
+            return
+        self.notify(', '.join(sorted(name for _, name in entries)))
+
+def import_position_exchange(*names):
+    try:
+        from . import position_exchange
+    except ImportError:
+        import position_exchange
+    return [getattr(position_exchange, name) for name in names]
@@ -0,0 +1,271 @@
+from position_commands import *
+from platform_adapter import SimulatedPlatform, ActiveWindow
+from window_geometry import WindowRectangle
+from screen_geometry import ScreenGeometry
+
+import os
+import tempfile
+import threading
+import unittest
+
+
+def create_window(application_name, title = 'title', rectangle = None):
+    return ActiveWindow(application_name, title, rectangle if rectangle is not None else WindowRectangle(100, 100, 800, 600))
+
+#Runs the position commands end to end against a simulated platform and a temporary project directory
+class PositionCommandsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.platform = SimulatedPlatform(create_window('editor'))
+        self.settings = PositionSettings({'write_behind': False})
+        self.commands = PositionCommands(self.platform, self.settings, self.directory.name)
+
+    def tearDown(self):
+        self.commands.close_position_storage()
+        self.directory.cleanup()
+
+    def store_at(self, name, horizontal, vertical):
+        self.platform.place_cursor(MousePosition(horizontal, vertical))
+        self.commands.store_current_mouse_position_with_name(name)
+
+    def walk_to(self, name):
+        self.commands.go_to_mouse_position(name)
+        return self.platform.mouse_moves[-1] if self.platform.mouse_moves else None
+
+    def reopen(self):
+        self.commands.close_position_storage()
+        self.commands = PositionCommands(self.platform, self.settings, self.directory.name)
+
+class TestStoringAndWalking(PositionCommandsTestCase):
+    def test_walks_to_stored_position(self):
+        self.store_at('save', 10, 20)
+
+        self.assertEqual((10, 20), self.walk_to('save'))
+    def test_positions_are_application_specific(self):
+        self.store_at('save', 10, 20)
+        self.platform.schedule_window(1, create_window('browser'))
+        self.platform.advance_time(1)
+        self.store_at('save', 30, 40)
+
+        self.assertEqual((30, 40), self.walk_to('save'))
+        self.platform.set_active_window(create_window('editor'))
+        self.assertEqual((10, 20), self.walk_to('save'))
+    def test_window_positions_follow_the_window(self):
+        self.settings.set('relativity', 'WINDOW')
+        self.store_at('menu', 150, 130)
+
+        self.platform.set_active_window(create_window('editor', rectangle = WindowRectangle(300, 200, 800, 600)))
+
+        self.assertEqual((350, 230), self.walk_to('menu'))
+    def test_proportional_positions_follow_window_size(self):
+        self.settings.set('relativity', 'WINDOW')
+        self.settings.set('window_anchor', 'PROPORTIONAL')
+        self.store_at('center', 500, 400)
+
+        self.platform.set_active_window(create_window('editor', rectangle = WindowRectangle(100, 100, 400, 300)))
+
+        self.assertEqual((300, 250), self.walk_to('center'))
+    def test_screen_positions_follow_resolution(self):
+        self.settings.set('relativity', 'SCREEN')
+        self.store_at('corner', 960, 540)
+
+        self.platform.set_screens([ScreenGeometry('0', 0, 0, 3840, 2160)])
+
+        self.assertEqual((1920, 1080), self.walk_to('corner'))
+    def test_mode_specific_positions(self):
+        self.settings.set('required_mode', 'editing')
+        self.store_at('button', 1, 2)
+
+        self.assertIsNone(self.walk_to('button'))
+        self.commands.set_manually_set_mouse_position_mode('editing')
+        self.assertEqual((1, 2), self.walk_to('button'))
+    def test_store_refuses_to_overwrite(self):
+        self.store_at('save', 10, 20)
+        self.store_at('save', 30, 40)
+
+        self.assertIn('storage update save', self.platform.get_last_notification())
+        self.assertEqual((10, 20), self.walk_to('save'))
+    def test_update_and_remove(self):
+        self.store_at('save', 10, 20)
+        self.platform.place_cursor(MousePosition(30, 40))
+        self.commands.update_mouse_position_with_name('save')
+        self.assertEqual((30, 40), self.walk_to('save'))
+
+        self.commands.remove_mouse_position_with_name('save')
+
+        self.assertEqual(1, len(self.platform.mouse_moves))
+        self.walk_to('save')
+        self.assertEqual(1, len(self.platform.mouse_moves))
+        self.assertIn('does not exist', self.platform.get_last_notification())
+    def test_walks_to_misrecognized_name(self):
+        self.store_at('submit', 10, 20)
+
+        self.assertEqual((10, 20), self.walk_to('summit'))
+    def test_positions_survive_reopening(self):
+        self.store_at('save', 10, 20)
+
+        self.reopen()
+
+        self.assertEqual((10, 20), self.walk_to('save'))
+    def test_database_backend(self):
+        self.settings.set('backend', 'DATABASE')
+        self.store_at('save', 10, 20)
+
+        self.reopen()
+
+        self.assertEqual((10, 20), self.walk_to('save'))
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, MOUSE_STORAGE_FOLDER_NAME)))
+    def test_undo_and_redo(self):
+        self.store_at('save', 10, 20)
+        self.commands.remove_mouse_position_with_name('save')
+
+        self.commands.undo_position_change()
+        self.assertEqual((10, 20), self.walk_to('save'))
+        self.commands.undo_position_change()
+        self.walk_to('save')
+        self.assertIn('does not exist', self.platform.get_last_notification())
+        self.commands.redo_position_change()
+        self.assertEqual((10, 20), self.walk_to('save'))
+    def import_position(self, name, application_name, horizontal, vertical):
+        os.makedirs(self.commands.exchange_directory, exist_ok = True)
+        with open(self.commands.get_exchange_file_path('shared'), 'w') as exchange_file:
+            exchange_file.write(f'{{"name": "{name}", "app": "{application_name}", "horizontal": {horizontal}, "vertical": {vertical}}}\n')
+        self.commands.import_positions_from_exchange_file('shared')
+
+    def test_undo_refuses_to_overwrite_position_imported_since(self):
+        self.store_at('save', 10, 20)
+        self.commands.remove_mouse_position_with_name('save')
+        self.reopen()
+        self.import_position('save', 'browser', 30, 40)
+
+        self.commands.undo_position_change()
+
+        self.assertIn('Cannot undo removing position save', self.platform.get_last_notification())
+        self.platform.set_active_window(create_window('browser'))
+        self.assertEqual((30, 40), self.walk_to('save'))
+    def test_redo_refuses_to_overwrite_position_imported_since(self):
+        self.store_at('save', 10, 20)
+        self.commands.undo_position_change()
+        self.reopen()
+        self.import_position('save', 'editor', 30, 40)
+
+        self.commands.redo_position_change()
+
+        self.assertIn('Cannot redo storing position save', self.platform.get_last_notification())
+        self.assertEqual((30, 40), self.walk_to('save'))
+
+class TestReloadingExternalChanges(PositionCommandsTestCase):
+    def edit_position_file(self, name, horizontal, vertical):
+        location = self.commands.get_position_index().get_stored_positions_with_name(name)[0].get_location()
+        data = PositionFileData.from_values(MousePosition(horizontal, vertical), PositionContext('editor'), PositionRelativity.ABSOLUTE)
+        with open(location, 'w') as position_file:
+            position_file.write(data.get_file_text() + '\n')
+
+    def test_reloads_edited_position(self):
+        self.store_at('save', 10, 20)
+
+        self.edit_position_file('save', 30, 40)
+        self.commands.reload_externally_changed_positions()
+
+        self.assertEqual((30, 40), self.walk_to('save'))
+    def test_searches_for_changes_without_position_lock(self):
+        self.store_at('save', 10, 20)
+        self.commands.reload_externally_changed_positions()
+        searched = threading.Event()
+        def reload():
+            self.commands.reload_externally_changed_positions()
+            searched.set()
+
+        with self.commands.position_lock:
+            threading.Thread(target = reload).start()
+            self.assertTrue(searched.wait(5))
+
+class TestRoutes(PositionCommandsTestCase):
+    def test_plays_recorded_route(self):
+        self.store_at('file', 10, 20)
+        self.store_at('save', 30, 40)
+        self.commands.start_recording_route('save file')
+        self.commands.add_step_to_recorded_route('file', True)
+        self.commands.set_last_recorded_route_step_delay(500)
+        self.commands.add_step_to_recorded_route('save', False)
+        self.commands.stop_recording_route()
+
+        self.commands.play_route('save file')
+
+        self.assertEqual([(10, 20), (30, 40)], self.platform.mouse_moves)
+        self.assertEqual([((10, 20), 0)], self.platform.clicks)
+        self.assertEqual(0.5, self.platform.get_time())
+    def test_route_with_missing_position_does_not_move(self):
+        self.commands.start_recording_route('missing')
+        self.commands.add_step_to_recorded_route('nowhere', False)
+
+        self.commands.play_route('missing')
+
+        self.assertEqual([], self.platform.mouse_moves)
+
+class TestNearbyPositions(PositionCommandsTestCase):
+    def test_names_position_under_cursor(self):
+        self.store_at('save', 200, 200)
+        self.platform.place_cursor(MousePosition(205, 200))
+
+        self.commands.name_position_near_cursor()
+
+        self.assertEqual('The cursor is on save', self.platform.get_last_notification())
+    def test_screen_positions_near_cursor_follow_resolution(self):
+        self.settings.set('relativity', 'SCREEN')
+        self.store_at('middle', 960, 540)
+        self.commands.name_position_near_cursor()
+
+        self.platform.set_screens([ScreenGeometry('0', 0, 0, 3840, 2160)])
+        self.platform.place_cursor(MousePosition(1920, 1080))
+        self.commands.name_position_near_cursor()
+
+        self.assertEqual('The cursor is on middle', self.platform.get_last_notification())
+    def test_walks_in_direction(self):
+        self.store_at('left', 100, 200)
+        self.store_at('right', 300, 200)
+        self.platform.place_cursor(MousePosition(200, 200))
+
+        self.commands.go_to_nearest_position_in_direction('right')
+
+        self.assertEqual([(300, 200)], self.platform.mouse_moves)
+    def test_lists_positions_in_active_window(self):
+        self.store_at('inside', 200, 200)
+        self.store_at('outside', 1000, 1000)
+
+        self.commands.list_positions_in_active_window()
+
+        self.assertEqual('inside', self.platform.get_last_notification())
+    def test_lists_positions_in_tracked_window_rectangle(self):
+        self.store_at('inside', 200, 200)
+        self.commands.list_positions_in_active_window()
+        rectangle_queries = []
+        query_rectangle = self.platform.get_active_window_rectangle
+        self.platform.get_active_window_rectangle = lambda: rectangle_queries.append(True) or query_rectangle()
+
+        self.platform.set_active_window(create_window('editor', rectangle = WindowRectangle(500, 500, 800, 600)))
+        self.commands.list_positions_in_active_window()
+
+        self.assertEqual([], rectangle_queries)
+        self.assertEqual('No stored positions are inside the active window!', self.platform.get_last_notification())
+
+class TestExchange(PositionCommandsTestCase):
+    def test_exported_positions_can_be_imported_elsewhere(self):
+        self.store_at('save', 10, 20)
+        self.commands.export_all_positions()
+        other_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(other_directory.cleanup)
+        other_commands = PositionCommands(self.platform, self.settings, other_directory.name)
+        os.makedirs(other_commands.exchange_directory)
+        os.replace(self.commands.get_exchange_file_path(ALL_POSITIONS_EXCHANGE_NAME), other_commands.get_exchange_file_path('shared'))
+
+        other_commands.import_positions_from_exchange_file('shared')
+        other_commands.go_to_mouse_position('save')
+
+        self.assertEqual('Imported 1 mouse positions and skipped 0', self.platform.notifications[-1])
+        self.assertEqual((10, 20), self.platform.mouse_moves[-1])
+        other_commands.close_position_storage()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#Exports stored positions to and imports them from JSON Lines files with one position per line
+#Can also be run outside of Talon. Example: python position_exchange.py export positions firefox.jsonl --app firefox
+#Talon loads every module at startup, so json and argparse are only imported once positions are shared because they are slow to import
+import enum
+import os
+
+try:
+    from .project_types import *
+    from .position_index import PositionIndex
+    from .position_storage import DirectoryPositionStorage, DatabasePositionStorage
+except ImportError:
+    from project_types import *
+    from position_index import PositionIndex
+    from position_storage import DirectoryPositionStorage, DatabasePositionStorage
+
+
+#Decides what happens to an imported position when a position with the same name already exists
+class ConflictPolicy(enum.Enum):
+    #Keeps the existing position with the same name and context
+    SKIP = enum.auto()
+    #Replaces the existing position with the same name and context
+    OVERWRITE = enum.auto()
+    #Another name for OVERWRITE. Positions with the same name and context are equally specific, and positions that differ in context never conflict because walking prefers the most specific one that applies
+    SPECIFICITY = OVERWRITE
+
+#Selects which stored positions get exported. None matches any application or mode
+class PositionFilter:
+    def __init__(self, app: str = None, mode: str = None, name_prefix: str = ''):
+        self.app = app
+        self.mode = mode
+        self.name_prefix = name_prefix
+
+    def matches(self, name: str, data: PositionFileData):
+        context = data.get_context()
+        return name.startswith(self.name_prefix) \
+            and (self.app is None or context.app == self.app) \
+            and (self.mode is None or context.mouse_position_mode == self.mode)
+
+def convert_position_to_record(name: str, data: PositionFileData):
+    context = data.get_context()
+    position = data.get_position()
+    return {
+        'name': name,
+        'app': context.app,
+        'title': context.title_part,
+        'mode': context.mouse_position_mode,
+        'horizontal': position.get_horizontal(),
+        'vertical': position.get_vertical(),
+        'relativity': data.get_relativity().name,
+        'screen': data.get_screen(),
+        'anchor': data.get_anchor().name,
+    }
+
+def convert_record_to_position(record):
+    context = PositionContext(record.get('app', ''), record.get('title', ''), record.get('mode', ''))
+    position = MousePosition(int(record['horizontal']), int(record['vertical']))
+    relativity = PositionRelativity[record.get('relativity', PositionRelativity.ABSOLUTE.name)]
+    anchor = WindowAnchor[record.get('anchor', WindowAnchor.TOP_LEFT.name)]
+    return record['name'], PositionFileData.from_values(position, context, relativity, record.get('screen', ''), anchor)
+
+#Writes every position matching the filter to the output file as it is read from the storage and returns how many were written
+def export_positions(storage, output_file, position_filter: PositionFilter = None):
+    import json
+    position_filter = position_filter if position_filter is not None else PositionFilter()
+    exported_count = 0
+    for name, _, data in storage.read_all():
+        if position_filter.matches(name, data):
+            output_file.write(json.dumps(convert_position_to_record(name, data), separators = (',', ':')) + '\n')
+            exported_count += 1
+    return exported_count
+
+#Stores every position in the lines as it is read and returns how many positions were imported and how many were skipped
+#The index must hold the positions in the storage and is kept up to date with the imported positions
+def import_positions(lines, storage, index: PositionIndex, conflict_policy: ConflictPolicy = ConflictPolicy.SKIP, source: str = 'position records'):
+    imported_count = 0
+    skipped_count = 0
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        name, data = parse_record_line(line, line_number, source)
+        location = find_import_location(name, data, storage, index, conflict_policy)
+        if location is None:
+            skipped_count += 1
+            continue
+        storage.write(name, location, data)
+        index.store(name, location, data)
+        imported_count += 1
+    return imported_count, skipped_count
+
+def parse_record_line(line, line_number, source):
+    import json
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError('expected a JSON object')
+        name, data = convert_record_to_position(record)
+        check_name_is_single_directory(name)
+        return name, data
+    except KeyError as exception:
+        raise PositionFileFormatError(source, line_number, line, f'missing or unknown field {exception}') from exception
+    except (ValueError, TypeError) as exception:
+        raise PositionFileFormatError(source, line_number, line, str(exception)) from exception
+
+#Shared position files are untrusted, so a name must not lead outside the directory its positions are stored in
+def check_name_is_single_directory(name):
+    if not isinstance(name, str) or name in ['', '.', '..'] or os.path.isabs(name) \
+            or os.sep in name or (os.altsep and os.altsep in name):
+        raise ValueError(f'the name {name!r} is not a valid directory name')
+
+def find_import_location(name, data, storage, index, conflict_policy):
+    context = data.get_context()
+    existing_position = index.get_stored_position_with_context(name, context)
+    if existing_position:
+        if conflict_policy == ConflictPolicy.SKIP:
+            return None
+        return existing_position.get_location()
+    return storage.create_location(name)
+
+def create_storage(arguments):
+    if arguments.database:
+        return DatabasePositionStorage(arguments.store)
+    return DirectoryPositionStorage(arguments.store)
+
+def parse_arguments():
+    import argparse
+    parser = argparse.ArgumentParser(description = 'Exports or imports stored mouse positions as JSON Lines')
+    parser.add_argument('command', choices = ['export', 'import'])
+    parser.add_argument('store', help = 'The positions directory or, with --database, the position database')
+    parser.add_argument('file', help = 'The JSON Lines file to export to or import from')
+    parser.add_argument('--database', action = 'store_true', help = 'Treat the store as a position database instead of a positions directory')
+    parser.add_argument('--app', help = 'Only export positions stored for this application')
+    parser.add_argument('--mode', help = 'Only export positions stored for this mouse position mode')
+    parser.add_argument('--name-prefix', default = '', help = 'Only export positions whose names start with this text')
+    parser.add_argument('--conflict', choices = list(ConflictPolicy.__members__), default = ConflictPolicy.SKIP.name)
+    return parser.parse_args()
+
+def main():
+    arguments = parse_arguments()
+    storage = create_storage(arguments)
+    if arguments.command == 'export':
+        with open(arguments.file, 'w') as output_file:
+            exported_count = export_positions(storage, output_file, PositionFilter(arguments.app, arguments.mode, arguments.name_prefix))
+        print(f'Exported {exported_count} positions to {arguments.file}')
+    else:
+        index = PositionIndex()
+        index.load(storage)
+        with open(arguments.file, 'r') as input_file:
+            imported_count, skipped_count = import_positions(input_file, storage, index, ConflictPolicy[arguments.conflict], arguments.file)
+        print(f'Imported {imported_count} positions and skipped {skipped_count} from {arguments.file}')
+    storage.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+from position_exchange import *
+
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+
+
+THROUGHPUT_RECORD_COUNT = 100_000
+
+def create_data(horizontal, vertical, app = '', title_part = '', mode = ''):
+    context = PositionContext(app, title_part, mode)
+    return PositionFileData.from_values(MousePosition(horizontal, vertical), context, PositionRelativity.WINDOW)
+
+#Keeps positions in a dictionary so that the throughput test measures the exchange rather than the disk
+class MemoryPositionStorage:
+    def __init__(self):
+        self.positions = {}
+        self.next_location = 0
+
+    def read_all(self):
+        for location, (name, data) in self.positions.items():
+            yield name, location, data
+
+    def create_location(self, name: str):
+        self.next_location += 1
+        return self.next_location
+
+    def write(self, name: str, location, data: PositionFileData):
+        self.positions[location] = (name, data)
+
+def create_storage_and_index(positions):
+    storage = MemoryPositionStorage()
+    index = PositionIndex()
+    for name, data in positions:
+        location = storage.create_location(name)
+        storage.write(name, location, data)
+        index.store(name, location, data)
+    return storage, index
+
+def export_to_text(storage, position_filter = None):
+    output_file = io.StringIO()
+    export_positions(storage, output_file, position_filter)
+    return output_file.getvalue()
+
+class TestExportPositions(unittest.TestCase):
+    def test_exported_positions_import_unchanged(self):
+        source, _ = create_storage_and_index([('button', create_data(1, -2, 'app', 'part', 'editing'))])
+        destination, destination_index = create_storage_and_index([])
+
+        import_positions(io.StringIO(export_to_text(source)), destination, destination_index)
+
+        stored_position = destination_index.get_stored_position_with_context('button', PositionContext('app', 'part', 'editing'))
+        self.assertEqual(-2, stored_position.get_data().get_position().get_vertical())
+        self.assertEqual(PositionRelativity.WINDOW, stored_position.get_data().get_relativity())
+        self.assertEqual(1, len(destination.positions))
+    def test_filter_selects_application_mode_and_name_prefix(self):
+        storage, _ = create_storage_and_index([
+            ('save button', create_data(1, 1, 'editor', '', 'editing')),
+            ('save menu', create_data(2, 2, 'editor')),
+            ('open button', create_data(3, 3, 'editor', '', 'editing')),
+            ('save button', create_data(4, 4, 'browser', '', 'editing')),
+        ])
+
+        text = export_to_text(storage, PositionFilter('editor', 'editing', 'save'))
+
+        records = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual([('save button', 1)], [(record['name'], record['horizontal']) for record in records])
+    def test_cli_exports_position_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = DirectoryPositionStorage(os.path.join(directory, 'positions'))
+            storage.write('button', storage.create_location('button'), create_data(5, 6, 'app'))
+            storage_index = PositionIndex()
+            storage_index.load(storage)
+            output_path = os.path.join(directory, 'positions.jsonl')
+            with open(output_path, 'w') as output_file:
+                export_positions(storage, output_file)
+
+            destination = DirectoryPositionStorage(os.path.join(directory, 'copy'))
+            destination_index = PositionIndex()
+            with open(output_path, 'r') as input_file:
+                import_positions(input_file, destination, destination_index)
+
+            reloaded_index = PositionIndex()
+            reloaded_index.load(destination)
+            self.assertEqual(6, reloaded_index.get_best_match('button', PositionContext('app', 'title', '')).get_data().get_position().get_vertical())
+
+class TestImportPositions(unittest.TestCase):
+    def import_text(self, text, existing_positions, conflict_policy):
+        storage, index = create_storage_and_index(existing_positions)
+        counts = import_positions(io.StringIO(text), storage, index, conflict_policy)
+        return counts, index
+
+    def create_record_text(self, name, data):
+        return json.dumps(convert_position_to_record(name, data)) + '\n'
+
+    def test_skip_keeps_stored_position(self):
+        text = self.create_record_text('button', create_data(9, 9, 'app'))
+
+        counts, index = self.import_text(text, [('button', create_data(1, 1, 'app'))], ConflictPolicy.SKIP)
+
+        self.assertEqual((0, 1), counts)
+        self.assertEqual(1, index.get_best_match('button', PositionContext('app')).get_data().get_position().get_horizontal())
+    def test_overwrite_replaces_stored_position(self):
+        text = self.create_record_text('button', create_data(9, 9, 'app'))
+
+        counts, index = self.import_text(text, [('button', create_data(1, 1, 'app'))], ConflictPolicy.OVERWRITE)
+
+        self.assertEqual((1, 0), counts)
+        self.assertEqual(1, len(index.get_stored_positions_with_name('button')))
+        self.assertEqual(9, index.get_best_match('button', PositionContext('app')).get_data().get_position().get_horizontal())
+    def test_specificity_keeps_positions_that_do_not_conflict(self):
+        text = self.create_record_text('button', create_data(5, 5, '')) \
+            + self.create_record_text('button', create_data(6, 6, 'app', 'part')) \
+            + self.create_record_text('button', create_data(7, 7, 'app', 'part', 'editing'))
+
+        counts, index = self.import_text(text, [('button', create_data(1, 1, 'app', 'part'))], ConflictPolicy.SPECIFICITY)
+
+        self.assertEqual((3, 0), counts)
+        self.assertEqual(5, index.get_best_match('button', PositionContext('other app')).get_data().get_position().get_horizontal())
+        self.assertEqual(6, index.get_best_match('button', PositionContext('app', 'part', '')).get_data().get_position().get_horizontal())
+        self.assertEqual(7, index.get_best_match('button', PositionContext('app', 'part', 'editing')).get_data().get_position().get_horizontal())
+    def test_names_leading_outside_positions_directory_are_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = DirectoryPositionStorage(os.path.join(directory, 'positions'))
+            outside_path = os.path.join(directory, 'outside')
+            for name in ['../../escaped', '..', outside_path]:
+                text = self.create_record_text(name, create_data(1, 1))
+
+                with self.assertRaises(PositionFileFormatError):
+                    import_positions(io.StringIO(text), storage, PositionIndex())
+
+            self.assertEqual([], os.listdir(directory))
+            self.assertFalse(os.path.exists(os.path.join(os.path.dirname(directory), 'escaped')))
+    def test_malformed_record_reports_line_number(self):
+        text = self.create_record_text('button', create_data(1, 1)) + '\n{"name": "menu"}\n'
+
+        with self.assertRaises(PositionFileFormatError) as context:
+            self.import_text(text, [], ConflictPolicy.SKIP)
+
+        self.assertEqual(3, context.exception.line_number)
+
+class TestExchangeThroughput(unittest.TestCase):
+    def test_round_trips_many_records_quickly(self):
+        positions = [(f'name {number % 1000}', create_data(number, number, f'application {number//1000}')) for number in range(THROUGHPUT_RECORD_COUNT)]
+        source, _ = create_storage_and_index(positions)
+        destination, destination_index = create_storage_and_index([])
+
+        start_time = time.perf_counter()
+        text = export_to_text(source)
+        imported_count, _ = import_positions(io.StringIO(text), destination, destination_index)
+        duration = time.perf_counter() - start_time
+
+        self.assertEqual(THROUGHPUT_RECORD_COUNT, imported_count)
+        self.assertLess(duration, 30)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+
+try:
+    from .project_types import *
+    from .file_operations import is_temporary_file
+except ImportError:
+    from project_types import *
+    from file_operations import is_temporary_file
+
+
+#Finds which position files changed since it last looked by comparing their modification times and sizes
+class PositionFileWatcher:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.versions = {}
+
+    def reset(self):
+        self.versions = self._take_snapshot()
+
+    #Returns the name, path, and freshly parsed data of every changed position file with None as the data for removed files
+    #Paths the caller should skip are left for a later call
+    def find_changes(self, should_skip = lambda path: False):
+        changes = []
+        snapshot = self._take_snapshot()
+        for path, (name, version) in snapshot.items():
+            if self.versions.get(path) == (name, version) or should_skip(path):
+                continue
+            data = self._read_data(path)
+            if data is False:
+                continue
+            self.versions[path] = (name, version)
+            changes.append((name, path, data))
+        for path in list(self.versions.keys()):
+            if path not in snapshot and not should_skip(path):
+                name, _ = self.versions.pop(path)
+                changes.append((name, path, None))
+        return changes
+
+    #Returns whether the file is still as it was when its change was found, forgetting the file otherwise so that the next search reads it again
+    def is_unchanged_since_found(self, path: str):
+        try:
+            file_status = os.stat(path)
+            version = (file_status.st_mtime_ns, file_status.st_size)
+        except FileNotFoundError:
+            version = None
+        found_name_and_version = self.versions.get(path)
+        found_version = found_name_and_version[1] if found_name_and_version else None
+        if found_version == version:
+            return True
+        self.versions.pop(path, None)
+        return False
+
+    #Returns False for files that could not be parsed so that they are read again once whoever is editing them finishes
+    def _read_data(self, path):
+        try:
+            data = PositionFileData(path)
+        except Exception as exception:
+            print(f'Could not reload the mouse position at path {path}: {exception}')
+            return False
+        if data.get_position() is None:
+            return None
+        return data
+
+    def _take_snapshot(self):
+        snapshot = {}
+        if not os.path.isdir(self.directory):
+            return snapshot
+        with os.scandir(self.directory) as name_entries:
+            for name_entry in name_entries:
+                if name_entry.is_dir():
+                    self._add_directory_to_snapshot(snapshot, name_entry.name, name_entry.path)
+        return snapshot
+
+    def _add_directory_to_snapshot(self, snapshot, name, directory):
+        try:
+            with os.scandir(directory) as file_entries:
+                for file_entry in file_entries:
+                    if is_temporary_file(file_entry.name):
+                        continue
+                    try:
+                        file_status = file_entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[file_entry.path] = (name, (file_status.st_mtime_ns, file_status.st_size))
+        except FileNotFoundError:
+            pass
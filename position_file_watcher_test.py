@@ -0,0 +1,79 @@
+from position_file_watcher import *
+
+import os
+import tempfile
+import unittest
+
+
+def write_position_file(path, horizontal, app = 'app'):
+    data = PositionFileData.from_values(MousePosition(horizontal, 0), PositionContext(app), PositionRelativity.ABSOLUTE)
+    with open(path, 'w') as position_file:
+        position_file.write(data.get_file_text())
+
+class TestPositionFileWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.name_directory = os.path.join(self.directory.name, 'button')
+        os.makedirs(self.name_directory)
+        self.path = os.path.join(self.name_directory, '0.txt')
+        write_position_file(self.path, 1)
+        self.watcher = PositionFileWatcher(self.directory.name)
+        self.watcher.reset()
+    def tearDown(self):
+        self.directory.cleanup()
+    def test_no_changes_right_after_reset(self):
+        self.assertEqual([], self.watcher.find_changes())
+    def test_finds_only_changed_file(self):
+        other_path = os.path.join(self.name_directory, '1.txt')
+        write_position_file(other_path, 2, 'other')
+        self.watcher.reset()
+
+        write_position_file(self.path, 12345)
+        changes = self.watcher.find_changes()
+
+        self.assertEqual(1, len(changes))
+        name, path, data = changes[0]
+        self.assertEqual(('button', self.path), (name, path))
+        self.assertEqual(12345, data.get_position().get_horizontal())
+        self.assertEqual([], self.watcher.find_changes())
+    def test_finds_added_and_removed_files(self):
+        added_path = os.path.join(self.name_directory, '1.txt')
+        write_position_file(added_path, 2)
+        os.remove(self.path)
+
+        changes = {path: data for _, path, data in self.watcher.find_changes()}
+
+        self.assertIsNone(changes[self.path])
+        self.assertEqual(2, changes[added_path].get_position().get_horizontal())
+    def test_skipped_paths_are_found_later(self):
+        write_position_file(self.path, 12345)
+
+        self.assertEqual([], self.watcher.find_changes(lambda path: path == self.path))
+        self.assertEqual(1, len(self.watcher.find_changes()))
+    def test_file_changed_again_after_being_found_is_found_again(self):
+        write_position_file(self.path, 12345)
+        self.watcher.find_changes()
+        self.assertTrue(self.watcher.is_unchanged_since_found(self.path))
+
+        write_position_file(self.path, 123456)
+
+        self.assertFalse(self.watcher.is_unchanged_since_found(self.path))
+        self.assertEqual(123456, self.watcher.find_changes()[0][2].get_position().get_horizontal())
+    def test_file_without_position_is_retried(self):
+        with open(self.path, 'w') as position_file:
+            position_file.write('app:app\n')
+
+        self.assertEqual([], self.watcher.find_changes())
+        write_position_file(self.path, 7)
+        self.assertEqual(7, self.watcher.find_changes()[0][2].get_position().get_horizontal())
+    def test_unparsable_file_is_retried(self):
+        with open(self.path, 'w') as position_file:
+            position_file.write('app:app\n(1, ')
+
+        self.assertEqual([], self.watcher.find_changes())
+        write_position_file(self.path, 7)
+        self.assertEqual(7, self.watcher.find_changes()[0][2].get_position().get_horizontal())
+
+
+if __name__ == '__main__':
+    unittest.main()
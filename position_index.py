@@ -0,0 +1,225 @@
+from collections import OrderedDict
+
+try:
+    from .project_types import *
+    from .context_matcher import ContextMatcher
+    from .name_index import NameIndex
+    from .position_columns import PositionColumns
+except ImportError:
+    from project_types import *
+    from context_matcher import ContextMatcher
+    from name_index import NameIndex
+    from position_columns import PositionColumns
+
+
+#A stored position along with where its storage keeps it
+class StoredPosition:
+    __slots__ = ('location', 'data')
+    def __init__(self, location, data: PositionFileData):
+        self.location = location
+        self.data = data
+
+    def get_location(self):
+        return self.location
+    def get_data(self):
+        return self.data
+    def get_context(self):
+        return self.data.get_context()
+
+#A stored position kept as a row of position columns. Its data is rebuilt from the row whenever it is read
+class ColumnStoredPosition:
+    __slots__ = ('location', 'columns', 'row')
+    def __init__(self, location, columns: PositionColumns, row: int):
+        self.location = location
+        self.columns = columns
+        self.row = row
+
+    def get_location(self):
+        return self.location
+    def get_data(self):
+        return self.columns.get_data(self.row)
+    def get_context(self):
+        return self.columns.get_context(self.row)
+
+    def release(self):
+        self.columns.release(self.row)
+
+#Remembers the best matching stored position for recently looked up names and contexts, evicting the least recently used
+#Entries are only dropped for names whose stored positions changed, so walking to other names stays cached
+class BestMatchCache:
+    MISSING = object()
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.contexts_by_name = {}
+        self.hit_count = 0
+        self.miss_count = 0
+
+    #Returns BestMatchCache.MISSING when the best match for the name and context is not cached
+    def get(self, name: str, context: PositionContext):
+        key = (name, context)
+        if key not in self.entries:
+            self.miss_count += 1
+            return BestMatchCache.MISSING
+        self.hit_count += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, name: str, context: PositionContext, stored_position):
+        self.entries[(name, context)] = stored_position
+        self.entries.move_to_end((name, context))
+        self.contexts_by_name.setdefault(name, set()).add(context)
+        if len(self.entries) > self.capacity:
+            (evicted_name, evicted_context), _ = self.entries.popitem(last = False)
+            self._forget_context(evicted_name, evicted_context)
+
+    def invalidate_name(self, name: str):
+        for context in self.contexts_by_name.pop(name, ()):
+            del self.entries[(name, context)]
+
+    def clear(self):
+        self.entries.clear()
+        self.contexts_by_name.clear()
+
+    def get_hit_count(self):
+        return self.hit_count
+    def get_miss_count(self):
+        return self.miss_count
+    def __len__(self):
+        return len(self.entries)
+
+    def _forget_context(self, name, context):
+        contexts = self.contexts_by_name[name]
+        contexts.discard(context)
+        if not contexts:
+            del self.contexts_by_name[name]
+
+#Keeps every stored position in memory keyed by name and then by context so lookups do not touch the storage
+#The version changes whenever the stored positions do so that results computed from them can be cached
+#A compact index keeps the positions in position columns instead of one object per position, trading rebuilding the data on every read for less memory
+class PositionIndex:
+    def __init__(self, best_match_cache_capacity: int = 256, compact: bool = False):
+        self.positions = {}
+        self.matchers = {}
+        self.locations = {}
+        self.names = NameIndex()
+        self.best_matches = BestMatchCache(best_match_cache_capacity)
+        self.version = 0
+        self.compact = compact
+        self.columns = PositionColumns() if compact else None
+
+    #Takes effect the next time the index is loaded
+    def set_compact(self, compact: bool):
+        self.compact = compact
+
+    def is_compact(self):
+        return self.columns is not None
+
+    def load(self, storage):
+        self.positions = {}
+        self.matchers = {}
+        self.locations = {}
+        self.names = NameIndex()
+        self.columns = PositionColumns() if self.compact else None
+        self.best_matches.clear()
+        self.version += 1
+        for name, location, data in storage.read_all():
+            self.store(name, location, data)
+
+    def get_version(self):
+        return self.version
+
+    def has_name(self, name: str):
+        return name in self.positions
+
+    def get_names(self):
+        return list(self.positions.keys())
+
+    #Returns the stored name the possibly misrecognized name most likely refers to or None if no stored name is close enough
+    def resolve_name(self, name: str, maximum_distance: int):
+        return self.names.resolve(name, maximum_distance)
+
+    def get_stored_positions_with_name(self, name: str):
+        if name not in self.positions:
+            return []
+        return list(self.positions[name].values())
+
+    def get_stored_position_with_context(self, name: str, context: PositionContext):
+        if name not in self.positions:
+            return None
+        return self.positions[name].get(context)
+
+    def get_stored_position_at_location(self, location):
+        if location not in self.locations:
+            return None
+        name, context = self.locations[location]
+        return self.positions[name][context]
+
+    def get_best_match(self, name: str, context: PositionContext):
+        if name not in self.positions:
+            return None
+        best_match = self.best_matches.get(name, context)
+        if best_match is BestMatchCache.MISSING:
+            best_match = self._get_matcher(name).find_best_match(context)
+            self.best_matches.put(name, context, best_match)
+        return best_match
+
+    #Finds the best match without the best match cache for looking up every name at once, which would otherwise evict the matches cached for walking
+    def get_best_match_without_caching(self, name: str, context: PositionContext):
+        if name not in self.positions:
+            return None
+        return self._get_matcher(name).find_best_match(context)
+
+    def _get_matcher(self, name):
+        if name not in self.matchers:
+            self.matchers[name] = ContextMatcher(self.positions[name].values())
+        return self.matchers[name]
+
+    def get_best_match_cache(self):
+        return self.best_matches
+
+    def store(self, name: str, location, data: PositionFileData):
+        self.remove_location(location)
+        if name not in self.positions:
+            self.positions[name] = {}
+            self.names.add(name)
+        replaced_position = self.positions[name].get(data.get_context())
+        if replaced_position:
+            self.locations.pop(replaced_position.get_location(), None)
+            self._release(replaced_position)
+        stored_position = self._create_stored_position(location, data)
+        #A compact index keys positions by the context shared through its context table instead of the context of the data
+        context = stored_position.get_context()
+        self.positions[name][context] = stored_position
+        self.locations[location] = (name, context)
+        self.matchers.pop(name, None)
+        self.best_matches.invalidate_name(name)
+        self.version += 1
+
+    def remove(self, name: str, context: PositionContext):
+        if name not in self.positions:
+            return
+        removed_position = self.positions[name].pop(context, None)
+        if removed_position:
+            self.locations.pop(removed_position.get_location(), None)
+            self._release(removed_position)
+        self.matchers.pop(name, None)
+        self.best_matches.invalidate_name(name)
+        self.version += 1
+        if not self.positions[name]:
+            del self.positions[name]
+            self.names.remove(name)
+
+    def remove_location(self, location):
+        if location in self.locations:
+            name, context = self.locations[location]
+            self.remove(name, context)
+
+    def _create_stored_position(self, location, data):
+        if self.columns is None:
+            return StoredPosition(location, data)
+        return ColumnStoredPosition(location, self.columns, self.columns.append(data))
+
+    def _release(self, stored_position):
+        if isinstance(stored_position, ColumnStoredPosition):
+            stored_position.release()
@@ -0,0 +1,230 @@
+from position_index import *
+from position_storage import DirectoryPositionStorage
+
+import os
+import tempfile
+import unittest
+
+
+def create_data(horizontal, vertical, app = '', title_part = '', mode = ''):
+    context = PositionContext(app, title_part, mode)
+    return PositionFileData.from_values(MousePosition(horizontal, vertical), context, PositionRelativity.ABSOLUTE)
+
+class TestPositionIndex(unittest.TestCase):
+    def test_best_match_prefers_most_specific_context(self):
+        index = PositionIndex()
+        index.store('button', 'general', create_data(1, 2))
+        index.store('button', 'specific', create_data(3, 4, 'app', 'title'))
+
+        best_match = index.get_best_match('button', PositionContext('app', 'the title', ''))
+
+        self.assertEqual('specific', best_match.get_location())
+    def test_best_match_ignores_other_applications(self):
+        index = PositionIndex()
+        index.store('button', 'general', create_data(1, 2))
+        index.store('button', 'specific', create_data(3, 4, 'app'))
+
+        best_match = index.get_best_match('button', PositionContext('other', 'title', ''))
+
+        self.assertEqual('general', best_match.get_location())
+    def test_missing_name_has_no_match(self):
+        index = PositionIndex()
+
+        self.assertIsNone(index.get_best_match('button', PositionContext('app', 'title', '')))
+    def test_store_replaces_position_with_same_context(self):
+        index = PositionIndex()
+        index.store('button', 'path', create_data(1, 2, 'app'))
+        index.store('button', 'path', create_data(5, 6, 'app'))
+
+        stored_position = index.get_stored_position_with_context('button', PositionContext('app'))
+
+        self.assertEqual(5, stored_position.get_data().get_position().get_horizontal())
+        self.assertEqual(1, len(index.get_stored_positions_with_name('button')))
+    def test_remove_forgets_name_without_positions(self):
+        index = PositionIndex()
+        index.store('button', 'path', create_data(1, 2, 'app'))
+
+        index.remove('button', PositionContext('app'))
+
+        self.assertFalse(index.has_name('button'))
+    def test_storing_new_context_at_location_replaces_old_context(self):
+        index = PositionIndex()
+        index.store('button', 'path', create_data(1, 2, 'app'))
+
+        index.store('button', 'path', create_data(1, 2, 'other'))
+
+        self.assertIsNone(index.get_stored_position_with_context('button', PositionContext('app')))
+        self.assertIsNotNone(index.get_stored_position_with_context('button', PositionContext('other')))
+    def test_remove_location(self):
+        index = PositionIndex()
+        index.store('button', 'path', create_data(1, 2, 'app'))
+
+        index.remove_location('path')
+
+        self.assertFalse(index.has_name('button'))
+    def test_load_reads_position_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name_directory = os.path.join(directory, 'button')
+            os.makedirs(name_directory)
+            path = os.path.join(name_directory, '0.txt')
+            with open(path, 'w') as position_file:
+                position_file.write(create_data(7, 8, 'app').get_file_text())
+            index = PositionIndex()
+
+            index.load(DirectoryPositionStorage(directory))
+
+            stored_position = index.get_best_match('button', PositionContext('app', 'title', ''))
+            self.assertEqual(path, stored_position.get_location())
+            self.assertEqual(8, stored_position.get_data().get_position().get_vertical())
+    def test_resolves_misrecognized_name(self):
+        index = PositionIndex()
+        index.store('submit button', 'a', create_data(1, 2))
+        index.store('cancel', 'b', create_data(3, 4))
+
+        self.assertEqual('submit button', index.resolve_name('summit button', 2))
+        self.assertIsNone(index.resolve_name('summit button', 0))
+    def test_removed_name_is_not_resolved(self):
+        index = PositionIndex()
+        index.store('submit button', 'a', create_data(1, 2))
+
+        index.remove_location('a')
+
+        self.assertIsNone(index.resolve_name('submit button', 2))
+    def test_version_changes_when_positions_change(self):
+        index = PositionIndex()
+        versions = [index.get_version()]
+
+        index.store('button', 'a', create_data(1, 2))
+        versions.append(index.get_version())
+        index.remove('button', PositionContext())
+        versions.append(index.get_version())
+
+        self.assertEqual(len(versions), len(set(versions)))
+
+    def test_finds_stored_position_at_location(self):
+        index = PositionIndex()
+        index.store('button', 'path', create_data(1, 2, 'app'))
+
+        self.assertEqual('path', index.get_stored_position_at_location('path').get_location())
+        self.assertIsNone(index.get_stored_position_at_location('other path'))
+    def test_repeated_best_match_uses_cache(self):
+        index = PositionIndex()
+        index.store('button', 'path', create_data(1, 2, 'app'))
+        context = PositionContext('app', 'title', '')
+
+        first_match = index.get_best_match('button', context)
+        index.matchers.clear()
+        second_match = index.get_best_match('button', context)
+
+        cache = index.get_best_match_cache()
+        self.assertIs(first_match, second_match)
+        self.assertEqual(1, cache.get_hit_count())
+        self.assertEqual(1, cache.get_miss_count())
+    def test_storing_only_invalidates_cached_matches_for_its_name(self):
+        index = PositionIndex()
+        index.store('button', 'button path', create_data(1, 2))
+        index.store('menu', 'menu path', create_data(3, 4))
+        context = PositionContext('app', 'title', '')
+        index.get_best_match('button', context)
+        index.get_best_match('menu', context)
+
+        index.store('button', 'specific path', create_data(5, 6, 'app'))
+
+        self.assertEqual('specific path', index.get_best_match('button', context).get_location())
+        self.assertEqual('menu path', index.get_best_match('menu', context).get_location())
+        self.assertEqual(1, index.get_best_match_cache().get_hit_count())
+    def test_removing_invalidates_cached_match(self):
+        index = PositionIndex()
+        index.store('button', 'general', create_data(1, 2))
+        index.store('button', 'specific', create_data(3, 4, 'app'))
+        context = PositionContext('app', 'title', '')
+        index.get_best_match('button', context)
+
+        index.remove('button', PositionContext('app'))
+
+        self.assertEqual('general', index.get_best_match('button', context).get_location())
+    def test_cached_matches_depend_on_mode(self):
+        index = PositionIndex()
+        index.store('button', 'general', create_data(1, 2))
+        index.store('button', 'editing', create_data(3, 4, mode = 'editing'))
+
+        self.assertEqual('editing', index.get_best_match('button', PositionContext('app', 'title', 'editing')).get_location())
+        self.assertEqual('general', index.get_best_match('button', PositionContext('app', 'title', '')).get_location())
+
+    def test_uncached_best_match_leaves_cache_alone(self):
+        index = PositionIndex(best_match_cache_capacity = 1)
+        index.store('button', 'button path', create_data(1, 2, 'app'))
+        index.store('menu', 'menu path', create_data(3, 4, 'app'))
+        index.get_best_match('button', PositionContext('app'))
+
+        best_match = index.get_best_match_without_caching('menu', PositionContext('app'))
+
+        self.assertEqual('menu path', best_match.get_location())
+        self.assertIsNot(BestMatchCache.MISSING, index.get_best_match_cache().get('button', PositionContext('app')))
+        self.assertEqual(1, index.get_best_match_cache().get_miss_count())
+
+class TestCompactPositionIndex(unittest.TestCase):
+    def test_best_match_reads_data_from_columns(self):
+        index = PositionIndex(compact = True)
+        index.store('button', 'general', create_data(1, 2))
+        index.store('button', 'specific', create_data(3, 4, 'app', 'title'))
+
+        best_match = index.get_best_match('button', PositionContext('app', 'the title', ''))
+
+        self.assertEqual('specific', best_match.get_location())
+        self.assertEqual(4, best_match.get_data().get_position().get_vertical())
+        self.assertEqual(PositionContext('app', 'title'), best_match.get_context())
+    def test_replaced_and_removed_positions_release_their_rows(self):
+        index = PositionIndex(compact = True)
+        index.store('button', 'path', create_data(1, 2, 'app'))
+        index.store('button', 'path', create_data(5, 6, 'app'))
+        index.store('menu', 'other path', create_data(7, 8, 'app'))
+        index.remove_location('other path')
+
+        index.store('menu', 'new path', create_data(9, 9, 'app'))
+
+        self.assertEqual(2, len(index.columns.horizontals))
+        self.assertEqual(5, index.get_stored_position_at_location('path').get_data().get_position().get_horizontal())
+        self.assertEqual(9, index.get_best_match('menu', PositionContext('app')).get_data().get_position().get_horizontal())
+    def test_compact_setting_takes_effect_on_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = DirectoryPositionStorage(directory)
+            storage.write('button', storage.create_location('button'), create_data(7, 8, 'app'))
+            index = PositionIndex()
+            index.set_compact(True)
+            self.assertFalse(index.is_compact())
+
+            index.load(storage)
+
+            self.assertTrue(index.is_compact())
+            self.assertEqual(8, index.get_best_match('button', PositionContext('app')).get_data().get_position().get_vertical())
+
+class TestBestMatchCache(unittest.TestCase):
+    def test_evicts_least_recently_used_match(self):
+        cache = BestMatchCache(2)
+        cache.put('first', PositionContext('app'), 'first match')
+        cache.put('second', PositionContext('app'), 'second match')
+        cache.get('first', PositionContext('app'))
+
+        cache.put('third', PositionContext('app'), 'third match')
+
+        self.assertIs(BestMatchCache.MISSING, cache.get('second', PositionContext('app')))
+        self.assertEqual('first match', cache.get('first', PositionContext('app')))
+        self.assertEqual(2, len(cache))
+    def test_caches_missing_matches(self):
+        cache = BestMatchCache()
+        cache.put('button', PositionContext('app'), None)
+
+        self.assertIsNone(cache.get('button', PositionContext('app')))
+    def test_invalidating_evicted_name_does_nothing(self):
+        cache = BestMatchCache(1)
+        cache.put('first', PositionContext('app'), 'first match')
+        cache.put('second', PositionContext('app'), 'second match')
+
+        cache.invalidate_name('first')
+
+        self.assertEqual('second match', cache.get('second', PositionContext('app')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import os
+import threading
+from collections import deque
+
+try:
+    from .project_types import *
+    from .file_operations import write_file_atomically, remove_file_if_exists
+except ImportError:
+    from project_types import *
+    from file_operations import write_file_atomically, remove_file_if_exists
+
+
+#One change to a stored position along with its data before and after the change so that the change can be undone and redone
+#The old data is None for a newly stored position and the new data is None for a removed position
+class JournalEntry:
+    __slots__ = ('name', 'location', 'old_data', 'new_data')
+    def __init__(self, name: str, location, old_data: PositionFileData, new_data: PositionFileData):
+        self.name = name
+        self.location = location
+        self.old_data = old_data
+        self.new_data = new_data
+
+    def get_name(self):
+        return self.name
+    def get_location(self):
+        return self.location
+    def get_old_data(self):
+        return self.old_data
+    def get_new_data(self):
+        return self.new_data
+
+    def describe_change(self):
+        if self.old_data is None:
+            return 'storing'
+        if self.new_data is None:
+            return 'removing'
+        return 'updating'
+
+#Keeps the most recent changes to the stored positions for undoing and redoing them along with an append only log of them on disk
+#The log is split into segments. A new segment is started once the current one holds the segment capacity in records,
+#and before starting a segment would exceed the maximum number of segments, which must be at least two, the existing ones are compacted into a single segment holding only the changes that can still be undone or redone
+#The log is read the first time the journal is used
+#Given a write behind queue, the log is written on its background thread so that commands only update the changes in memory
+class PositionJournal:
+    SEGMENT_EXTENSION = '.journal'
+    CHANGE_RECORD = 'change'
+    UNDO_RECORD = 'undo'
+    REDO_RECORD = 'redo'
+    #Starts a compacted segment. Everything logged before it is replaced by the records following it
+    SNAPSHOT_RECORD = 'snapshot'
+    def __init__(self, directory: str, history_length: int = 100, segment_capacity: int = 200, maximum_segment_count: int = 4, write_queue = None):
+        self.directory = directory
+        self.segment_capacity = segment_capacity
+        self.maximum_segment_count = maximum_segment_count
+        self.write_queue = write_queue
+        self.undo_entries = deque(maxlen = history_length)
+        self.redo_entries = deque(maxlen = history_length)
+        self.segment_numbers = []
+        self.current_segment_record_count = 0
+        self.pending_records = []
+        #Guards the changes and the pending records so that the writer sees changes matching the records it writes
+        self.lock = threading.Lock()
+        self.loaded = False
+
+    def record(self, entry: JournalEntry):
+        self._load_if_needed()
+        with self.lock:
+            self.undo_entries.append(entry)
+            self.redo_entries.clear()
+            self.pending_records.append(convert_entry_to_record(entry))
+        self._write_pending_records_later()
+
+    #Returns the change undo would return without undoing it
+    def get_next_undo(self):
+        self._load_if_needed()
+        if not self.undo_entries:
+            return None
+        return self.undo_entries[-1]
+
+    #Returns the change redo would return without redoing it
+    def get_next_redo(self):
+        self._load_if_needed()
+        if not self.redo_entries:
+            return None
+        return self.redo_entries[-1]
+
+    #Returns the most recent change that has not been undone for the caller to restore its old data, or None if there is none
+    def undo(self):
+        self._load_if_needed()
+        if not self.undo_entries:
+            return None
+        with self.lock:
+            entry = self.undo_entries.pop()
+            self.redo_entries.append(entry)
+            self.pending_records.append({'type': PositionJournal.UNDO_RECORD})
+        self._write_pending_records_later()
+        return entry
+
+    #Returns the most recently undone change for the caller to restore its new data, or None if there is none
+    def redo(self):
+        self._load_if_needed()
+        if not self.redo_entries:
+            return None
+        with self.lock:
+            entry = self.redo_entries.pop()
+            self.undo_entries.append(entry)
+            self.pending_records.append({'type': PositionJournal.REDO_RECORD})
+        self._write_pending_records_later()
+        return entry
+
+    def get_undo_count(self):
+        self._load_if_needed()
+        return len(self.undo_entries)
+
+    def get_redo_count(self):
+        self._load_if_needed()
+        return len(self.redo_entries)
+
+    def get_segment_paths(self):
+        self._load_if_needed()
+        return [self._get_segment_path(number) for number in self.segment_numbers]
+
+    def _load_if_needed(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        if not os.path.isdir(self.directory):
+            return
+        self.segment_numbers = sorted(number for number in map(parse_segment_number, os.listdir(self.directory)) if number is not None)
+        for number in self.segment_numbers:
+            self.current_segment_record_count = self._replay_segment(self._get_segment_path(number))
+
+    def _replay_segment(self, path):
+        import json
+        record_count = 0
+        with open(path, 'r') as segment_file:
+            for line_number, line in enumerate(segment_file, 1):
+                if not line.strip():
+                    continue
+                record_count += 1
+                try:
+                    self._replay_record(json.loads(line))
+                except Exception as exception:
+                    print(f'Could not replay the mouse position journal record on line {line_number} of {path}: {exception}')
+        return record_count
+
+    def _replay_record(self, record):
+        record_type = record['type']
+        if record_type == PositionJournal.CHANGE_RECORD:
+            self.undo_entries.append(convert_record_to_entry(record))
+            self.redo_entries.clear()
+        elif record_type == PositionJournal.UNDO_RECORD and self.undo_entries:
+            self.redo_entries.append(self.undo_entries.pop())
+        elif record_type == PositionJournal.REDO_RECORD and self.redo_entries:
+            self.undo_entries.append(self.redo_entries.pop())
+        elif record_type == PositionJournal.SNAPSHOT_RECORD:
+            self.undo_entries.clear()
+            self.redo_entries.clear()
+
+    #Every write writes all pending records, so the queue keeping only the latest write for the journal loses nothing
+    def _write_pending_records_later(self):
+        if self.write_queue is None:
+            self._write_pending_records()
+        else:
+            self.write_queue.submit(self.directory, self._write_pending_records)
+
+    def _write_pending_records(self):
+        import json
+        with self.lock:
+            records = self.pending_records
+            self.pending_records = []
+            undo_entries = list(self.undo_entries)
+            redo_entries = list(self.redo_entries)
+        for record in records:
+            if not self.segment_numbers or self.current_segment_record_count >= self.segment_capacity:
+                if len(self.segment_numbers) >= self.maximum_segment_count:
+                    #The compacted segment already holds the result of every pending record
+                    self._compact(undo_entries, redo_entries)
+                    return
+                self._start_segment()
+            with open(self._get_segment_path(self.segment_numbers[-1]), 'a') as segment_file:
+                segment_file.write(json.dumps(record, separators = (',', ':')) + '\n')
+            self.current_segment_record_count += 1
+
+    def _start_segment(self):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        self.segment_numbers.append(self.segment_numbers[-1] + 1 if self.segment_numbers else 0)
+        self.current_segment_record_count = 0
+
+    #Replaces every segment with one that recreates the changes that can still be undone and redone
+    #The snapshot record makes replaying ignore the older segments if removing them gets interrupted
+    def _compact(self, undo_entries, redo_entries):
+        import json
+        records = [{'type': PositionJournal.SNAPSHOT_RECORD}]
+        records.extend(convert_entry_to_record(entry) for entry in undo_entries)
+        for entry in reversed(redo_entries):
+            records.append(convert_entry_to_record(entry))
+        records.extend({'type': PositionJournal.UNDO_RECORD} for _ in redo_entries)
+        compacted_number = self.segment_numbers[-1] + 1
+        write_file_atomically(self._get_segment_path(compacted_number), ''.join(json.dumps(record, separators = (',', ':')) + '\n' for record in records))
+        for number in self.segment_numbers:
+            remove_file_if_exists(self._get_segment_path(number))
+        self.segment_numbers = [compacted_number]
+        #Appending to the compacted segment would let it grow past the segment capacity, so the next record starts a new segment
+        self.current_segment_record_count = self.segment_capacity
+
+    def _get_segment_path(self, number):
+        return os.path.join(self.directory, f'{number:08d}{PositionJournal.SEGMENT_EXTENSION}')
+
+def parse_segment_number(filename: str):
+    number, extension = os.path.splitext(filename)
+    if extension != PositionJournal.SEGMENT_EXTENSION or not number.isdigit():
+        return None
+    return int(number)
+
+def convert_entry_to_record(entry: JournalEntry):
+    return {
+        'type': PositionJournal.CHANGE_RECORD,
+        'name': entry.get_name(),
+        'location': entry.get_location(),
+        'old': convert_data_to_text(entry.get_old_data()),
+        'new': convert_data_to_text(entry.get_new_data()),
+    }
+
+def convert_record_to_entry(record):
+    return JournalEntry(record['name'], record['location'], convert_text_to_data(record['old']), convert_text_to_data(record['new']))
+
+def convert_data_to_text(data: PositionFileData):
+    if data is None:
+        return None
+    return data.get_file_text()
+
+def convert_text_to_data(text: str):
+    if text is None:
+        return None
+    return PositionFileData.from_text(text)
@@ -0,0 +1,160 @@
+from position_journal import *
+from write_behind import WriteBehindQueue
+
+import os
+import threading
+import tempfile
+import unittest
+
+
+def create_data(horizontal, vertical, app = ''):
+    return PositionFileData.from_values(MousePosition(horizontal, vertical), PositionContext(app), PositionRelativity.WINDOW, anchor = WindowAnchor.BOTTOM_RIGHT)
+
+def create_entry(number):
+    return JournalEntry(f'name {number}', number, create_data(number, 0), create_data(number, 1))
+
+class TestPositionJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal_directory = os.path.join(self.directory.name, 'journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_undo_returns_most_recent_change(self):
+        journal = PositionJournal(self.journal_directory)
+        journal.record(create_entry(1))
+        journal.record(create_entry(2))
+
+        self.assertEqual('name 2', journal.undo().get_name())
+        self.assertEqual('name 1', journal.undo().get_name())
+        self.assertIsNone(journal.undo())
+    def test_redo_returns_most_recently_undone_change(self):
+        journal = PositionJournal(self.journal_directory)
+        journal.record(create_entry(1))
+        journal.record(create_entry(2))
+        journal.undo()
+        journal.undo()
+
+        self.assertEqual('name 1', journal.redo().get_name())
+        self.assertEqual('name 2', journal.redo().get_name())
+        self.assertIsNone(journal.redo())
+    def test_recording_discards_undone_changes(self):
+        journal = PositionJournal(self.journal_directory)
+        journal.record(create_entry(1))
+        journal.undo()
+
+        journal.record(create_entry(2))
+
+        self.assertIsNone(journal.redo())
+    def test_describes_change(self):
+        self.assertEqual('storing', JournalEntry('name', 0, None, create_data(1, 2)).describe_change())
+        self.assertEqual('updating', JournalEntry('name', 0, create_data(1, 2), create_data(3, 4)).describe_change())
+        self.assertEqual('removing', JournalEntry('name', 0, create_data(1, 2), None).describe_change())
+    def test_history_is_bounded(self):
+        journal = PositionJournal(self.journal_directory, history_length = 3)
+        for number in range(10):
+            journal.record(create_entry(number))
+
+        self.assertEqual(3, journal.get_undo_count())
+        self.assertEqual('name 9', journal.undo().get_name())
+    def test_changes_survive_reopening(self):
+        journal = PositionJournal(self.journal_directory)
+        journal.record(JournalEntry('removed', 'path', create_data(1, 2, 'app'), None))
+        journal.record(create_entry(2))
+        journal.undo()
+
+        reopened_journal = PositionJournal(self.journal_directory)
+
+        self.assertEqual(1, reopened_journal.get_redo_count())
+        self.assertEqual('name 2', reopened_journal.redo().get_name())
+        self.assertEqual('name 2', reopened_journal.undo().get_name())
+        entry = reopened_journal.undo()
+        self.assertEqual('path', entry.get_location())
+        self.assertIsNone(entry.get_new_data())
+        self.assertEqual(create_data(1, 2, 'app').get_file_text(), entry.get_old_data().get_file_text())
+    def test_starts_new_segment_when_full(self):
+        journal = PositionJournal(self.journal_directory, segment_capacity = 2)
+        for number in range(5):
+            journal.record(create_entry(number))
+
+        self.assertEqual(3, len(journal.get_segment_paths()))
+    def test_compaction_bounds_segments_and_keeps_history(self):
+        journal = PositionJournal(self.journal_directory, history_length = 4, segment_capacity = 3, maximum_segment_count = 2)
+        for number in range(20):
+            journal.record(create_entry(number))
+        journal.undo()
+
+        self.assertLessEqual(len(journal.get_segment_paths()), 2)
+        self.assertLessEqual(len(os.listdir(self.journal_directory)), 2)
+        reopened_journal = PositionJournal(self.journal_directory, history_length = 4)
+        self.assertEqual(3, reopened_journal.get_undo_count())
+        self.assertEqual('name 19', reopened_journal.redo().get_name())
+        self.assertEqual(['name 19', 'name 18', 'name 17', 'name 16'], [reopened_journal.undo().get_name() for _ in range(4)])
+    def test_compaction_keeps_undone_changes(self):
+        journal = PositionJournal(self.journal_directory, segment_capacity = 2, maximum_segment_count = 2)
+        for number in range(3):
+            journal.record(create_entry(number))
+        journal.undo()
+        journal.undo()
+        journal.redo()
+
+        reopened_journal = PositionJournal(self.journal_directory)
+        self.assertEqual(2, reopened_journal.get_undo_count())
+        self.assertEqual('name 2', reopened_journal.redo().get_name())
+    def test_skips_unreadable_records(self):
+        journal = PositionJournal(self.journal_directory)
+        journal.record(create_entry(1))
+        with open(journal.get_segment_paths()[-1], 'a') as segment_file:
+            segment_file.write('not a record\n')
+
+        reopened_journal = PositionJournal(self.journal_directory)
+
+        self.assertEqual(1, reopened_journal.get_undo_count())
+    def test_does_not_create_directory_until_changed(self):
+        journal = PositionJournal(self.journal_directory)
+        journal.undo()
+
+        self.assertFalse(os.path.exists(self.journal_directory))
+    def test_writes_log_on_write_queue(self):
+        queue = WriteBehindQueue()
+        release_writer = threading.Event()
+        queue.submit('blocker', release_writer.wait)
+        journal = PositionJournal(self.journal_directory, write_queue = queue)
+        journal.record(create_entry(1))
+        journal.record(create_entry(2))
+        journal.undo()
+
+        self.assertEqual('name 1', journal.get_next_undo().get_name())
+        self.assertFalse(os.path.exists(self.journal_directory))
+        release_writer.set()
+        self.assertTrue(queue.wait_until_flushed(5))
+        reopened_journal = PositionJournal(self.journal_directory)
+        self.assertEqual(1, reopened_journal.get_undo_count())
+        self.assertEqual('name 2', reopened_journal.redo().get_name())
+    def test_compacts_on_write_queue(self):
+        queue = WriteBehindQueue()
+        release_writer = threading.Event()
+        queue.submit('blocker', release_writer.wait)
+        journal = PositionJournal(self.journal_directory, history_length = 4, segment_capacity = 3, maximum_segment_count = 2, write_queue = queue)
+        for number in range(20):
+            journal.record(create_entry(number))
+        journal.undo()
+
+        self.assertFalse(os.path.exists(self.journal_directory))
+        release_writer.set()
+        self.assertTrue(queue.wait_until_flushed(5))
+        self.assertLessEqual(len(os.listdir(self.journal_directory)), 2)
+        reopened_journal = PositionJournal(self.journal_directory, history_length = 4)
+        self.assertEqual('name 19', reopened_journal.redo().get_name())
+        self.assertEqual(['name 19', 'name 18', 'name 17', 'name 16'], [reopened_journal.undo().get_name() for _ in range(4)])
+
+class TestSegmentNames(unittest.TestCase):
+    def test_segment_number_ignores_other_files(self):
+        self.assertEqual(12, parse_segment_number('00000012.journal'))
+        self.assertIsNone(parse_segment_number('.00000012.journal.tmp'))
+        self.assertIsNone(parse_segment_number('notes.txt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
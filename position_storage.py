@@ -0,0 +1,204 @@
+import os
+import threading
+
+try:
+    from .project_types import *
+    from .instrumentation import instrumentation
+    from .file_operations import write_file_atomically, remove_file_if_exists, is_temporary_file, InterProcessFileLock
+except ImportError:
+    from project_types import *
+    from instrumentation import instrumentation
+    from file_operations import write_file_atomically, remove_file_if_exists, is_temporary_file, InterProcessFileLock
+
+
+class PositionStorageError(Exception):
+    pass
+
+#Stores every position as its own numbered text file inside a directory named after the position
+#Changes are made while holding a lock file shared with other processes using the directory and files are replaced atomically so reading needs no lock
+class DirectoryPositionStorage:
+    FILE_EXTENSION = '.txt'
+    LOCK_FILENAME = '.lock'
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.next_slots = {}
+        self.lock = threading.Lock()
+        self.file_lock = InterProcessFileLock(os.path.join(directory, DirectoryPositionStorage.LOCK_FILENAME))
+
+    def read_all(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            name_directory = self.get_directory_from_name(name)
+            if os.path.isdir(name_directory):
+                yield from self._read_positions_with_name(name, name_directory)
+
+    def _read_positions_with_name(self, name, name_directory):
+        for filename in os.listdir(name_directory):
+            if is_temporary_file(filename):
+                continue
+            self._record_used_slot(name, filename)
+            path = os.path.join(name_directory, filename)
+            try:
+                data = PositionFileData(path)
+            except Exception as exception:
+                print(f'Could not load the mouse position at path {path}: {exception}')
+                continue
+            #Claimed slots stay empty until their position is written
+            if data.get_position() is None:
+                continue
+            yield name, path, data
+
+    def _record_used_slot(self, name, filename):
+        slot, extension = os.path.splitext(filename)
+        if extension == DirectoryPositionStorage.FILE_EXTENSION and slot.isdigit():
+            with self.lock:
+                self.next_slots[name] = max(self.next_slots.get(name, 0), int(slot) + 1)
+
+    #Claims the next slot by creating its file exclusively so creators sharing the directory never receive the same file
+    def create_location(self, name: str):
+        self.check_name_stays_in_directory(name)
+        with self.lock:
+            while True:
+                slot = self.next_slots.get(name, 0)
+                self.next_slots[name] = slot + 1
+                path = self._get_path_from_slot(name, slot)
+                try:
+                    self._claim_path(path)
+                    return path
+                except FileExistsError:
+                    continue
+
+    def _claim_path(self, path):
+        instrumentation.count_file_opened()
+        try:
+            open(path, 'x').close()
+        except FileNotFoundError:
+            create_directory_if_nonexistent(os.path.dirname(path))
+            open(path, 'x').close()
+
+    def _get_path_from_slot(self, name, slot):
+        filename = str(slot) + DirectoryPositionStorage.FILE_EXTENSION
+        return os.path.join(self.get_directory_from_name(name), filename)
+
+    def write(self, name: str, location, data: PositionFileData):
+        instrumentation.count_file_opened()
+        with self.file_lock:
+            write_file_atomically(location, data.get_file_text())
+
+    def remove(self, name: str, location):
+        self.check_removable(location)
+        with self.file_lock:
+            remove_file_if_exists(location)
+
+    def check_removable(self, location):
+        if not self.filepath_in_correct_directory(location):
+            raise PositionStorageError(f'Refusing to remove a file outside the mouse position storage at path: {location}')
+
+    def close(self):
+        pass
+
+    def check_name_stays_in_directory(self, name: str):
+        name_directory = os.path.normpath(self.get_directory_from_name(name))
+        if os.path.isabs(name) or os.path.dirname(name_directory) != os.path.normpath(self.directory):
+            raise PositionStorageError(f'Refusing to store a position named {name} outside the mouse position storage')
+
+    def filepath_in_correct_directory(self, path):
+        current_folder = os.path.dirname(path)
+        folder_of_current_folder = os.path.dirname(current_folder)
+        return folder_of_current_folder == self.directory
+
+    def get_directory_from_name(self, name: str):
+        return os.path.join(self.directory, name)
+
+#Stores every position as a row of a single SQLite database using the same text format as the position files
+class DatabasePositionStorage:
+    PLACEHOLDER_DATA = ''
+    def __init__(self, path: str):
+        #Imported here so that storing positions as files never pays for importing sqlite
+        import sqlite3
+        self.path = path
+        self.lock = threading.Lock()
+        create_directory_if_nonexistent(os.path.dirname(path))
+        self.connection = sqlite3.connect(path, check_same_thread = False)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS positions (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, data TEXT NOT NULL)')
+
+    def read_all(self):
+        with self.lock:
+            rows = self.connection.execute('SELECT name, id, data FROM positions').fetchall()
+        for name, location, text in rows:
+            if text == DatabasePositionStorage.PLACEHOLDER_DATA:
+                continue
+            try:
+                data = PositionFileData.from_text(text)
+            except Exception as exception:
+                print(f'Could not load the mouse position {name} with database id {location}: {exception}')
+                continue
+            yield name, location, data
+
+    #Claims the id by inserting a placeholder row so that SQLite hands out ids that no other connection to the database has received
+    def create_location(self, name: str):
+        with self.lock, self.connection:
+            cursor = self.connection.execute('INSERT INTO positions (name, data) VALUES (?, ?)', (name, DatabasePositionStorage.PLACEHOLDER_DATA))
+        return cursor.lastrowid
+
+    #Inserts the row again if it was removed so that undoing a removal restores the position at its id
+    def write(self, name: str, location, data: PositionFileData):
+        with self.lock, self.connection:
+            self.connection.execute('INSERT INTO positions (id, name, data) VALUES (?, ?, ?) ON CONFLICT (id) DO UPDATE SET name = excluded.name, data = excluded.data', (location, name, data.get_file_text()))
+
+    def remove(self, name: str, location):
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM positions WHERE id = ?', (location,))
+
+    def check_removable(self, location):
+        pass
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+#Saves changes to the wrapped storage on a background thread so that commands do not wait on the disk
+class WriteBehindPositionStorage:
+    def __init__(self, storage, queue):
+        self.storage = storage
+        self.queue = queue
+
+    def read_all(self):
+        self.queue.wait_until_flushed()
+        return self.storage.read_all()
+
+    def create_location(self, name: str):
+        return self.storage.create_location(name)
+
+    def write(self, name: str, location, data: PositionFileData):
+        self.queue.submit(location, lambda: self.storage.write(name, location, data))
+
+    def remove(self, name: str, location):
+        self.check_removable(location)
+        self.queue.submit(location, lambda: self.storage.remove(name, location))
+
+    def check_removable(self, location):
+        self.storage.check_removable(location)
+
+    def close(self):
+        self.queue.wait_until_flushed()
+        self.storage.close()
+
+#Copies every position from the source storage into the destination storage skipping positions whose name and context are already present
+def migrate_positions(source, destination):
+    existing_contexts = {(name, data.get_context()) for name, _, data in destination.read_all()}
+    migrated_count = 0
+    for name, _, data in source.read_all():
+        if (name, data.get_context()) in existing_contexts:
+            continue
+        location = destination.create_location(name)
+        destination.write(name, location, data)
+        existing_contexts.add((name, data.get_context()))
+        migrated_count += 1
+    return migrated_count
+
+def create_directory_if_nonexistent(directory):
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok = True)
@@ -0,0 +1,236 @@
+from position_storage import *
+from write_behind import WriteBehindQueue
+
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+
+
+def create_data(horizontal, vertical, app = ''):
+    context = PositionContext(app, '', '')
+    return PositionFileData.from_values(MousePosition(horizontal, vertical), context, PositionRelativity.WINDOW)
+
+def read_positions_by_name(storage):
+    return {name: (location, data) for name, location, data in storage.read_all()}
+
+STRESS_TEST_DURATION_IN_SECONDS = 1
+STRESS_TEST_NAME_COUNT = 3
+
+#Stores, updates, and removes positions whose coordinates and application all encode the same number so that a torn read would mix numbers
+#Every worker uses its own names so that slots are never reused and a position file that becomes empty again was truncated
+def change_positions_for(directory, duration_in_seconds, seed):
+    end_time = time.monotonic() + duration_in_seconds
+    storage = DirectoryPositionStorage(directory)
+    generator = random.Random(seed)
+    names = [f'worker {seed} name {number}' for number in range(STRESS_TEST_NAME_COUNT)]
+    locations = []
+    while time.monotonic() < end_time:
+        number = generator.randrange(1_000_000)
+        name = generator.choice(names)
+        if locations and generator.random() < 0.3:
+            storage.remove(name, locations.pop(generator.randrange(len(locations))))
+        elif locations and generator.random() < 0.5:
+            storage.write(name, generator.choice(locations), create_data(number, number, str(number)))
+        else:
+            location = storage.create_location(name)
+            storage.write(name, location, create_data(number, number, str(number)))
+            locations.append(location)
+
+#Reads every position file directly until the workers finish and returns descriptions of any that were truncated, partially written, or mixed
+def find_torn_reads_while_running(directory, workers):
+    torn_reads = []
+    written_paths = set()
+    while any(worker.is_alive() for worker in workers):
+        for name_directory in [entry.path for entry in os.scandir(directory) if entry.is_dir()]:
+            for filename in os.listdir(name_directory):
+                path = os.path.join(name_directory, filename)
+                if not is_temporary_file(filename):
+                    torn_reads.extend(find_torn_read(path, written_paths))
+    return torn_reads
+
+def find_torn_read(path, written_paths):
+    try:
+        data = PositionFileData(path)
+    except FileNotFoundError:
+        return []
+    except Exception as exception:
+        return [str(exception)]
+    position = data.get_position()
+    if position is None:
+        return [f'{path} was truncated'] if path in written_paths else []
+    written_paths.add(path)
+    if not position.get_horizontal() == position.get_vertical() == int(data.get_context().app):
+        return [data.get_file_text()]
+    return []
+
+class PositionStorageTests:
+    def test_written_position_is_read_back(self):
+        location = self.storage.create_location('button')
+        self.storage.write('button', location, create_data(3, 4, 'app'))
+
+        read_location, data = read_positions_by_name(self.storage)['button']
+
+        self.assertEqual(location, read_location)
+        self.assertEqual(4, data.get_position().get_vertical())
+        self.assertEqual(PositionContext('app'), data.get_context())
+        self.assertEqual(PositionRelativity.WINDOW, data.get_relativity())
+    def test_locations_are_unique(self):
+        first_location = self.storage.create_location('button')
+        self.storage.write('button', first_location, create_data(1, 2))
+
+        second_location = self.storage.create_location('button')
+
+        self.assertNotEqual(first_location, second_location)
+    def test_removed_position_is_not_read(self):
+        location = self.storage.create_location('button')
+        self.storage.write('button', location, create_data(1, 2))
+
+        self.storage.remove('button', location)
+
+        self.assertEqual({}, read_positions_by_name(self.storage))
+
+class TestDirectoryPositionStorage(PositionStorageTests, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = DirectoryPositionStorage(self.directory.name)
+    def tearDown(self):
+        self.directory.cleanup()
+    def test_refuses_to_remove_file_outside_storage(self):
+        path = os.path.join(self.directory.name, 'outside.txt')
+        with open(path, 'w'):
+            pass
+
+        with self.assertRaises(PositionStorageError):
+            self.storage.remove('button', path)
+        self.assertTrue(os.path.exists(path))
+    def test_reports_file_without_position_and_skips_empty_file(self):
+        self.storage.create_location('button')
+        with open(self.storage.create_location('button'), 'w') as position_file:
+            position_file.write('app:app\n')
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            positions = read_positions_by_name(self.storage)
+
+        self.assertEqual({}, positions)
+        self.assertIn('1.txt', output.getvalue())
+        self.assertNotIn('0.txt', output.getvalue())
+    def test_refuses_to_create_location_outside_storage(self):
+        for name in ['../escaped', '..', '.', '', os.path.join(self.directory.name, 'outside')]:
+            with self.assertRaises(PositionStorageError):
+                self.storage.create_location(name)
+        self.assertEqual([], os.listdir(self.directory.name))
+    def test_new_location_follows_largest_loaded_slot(self):
+        os.makedirs(self.storage.get_directory_from_name('button'))
+        for slot in [0, 5]:
+            self.storage.write('button', self.storage._get_path_from_slot('button', slot), create_data(slot, 0))
+        storage = DirectoryPositionStorage(self.directory.name)
+        list(storage.read_all())
+
+        location = storage.create_location('button')
+
+        self.assertEqual('6.txt', os.path.basename(location))
+    def test_new_location_skips_slots_claimed_by_other_storage(self):
+        other_storage = DirectoryPositionStorage(self.directory.name)
+        other_location = other_storage.create_location('button')
+
+        location = self.storage.create_location('button')
+
+        self.assertNotEqual(other_location, location)
+    def test_concurrent_creators_receive_unique_locations(self):
+        storages = [DirectoryPositionStorage(self.directory.name) for _ in range(4)]
+        locations = []
+        def create_locations(storage):
+            for _ in range(50):
+                locations.append(storage.create_location('button'))
+        threads = [threading.Thread(target = create_locations, args = (storage,)) for storage in storages]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(200, len(set(locations)))
+
+class TestConcurrentDirectoryPositionStorage(unittest.TestCase):
+    def test_threads_and_processes_changing_positions_never_cause_torn_reads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            process_context = multiprocessing.get_context('spawn')
+            processes = [process_context.Process(target = change_positions_for, args = (directory, STRESS_TEST_DURATION_IN_SECONDS, seed)) for seed in range(2)]
+            threads = [threading.Thread(target = change_positions_for, args = (directory, STRESS_TEST_DURATION_IN_SECONDS, seed)) for seed in range(2, 6)]
+            for worker in processes + threads:
+                worker.start()
+
+            torn_reads = find_torn_reads_while_running(directory, processes + threads)
+
+            for worker in processes + threads:
+                worker.join()
+            self.assertEqual([], torn_reads)
+            self.assertEqual([0, 0], [process.exitcode for process in processes])
+
+class TestDatabasePositionStorage(PositionStorageTests, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = DatabasePositionStorage(os.path.join(self.directory.name, 'positions.sqlite3'))
+    def tearDown(self):
+        self.storage.close()
+        self.directory.cleanup()
+
+    def test_storages_sharing_database_receive_unique_locations(self):
+        other_storage = DatabasePositionStorage(os.path.join(self.directory.name, 'positions.sqlite3'))
+        self.addCleanup(other_storage.close)
+        location = self.storage.create_location('first')
+        other_location = other_storage.create_location('second')
+
+        self.storage.write('first', location, create_data(1, 2))
+        other_storage.write('second', other_location, create_data(3, 4))
+
+        self.assertNotEqual(location, other_location)
+        self.assertEqual({'first', 'second'}, set(read_positions_by_name(self.storage).keys()))
+    def test_location_without_written_position_is_not_read(self):
+        self.storage.create_location('button')
+
+        self.assertEqual({}, read_positions_by_name(self.storage))
+    def test_removed_location_is_not_handed_out_again(self):
+        location = self.storage.create_location('button')
+        self.storage.write('button', location, create_data(1, 2))
+        self.storage.remove('button', location)
+
+        self.assertNotEqual(location, self.storage.create_location('button'))
+
+class TestWriteBehindPositionStorage(PositionStorageTests, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = WriteBehindPositionStorage(DirectoryPositionStorage(self.directory.name), WriteBehindQueue())
+    def tearDown(self):
+        self.storage.close()
+        self.directory.cleanup()
+    def test_refuses_to_remove_file_outside_storage_right_away(self):
+        with self.assertRaises(PositionStorageError):
+            self.storage.remove('button', os.path.join(self.directory.name, 'outside.txt'))
+
+class TestMigratePositions(unittest.TestCase):
+    def test_copies_positions_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = DirectoryPositionStorage(os.path.join(directory, 'positions'))
+            for name in ['first', 'second']:
+                source.write(name, source.create_location(name), create_data(1, 2, 'app'))
+            destination = DatabasePositionStorage(os.path.join(directory, 'positions.sqlite3'))
+
+            first_count = migrate_positions(source, destination)
+            second_count = migrate_positions(source, destination)
+
+            self.assertEqual(2, first_count)
+            self.assertEqual(0, second_count)
+            self.assertEqual({'first', 'second'}, set(read_positions_by_name(destination).keys()))
+            destination.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,201 +1,291 @@
-import enum
-import os
-from talon import ctrl, actions
-
-
-class MousePosition:
-    STRING_START = '('
-    STRING_ENDING = ')'
-    COORDINATE_SEPARATOR = ', '
-    def __init__(self, horizontal: int, vertical: int):
-        self.horizontal = horizontal
-        self.vertical = vertical
-   
-    def get_horizontal(self):
-        return self.horizontal
-    def get_vertical(self):
-        return self.vertical
-   
-    def __add__(self, other):
-        result = MousePosition(0, 0)
-        result += self
-        result += other
-        return result
-    def __iadd__(self, other):
-        self.horizontal += other.horizontal
-        self.vertical += other.vertical
-        return self
-    def __sub__(self, other):
-        result = MousePosition(0, 0)
-        result += self
-        result -= other
-        return result
-    def __isub__(self, other):
-        self.horizontal -= other.horizontal
-        self.vertical -= other.vertical
-        return self
-
-    def go(self):
-        actions.mouse_move(self.horizontal, self.vertical)
-
-    def __str__(self) -> str:
-        return MousePosition.STRING_START + str(self.horizontal) + MousePosition.COORDINATE_SEPARATOR \
-        + str(self.vertical) + MousePosition.STRING_ENDING
-
-    #assumes that the text properly represents a mouse position object
-    @staticmethod
-    def from_text(text: str):
-        horizontal_start = text.index(MousePosition.STRING_START) + 1
-        horizontal_ending = text.index(MousePosition.COORDINATE_SEPARATOR)
-        horizontal = int(text[horizontal_start : horizontal_ending])
-        vertical_start = horizontal_ending + 1
-        vertical_ending = text.index(MousePosition.STRING_ENDING)
-        vertical = int(text[vertical_start : vertical_ending])
-        return MousePosition(horizontal, vertical)
-
-class MousePositionFile:
-    def __init__(self, folder: str, name: str):
-        self.folder = folder
-        self.name = name
-        self._initialize_file_if_nonexistent()
-        self._retrieve_position()
-       
-    def get(self):
-        return self.position
-       
-    def set(self, position: MousePosition):
-        self.position = position
-        self._store_position()
-   
-    def set_to_current_mouse_position(self):
-        horizontal, vertical = ctrl.mouse_pos()
-        position = MousePosition(horizontal, vertical)
-        self.set(position)
-   
-    def _store_position(self):
-        with open(self.get_path(), 'w') as position_file:
-            position_text = str(self.position)
-            position_file.write(position_text)
-   
-    def _retrieve_position(self):
-        with open(self.get_path(), 'r') as position_file:
-            position_text = position_file.readline().rstrip('\n\r')
-            self.position = MousePosition.from_text(position_text)
-   
-    def get_path(self):
-        return os.path.join(self.folder, self.name)
-   
-    def _initialize_file_if_nonexistent(self):
-        if not os.path.exists(self.get_path()):
-            self._make_directory_if_nonexistent()
-            self.set(MousePosition(0, 0))
-   
-    def _make_directory_if_nonexistent(self):
-        if not os.path.exists(self.folder):
-            os.makedirs(self.folder)
-
-class ContextDataNotFound(Exception):
-    pass
-
-#Determines when a stored mouse position can be used
-class PositionContext:
-    APP_START = 'app:'
-    TITLE_PART_START = 'title:'
-    MOUSE_POSITION_MODE_START = 'mouse position mode:'
-    def __init__(self, app = '', title_part = '', mouse_position_mode = ''):
-        self.app = app
-        self.title_part = title_part
-        self.mouse_position_mode = mouse_position_mode
-
-    def receive_field_from_line(self, text):
-        if text.startswith(PositionContext.APP_START):
-            self.app = text_from_string_after_substring(text, PositionContext.APP_START)
-        elif text.startswith(PositionContext.TITLE_PART_START):
-            self.title_part = text_from_string_after_substring(text, PositionContext.TITLE_PART_START)
-        elif text.startswith(PositionContext.MOUSE_POSITION_MODE_START):
-            self.mouse_position_mode = text_from_string_after_substring(text, PositionContext.MOUSE_POSITION_MODE_START)
-        else:
-            raise ContextDataNotFound('Context data not found within the following text: ' + text)
-
-    def matches_title(self, title):
-        return self.title_part in title
-
-    def matches_app(self, app):
-        return app == self.app or self.app == ''
-
-    def matches_mouse_position_mode(self, mode):
-        return mode == self.mouse_position_mode
-
-    def matches_position_context(self, other):
-        return self.matches_app(other.app) \
-            and self.matches_title(other.title_part) \
-            and self.matches_mouse_position_mode(other.mouse_position_mode)
-
-    def compute_specificity(self):
-        result = 0
-        if self.app:
-            result += 1
-        if self.title_part:
-            result += 1
-        if self.mouse_position_mode: #mode beats application and title part matching
-            result += 3
-        return result
-
-    def __eq__(self, other):
-        return self.app == other.app and self.title_part == other.title_part and self.mouse_position_mode == other.mouse_position_mode
-   
-    def __str__(self) -> str:
-        result = ''
-        if self.app:
-            result += PositionContext.APP_START + self.app + '\n'
-        if self.title_part:
-            result += PositionContext.TITLE_PART_START + self.title_part + '\n'
-        if self.mouse_position_mode:
-            result += PositionContext.MOUSE_POSITION_MODE_START + self.mouse_position_mode + '\n'
-        return result
-
-def text_from_string_after_substring(text, substring):
-    return text[len(substring) : ]
-
-class PositionRelativity(enum.Enum):
-    ABSOLUTE = enum.auto()
-    WINDOW = enum.auto()
-    MOUSE = enum.auto()
-
-STORED_POSITION_RELATIVITY_START = 'PositionRelativity.'
-
-class PositionFileData:
-    def __init__(self, path):
-        self.position = None
-        self.context = PositionContext()
-        self.relativity = PositionRelativity.ABSOLUTE
-        self._get_data_from_file(path)
-       
-    def _get_data_from_file(self, path):
-        with open(path, 'r') as position_file:
-            for line in position_file:
-                line_without_trailing_new_line_character = line.rstrip('\n\r')
-                self._get_data_from_line(line_without_trailing_new_line_character)
-    def _get_data_from_line(self, line):
-        try:
-            self.context.receive_field_from_line(line)
-            return
-        except ContextDataNotFound:
-            pass
-        if line.startswith(STORED_POSITION_RELATIVITY_START):
-            self.relativity = PositionRelativity[text_from_string_after_substring(line, STORED_POSITION_RELATIVITY_START)]
-            return
-        if line:
-            self.position = MousePosition.from_text(line)
-    def get_position(self):
-        return self.position
-    def get_context(self):
-        return self.context
-    def get_relativity(self):
-        return self.relativity
-    def __str__(self) -> str:
-        result = f'position: {self.position}'
-        result += 'context:' + str(self.context)
-        result += 'relativity:' + str(self.relativity)
-        return result
-        return result
+import enum
+import os
+import sys
+
+try:
+    from .instrumentation import instrumentation
+    from .file_operations import write_file_atomically
+except ImportError:
+    from instrumentation import instrumentation
+    from file_operations import write_file_atomically
+
+
+class MousePosition:
+    __slots__ = ('horizontal', 'vertical')
+    STRING_START = '('
+    STRING_ENDING = ')'
+    COORDINATE_SEPARATOR = ', '
+    def __init__(self, horizontal: int, vertical: int):
+        self.horizontal = horizontal
+        self.vertical = vertical
+   
+    def get_horizontal(self):
+        return self.horizontal
+    def get_vertical(self):
+        return self.vertical
+   
+    def __add__(self, other):
+        return MousePosition(self.horizontal + other.horizontal, self.vertical + other.vertical)
+    def __iadd__(self, other):
+        self.horizontal += other.horizontal
+        self.vertical += other.vertical
+        return self
+    def __sub__(self, other):
+        return MousePosition(self.horizontal - other.horizontal, self.vertical - other.vertical)
+    def __isub__(self, other):
+        self.horizontal -= other.horizontal
+        self.vertical -= other.vertical
+        return self
+
+    def __str__(self) -> str:
+        return MousePosition.STRING_START + str(self.horizontal) + MousePosition.COORDINATE_SEPARATOR \
+        + str(self.vertical) + MousePosition.STRING_ENDING
+
+    #assumes that the text properly represents a mouse position object and raises ValueError otherwise
+    @staticmethod
+    def from_text(text: str):
+        horizontal_start = text.index(MousePosition.STRING_START) + 1
+        horizontal_ending = text.index(MousePosition.COORDINATE_SEPARATOR, horizontal_start)
+        vertical_ending = text.index(MousePosition.STRING_ENDING, horizontal_ending)
+        return MousePosition(int(text[horizontal_start : horizontal_ending]), int(text[horizontal_ending + 1 : vertical_ending]))
+
+#Keeps a mouse position stored in a file in memory, only writing the file when the position is set and rereading it when it changes on disk
+class MousePositionFile:
+    def __init__(self, folder: str, name: str):
+        self.folder = folder
+        self.name = name
+        self.position = MousePosition(0, 0)
+        self.file_version = None
+        self._retrieve_position_if_file_changed()
+       
+    def get(self):
+        self._retrieve_position_if_file_changed()
+        return self.position
+       
+    def set(self, position: MousePosition):
+        self.position = position
+        self._store_position()
+   
+    def _store_position(self):
+        self._make_directory_if_nonexistent()
+        instrumentation.count_file_opened()
+        write_file_atomically(self.get_path(), str(self.position))
+        self.file_version = self._get_file_version()
+
+    def _retrieve_position_if_file_changed(self):
+        file_version = self._get_file_version()
+        if file_version is not None and file_version != self.file_version:
+            self._retrieve_position()
+            self.file_version = file_version
+
+    def _get_file_version(self):
+        try:
+            file_status = os.stat(self.get_path())
+        except FileNotFoundError:
+            return None
+        return file_status.st_mtime_ns, file_status.st_size
+   
+    def _retrieve_position(self):
+        instrumentation.count_file_opened()
+        with open(self.get_path(), 'r') as position_file:
+            position_text = position_file.readline().rstrip('\n\r')
+            self.position = MousePosition.from_text(position_text)
+   
+    def get_path(self):
+        return os.path.join(self.folder, self.name)
+   
+    def _make_directory_if_nonexistent(self):
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+
+class ContextDataNotFound(Exception):
+    pass
+
+class PositionFileFormatError(Exception):
+    def __init__(self, source: str, line_number: int, line: str, reason: str):
+        super().__init__(f'{source} line {line_number}: {reason}: {line!r}')
+        self.source = source
+        self.line_number = line_number
+        self.line = line
+
+#Determines when a stored mouse position can be used
+#The fields are interned because many stored positions share the same application, title part, and mode
+class PositionContext:
+    __slots__ = ('app', 'title_part', 'mouse_position_mode')
+    APP_START = 'app:'
+    TITLE_PART_START = 'title:'
+    MOUSE_POSITION_MODE_START = 'mouse position mode:'
+    def __init__(self, app = '', title_part = '', mouse_position_mode = ''):
+        self.app = sys.intern(app)
+        self.title_part = sys.intern(title_part)
+        self.mouse_position_mode = sys.intern(mouse_position_mode)
+
+    def receive_field_from_line(self, text):
+        if text.startswith(PositionContext.APP_START):
+            self.app = sys.intern(text_from_string_after_substring(text, PositionContext.APP_START))
+        elif text.startswith(PositionContext.TITLE_PART_START):
+            self.title_part = sys.intern(text_from_string_after_substring(text, PositionContext.TITLE_PART_START))
+        elif text.startswith(PositionContext.MOUSE_POSITION_MODE_START):
+            self.mouse_position_mode = sys.intern(text_from_string_after_substring(text, PositionContext.MOUSE_POSITION_MODE_START))
+        else:
+            raise ContextDataNotFound('Context data not found within the following text: ' + text)
+
+    def matches_title(self, title):
+        return self.title_part in title
+
+    def matches_app(self, app):
+        return app == self.app or self.app == ''
+
+    def matches_mouse_position_mode(self, mode):
+        return mode == self.mouse_position_mode
+
+    def matches_position_context(self, other):
+        return self.matches_app(other.app) \
+            and self.matches_title(other.title_part) \
+            and self.matches_mouse_position_mode(other.mouse_position_mode)
+
+    def compute_specificity(self):
+        result = 0
+        if self.app:
+            result += 1
+        if self.title_part:
+            result += 1
+        if self.mouse_position_mode: #mode beats application and title part matching
+            result += 3
+        return result
+
+    def __eq__(self, other):
+        return self.app == other.app and self.title_part == other.title_part and self.mouse_position_mode == other.mouse_position_mode
+
+    def __hash__(self):
+        return hash((self.app, self.title_part, self.mouse_position_mode))
+   
+    def __str__(self) -> str:
+        result = ''
+        if self.app:
+            result += PositionContext.APP_START + self.app + '\n'
+        if self.title_part:
+            result += PositionContext.TITLE_PART_START + self.title_part + '\n'
+        if self.mouse_position_mode:
+            result += PositionContext.MOUSE_POSITION_MODE_START + self.mouse_position_mode + '\n'
+        return result
+
+def text_from_string_after_substring(text, substring):
+    return text[len(substring) : ]
+
+class PositionRelativity(enum.Enum):
+    ABSOLUTE = enum.auto()
+    WINDOW = enum.auto()
+    MOUSE = enum.auto()
+    SCREEN = enum.auto()
+
+STORED_POSITION_RELATIVITY_START = 'PositionRelativity.'
+
+#What part of the window positions stored relative to the window are relative to
+#PROPORTIONAL positions are stored as fractions of the window size so that they follow the window when it is resized
+class WindowAnchor(enum.Enum):
+    TOP_LEFT = enum.auto()
+    TOP_RIGHT = enum.auto()
+    BOTTOM_LEFT = enum.auto()
+    BOTTOM_RIGHT = enum.auto()
+    PROPORTIONAL = enum.auto()
+
+#Positions stored relative to a screen also store which screen they are relative to
+#Positions stored relative to the window store their anchor unless it is the top left corner used by older position files
+class PositionFileData:
+    __slots__ = ('position', 'context', 'relativity', 'screen', 'anchor')
+    SCREEN_START = 'screen:'
+    ANCHOR_START = 'anchor:'
+    def __init__(self, path = ''):
+        self.position = None
+        self.context = PositionContext()
+        self.relativity = PositionRelativity.ABSOLUTE
+        self.screen = ''
+        self.anchor = WindowAnchor.TOP_LEFT
+        if path:
+            self._get_data_from_file(path)
+
+    @staticmethod
+    def from_values(position: MousePosition, context: PositionContext, relativity: PositionRelativity, screen: str = '', anchor: WindowAnchor = WindowAnchor.TOP_LEFT):
+        data = PositionFileData()
+        data.position = position
+        data.context = context
+        data.relativity = relativity
+        data.screen = screen
+        data.anchor = anchor
+        return data
+
+    @staticmethod
+    def from_text(text: str, source: str = 'position text'):
+        data = PositionFileData()
+        data._get_data_from_lines(text.splitlines(), source)
+        return data
+       
+    def _get_data_from_file(self, path):
+        instrumentation.count_file_opened()
+        with open(path, 'r') as position_file:
+            self._get_data_from_lines(position_file, path)
+    #Empty text has no position and is left for the caller to skip, but text with other lines and no position is malformed
+    def _get_data_from_lines(self, lines, source):
+        last_line_number = 0
+        last_line = ''
+        for line_number, line in enumerate(lines, 1):
+            line_without_trailing_new_line_character = line.rstrip('\n\r')
+            try:
+                self._get_data_from_line(line_without_trailing_new_line_character)
+            except (ValueError, KeyError) as exception:
+                raise PositionFileFormatError(source, line_number, line_without_trailing_new_line_character, _describe_line_error(exception)) from exception
+            if line_without_trailing_new_line_character:
+                last_line_number = line_number
+                last_line = line_without_trailing_new_line_character
+        if self.position is None and last_line_number:
+            raise PositionFileFormatError(source, last_line_number, last_line, 'no line holds the position')
+    #Every line is classified by its prefix, so only malformed lines raise
+    def _get_data_from_line(self, line):
+        if not line:
+            return
+        if line.startswith(PositionContext.APP_START):
+            self.context.app = sys.intern(line[len(PositionContext.APP_START):])
+        elif line.startswith(PositionContext.TITLE_PART_START):
+            self.context.title_part = sys.intern(line[len(PositionContext.TITLE_PART_START):])
+        elif line.startswith(PositionContext.MOUSE_POSITION_MODE_START):
+            self.context.mouse_position_mode = sys.intern(line[len(PositionContext.MOUSE_POSITION_MODE_START):])
+        elif line.startswith(STORED_POSITION_RELATIVITY_START):
+            self.relativity = PositionRelativity[line[len(STORED_POSITION_RELATIVITY_START):]]
+        elif line.startswith(PositionFileData.SCREEN_START):
+            self.screen = sys.intern(line[len(PositionFileData.SCREEN_START):])
+        elif line.startswith(PositionFileData.ANCHOR_START):
+            self.anchor = WindowAnchor[line[len(PositionFileData.ANCHOR_START):]]
+        else:
+            self.position = MousePosition.from_text(line)
+    def get_position(self):
+        return self.position
+    def get_context(self):
+        return self.context
+    def get_relativity(self):
+        return self.relativity
+    def get_screen(self):
+        return self.screen
+    def get_anchor(self):
+        return self.anchor
+    def get_file_text(self) -> str:
+        result = str(self.context) + str(self.position) + '\n' + str(self.relativity)
+        if self.screen:
+            result += '\n' + PositionFileData.SCREEN_START + self.screen
+        if self.anchor != WindowAnchor.TOP_LEFT:
+            result += '\n' + PositionFileData.ANCHOR_START + self.anchor.name
+        return result
+    def __str__(self) -> str:
+        result = f'position: {self.position}'
+        result += 'context:' + str(self.context)
+        result += 'relativity:' + str(self.relativity)
+        if self.screen:
+            result += 'screen:' + self.screen
+        if self.anchor != WindowAnchor.TOP_LEFT:
+            result += 'anchor:' + self.anchor.name
+        return result
+
+def _describe_line_error(exception):
+    if isinstance(exception, KeyError):
+        return f'unknown position relativity or window anchor {exception}'
+    return 'expected a context field, a position relativity, a screen, a window anchor, or a position like (1, 2)'
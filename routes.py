@@ -0,0 +1,120 @@
+import os
+
+try:
+    from .file_operations import write_file_atomically
+except ImportError:
+    from file_operations import write_file_atomically
+
+
+#A stored position to move to within a route along with what to do once there
+class RouteStep:
+    POSITION_START = 'position:'
+    CLICK = 'click'
+    DELAY_START = 'delay:'
+    def __init__(self, position_name: str, should_click: bool = False, delay_in_milliseconds: int = 0):
+        self.position_name = position_name
+        self.should_click = should_click
+        self.delay_in_milliseconds = delay_in_milliseconds
+
+    def get_position_name(self):
+        return self.position_name
+    def get_should_click(self):
+        return self.should_click
+    def get_delay_in_milliseconds(self):
+        return self.delay_in_milliseconds
+
+    def __str__(self) -> str:
+        result = RouteStep.POSITION_START + self.position_name + '\n'
+        if self.should_click:
+            result += RouteStep.CLICK + '\n'
+        if self.delay_in_milliseconds:
+            result += RouteStep.DELAY_START + str(self.delay_in_milliseconds) + '\n'
+        return result
+
+class RouteFormatError(Exception):
+    pass
+
+#A named sequence of stored positions that get visited one after the other
+class Route:
+    def __init__(self, name: str, steps: list = None):
+        self.name = name
+        self.steps = steps if steps is not None else []
+
+    def get_name(self):
+        return self.name
+    def get_steps(self):
+        return self.steps
+
+    def add_step(self, step: RouteStep):
+        self.steps.append(step)
+
+    def remove_last_step(self):
+        if self.steps:
+            self.steps.pop()
+
+    def set_last_step_delay(self, delay_in_milliseconds: int):
+        if self.steps:
+            self.steps[-1].delay_in_milliseconds = delay_in_milliseconds
+
+    def __str__(self) -> str:
+        return ''.join(str(step) for step in self.steps)
+
+    @staticmethod
+    def from_text(name: str, text: str):
+        route = Route(name)
+        for line in text.splitlines():
+            route._receive_line(line)
+        return route
+
+    def _receive_line(self, line):
+        if line.startswith(RouteStep.POSITION_START):
+            self.add_step(RouteStep(line[len(RouteStep.POSITION_START):]))
+        elif not line:
+            return
+        elif not self.steps:
+            raise RouteFormatError(f'The route {self.name} has the following line before its first position: {line}')
+        elif line == RouteStep.CLICK:
+            self.steps[-1].should_click = True
+        elif line.startswith(RouteStep.DELAY_START):
+            self.steps[-1].delay_in_milliseconds = self._parse_delay(line)
+        else:
+            raise RouteFormatError(f'The route {self.name} has the following unrecognized line: {line}')
+
+    def _parse_delay(self, line):
+        try:
+            return int(line[len(RouteStep.DELAY_START):])
+        except ValueError:
+            raise RouteFormatError(f'The route {self.name} has the following delay that is not a whole number of milliseconds: {line}')
+
+#Stores every route as a text file named after the route and keeps loaded routes in memory
+class RouteStorage:
+    FILE_EXTENSION = '.txt'
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.routes = {}
+
+    def get(self, name: str):
+        if name not in self.routes:
+            path = self._get_path(name)
+            if not os.path.exists(path):
+                return None
+            with open(path, 'r') as route_file:
+                self.routes[name] = Route.from_text(name, route_file.read())
+        return self.routes[name]
+
+    def save(self, route: Route):
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        write_file_atomically(self._get_path(route.get_name()), str(route))
+        self.routes[route.get_name()] = route
+
+    def delete(self, name: str):
+        self.routes.pop(name, None)
+        path = self._get_path(name)
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+
+    def _get_path(self, name):
+        return os.path.join(self.directory, name + RouteStorage.FILE_EXTENSION)
@@ -0,0 +1,54 @@
+from routes import *
+
+import tempfile
+import unittest
+
+
+class TestRoute(unittest.TestCase):
+    def test_text_round_trip(self):
+        route = Route('form', [RouteStep('name field'), RouteStep('submit', True, 250), RouteStep('close', False, 100)])
+
+        parsed_route = Route.from_text('form', str(route))
+
+        self.assertEqual(str(route), str(parsed_route))
+        self.assertEqual(['name field', 'submit', 'close'], [step.get_position_name() for step in parsed_route.get_steps()])
+        self.assertTrue(parsed_route.get_steps()[1].get_should_click())
+        self.assertEqual(250, parsed_route.get_steps()[1].get_delay_in_milliseconds())
+    def test_line_before_first_position_is_rejected(self):
+        with self.assertRaises(RouteFormatError):
+            Route.from_text('broken', 'click\nposition:submit\n')
+    def test_unrecognized_line_is_rejected(self):
+        with self.assertRaises(RouteFormatError):
+            Route.from_text('broken', 'position:submit\nhover\n')
+    def test_malformed_delay_is_rejected(self):
+        with self.assertRaises(RouteFormatError):
+            Route.from_text('broken', 'position:submit\ndelay:soon\n')
+    def test_editing_last_step(self):
+        route = Route('form', [RouteStep('name field'), RouteStep('submit')])
+
+        route.set_last_step_delay(50)
+        route.remove_last_step()
+
+        self.assertEqual(1, len(route.get_steps()))
+        self.assertEqual(0, route.get_steps()[0].get_delay_in_milliseconds())
+
+class TestRouteStorage(unittest.TestCase):
+    def test_saved_route_is_read_by_new_storage(self):
+        with tempfile.TemporaryDirectory() as directory:
+            RouteStorage(directory).save(Route('form', [RouteStep('submit', True)]))
+
+            route = RouteStorage(directory).get('form')
+
+            self.assertEqual('submit', route.get_steps()[0].get_position_name())
+    def test_deleted_route_is_gone(self):
+        with tempfile.TemporaryDirectory() as directory:
+            storage = RouteStorage(directory)
+            storage.save(Route('form'))
+
+            self.assertTrue(storage.delete('form'))
+            self.assertIsNone(storage.get('form'))
+            self.assertFalse(storage.delete('form'))
+
+
+if __name__ == '__main__':
+    unittest.main()
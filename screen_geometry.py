@@ -0,0 +1,64 @@
+try:
+    from .project_types import MousePosition
+except ImportError:
+    from project_types import MousePosition
+
+
+#Positions relative to a screen are stored as fractions of the screen size in units of one ten thousandth
+NORMALIZED_SCREEN_SIZE = 10000
+
+#The rectangle of a single screen along with the identity stored with positions relative to it
+class ScreenGeometry:
+    def __init__(self, identity: str, left: int, top: int, width: int, height: int):
+        self.identity = identity
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+
+    def get_identity(self):
+        return self.identity
+
+    def contains(self, position: MousePosition):
+        return self.left <= position.get_horizontal() < self.left + self.width \
+            and self.top <= position.get_vertical() < self.top + self.height
+
+    def normalize(self, position: MousePosition):
+        horizontal = round((position.get_horizontal() - self.left)*NORMALIZED_SCREEN_SIZE/self.width)
+        vertical = round((position.get_vertical() - self.top)*NORMALIZED_SCREEN_SIZE/self.height)
+        return MousePosition(horizontal, vertical)
+
+    def make_absolute(self, normalized_position: MousePosition):
+        horizontal = self.left + round(normalized_position.get_horizontal()*self.width/NORMALIZED_SCREEN_SIZE)
+        vertical = self.top + round(normalized_position.get_vertical()*self.height/NORMALIZED_SCREEN_SIZE)
+        return MousePosition(horizontal, vertical)
+
+#Remembers the screen rectangles until a display change invalidates them so that walking does not query the screens
+#The first screen returned by the query is treated as the main screen
+class ScreenGeometryCache:
+    def __init__(self, query_screens):
+        self.query_screens = query_screens
+        self.screens = None
+
+    def get_screens(self):
+        if self.screens is None:
+            self.screens = self.query_screens()
+        return self.screens
+
+    def invalidate(self):
+        self.screens = None
+
+    def find_screen_containing(self, position: MousePosition):
+        screens = self.get_screens()
+        for screen in screens:
+            if screen.contains(position):
+                return screen
+        return screens[0] if screens else None
+
+    #Falls back to the main screen when the screen with the identity is no longer connected
+    def find_screen_with_identity(self, identity: str):
+        screens = self.get_screens()
+        for screen in screens:
+            if screen.get_identity() == identity:
+                return screen
+        return screens[0] if screens else None
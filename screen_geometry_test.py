@@ -0,0 +1,58 @@
+from screen_geometry import *
+
+import unittest
+
+
+def create_screens():
+    return [ScreenGeometry('0', 0, 0, 1920, 1080), ScreenGeometry('side', 1920, -200, 1280, 1024)]
+
+class TestScreenGeometry(unittest.TestCase):
+    def test_normalized_position_is_restored(self):
+        screen = ScreenGeometry('side', 1920, -200, 1280, 1024)
+        position = MousePosition(2560, 312)
+
+        normalized_position = screen.normalize(position)
+        absolute_position = screen.make_absolute(normalized_position)
+
+        self.assertEqual(5000, normalized_position.get_horizontal())
+        self.assertEqual(5000, normalized_position.get_vertical())
+        self.assertEqual(2560, absolute_position.get_horizontal())
+        self.assertEqual(312, absolute_position.get_vertical())
+    def test_normalized_position_scales_with_resolution(self):
+        normalized_position = ScreenGeometry('0', 0, 0, 1920, 1080).normalize(MousePosition(480, 270))
+
+        absolute_position = ScreenGeometry('0', 0, 0, 3840, 2160).make_absolute(normalized_position)
+
+        self.assertEqual(960, absolute_position.get_horizontal())
+        self.assertEqual(540, absolute_position.get_vertical())
+
+class TestScreenGeometryCache(unittest.TestCase):
+    def setUp(self):
+        self.query_count = 0
+        self.screens = create_screens()
+        self.cache = ScreenGeometryCache(self.query_screens)
+
+    def query_screens(self):
+        self.query_count += 1
+        return self.screens
+
+    def test_screens_are_queried_once_until_invalidated(self):
+        self.cache.find_screen_with_identity('side')
+        self.cache.find_screen_containing(MousePosition(5, 5))
+        self.assertEqual(1, self.query_count)
+
+        self.cache.invalidate()
+        self.cache.find_screen_with_identity('side')
+
+        self.assertEqual(2, self.query_count)
+    def test_finds_screen_containing_position(self):
+        self.assertEqual('side', self.cache.find_screen_containing(MousePosition(2000, -100)).get_identity())
+        self.assertEqual('0', self.cache.find_screen_containing(MousePosition(100, 100)).get_identity())
+    def test_missing_screen_falls_back_to_main_screen(self):
+        self.screens = self.screens[:1]
+
+        self.assertEqual('0', self.cache.find_screen_with_identity('side').get_identity())
+        self.assertEqual('0', self.cache.find_screen_containing(MousePosition(2000, -100)).get_identity())
+
+if __name__ == '__main__':
+    unittest.main()
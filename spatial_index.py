@@ -0,0 +1,117 @@
+import math
+
+try:
+    from .project_types import MousePosition
+except ImportError:
+    from project_types import MousePosition
+
+
+#Screen coordinates grow downward, so up is the negative vertical direction
+DIRECTIONS = {
+    'left': (-1, 0),
+    'right': (1, 0),
+    'up': (0, -1),
+    'down': (0, 1),
+}
+
+#Buckets absolute positions into square cells so that nearest position and rectangle queries only look at nearby cells
+class SpatialGrid:
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+        self.smallest_cell = None
+        self.largest_cell = None
+
+    def insert(self, position: MousePosition, item):
+        cell = self._get_cell(position.get_horizontal(), position.get_vertical())
+        self.cells.setdefault(cell, []).append((position, item))
+        self.count += 1
+        if self.smallest_cell is None:
+            self.smallest_cell = cell
+            self.largest_cell = cell
+        else:
+            self.smallest_cell = (min(self.smallest_cell[0], cell[0]), min(self.smallest_cell[1], cell[1]))
+            self.largest_cell = (max(self.largest_cell[0], cell[0]), max(self.largest_cell[1], cell[1]))
+
+    def __len__(self):
+        return self.count
+
+    #Returns the (position, item) pair closest to the position that satisfies the predicate, or None if there is none
+    def find_nearest(self, position: MousePosition, predicate = None):
+        if not self.count:
+            return None
+        horizontal, vertical = position.get_horizontal(), position.get_vertical()
+        center_cell = self._get_cell(horizontal, vertical)
+        best_entry = None
+        best_squared_distance = None
+        for ring in range(self._compute_largest_ring(center_cell) + 1):
+            #Every cell in this ring and beyond is at least (ring - 1) cells away from the position
+            if best_entry is not None and (ring - 1)*self.cell_size > math.sqrt(best_squared_distance):
+                break
+            for cell in compute_ring_cells(center_cell, ring):
+                for entry in self.cells.get(cell, ()):
+                    entry_position = entry[0]
+                    squared_distance = (entry_position.get_horizontal() - horizontal)**2 + (entry_position.get_vertical() - vertical)**2
+                    if (best_squared_distance is None or squared_distance < best_squared_distance) and (predicate is None or predicate(entry)):
+                        best_entry = entry
+                        best_squared_distance = squared_distance
+        return best_entry
+
+    def find_nearest_in_direction(self, position: MousePosition, direction: str):
+        return self.find_nearest(position, lambda entry: is_in_direction(position, entry[0], direction))
+
+    #Returns every (position, item) pair inside the rectangle including its edges
+    def find_in_rectangle(self, left: int, top: int, right: int, bottom: int):
+        if not self.count:
+            return []
+        smallest_horizontal_cell, smallest_vertical_cell = self._get_cell(left, top)
+        largest_horizontal_cell, largest_vertical_cell = self._get_cell(right, bottom)
+        smallest_horizontal_cell = max(smallest_horizontal_cell, self.smallest_cell[0])
+        smallest_vertical_cell = max(smallest_vertical_cell, self.smallest_cell[1])
+        largest_horizontal_cell = min(largest_horizontal_cell, self.largest_cell[0])
+        largest_vertical_cell = min(largest_vertical_cell, self.largest_cell[1])
+        result = []
+        for horizontal_cell in range(smallest_horizontal_cell, largest_horizontal_cell + 1):
+            for vertical_cell in range(smallest_vertical_cell, largest_vertical_cell + 1):
+                for entry in self.cells.get((horizontal_cell, vertical_cell), ()):
+                    entry_position = entry[0]
+                    if left <= entry_position.get_horizontal() <= right and top <= entry_position.get_vertical() <= bottom:
+                        result.append(entry)
+        return result
+
+    def _get_cell(self, horizontal, vertical):
+        return horizontal//self.cell_size, vertical//self.cell_size
+
+    def _compute_largest_ring(self, center_cell):
+        return max(
+            abs(center_cell[0] - self.smallest_cell[0]),
+            abs(center_cell[0] - self.largest_cell[0]),
+            abs(center_cell[1] - self.smallest_cell[1]),
+            abs(center_cell[1] - self.largest_cell[1]),
+        )
+
+def compute_ring_cells(center_cell, ring):
+    center_horizontal, center_vertical = center_cell
+    if ring == 0:
+        return [center_cell]
+    cells = []
+    for horizontal in range(center_horizontal - ring, center_horizontal + ring + 1):
+        cells.append((horizontal, center_vertical - ring))
+        cells.append((horizontal, center_vertical + ring))
+    for vertical in range(center_vertical - ring + 1, center_vertical + ring):
+        cells.append((center_horizontal - ring, vertical))
+        cells.append((center_horizontal + ring, vertical))
+    return cells
+
+#A position counts as being in a direction when it lies within 45 degrees of that direction
+def is_in_direction(origin: MousePosition, position: MousePosition, direction: str):
+    horizontal_direction, vertical_direction = DIRECTIONS[direction]
+    horizontal_offset = position.get_horizontal() - origin.get_horizontal()
+    vertical_offset = position.get_vertical() - origin.get_vertical()
+    distance_along_direction = horizontal_offset*horizontal_direction + vertical_offset*vertical_direction
+    distance_across_direction = abs(horizontal_offset*vertical_direction - vertical_offset*horizontal_direction)
+    return distance_along_direction > 0 and distance_across_direction <= distance_along_direction
+
+def compute_distance(first: MousePosition, second: MousePosition):
+    return math.hypot(first.get_horizontal() - second.get_horizontal(), first.get_vertical() - second.get_vertical())
@@ -0,0 +1,71 @@
+from spatial_index import *
+from project_types import MousePosition
+
+import random
+import unittest
+
+
+def create_random_grid(generator, count, cell_size = 50):
+    grid = SpatialGrid(cell_size)
+    entries = []
+    for number in range(count):
+        position = MousePosition(generator.randrange(-500, 2500), generator.randrange(-500, 1500))
+        grid.insert(position, number)
+        entries.append((position, number))
+    return grid, entries
+
+def find_nearest_distance_by_scanning(entries, position, predicate = None):
+    distances = [compute_distance(position, entry[0]) for entry in entries if predicate is None or predicate(entry)]
+    return min(distances) if distances else None
+
+class TestSpatialGrid(unittest.TestCase):
+    def test_empty_grid_finds_nothing(self):
+        grid = SpatialGrid()
+
+        self.assertIsNone(grid.find_nearest(MousePosition(0, 0)))
+        self.assertEqual([], grid.find_in_rectangle(0, 0, 100, 100))
+    def test_nearest_matches_scanning_every_position(self):
+        generator = random.Random(3)
+        grid, entries = create_random_grid(generator, 300)
+        for _ in range(200):
+            position = MousePosition(generator.randrange(-1000, 3000), generator.randrange(-1000, 2000))
+
+            nearest_position, _ = grid.find_nearest(position)
+
+            self.assertEqual(find_nearest_distance_by_scanning(entries, position), compute_distance(position, nearest_position))
+    def test_nearest_in_direction_matches_scanning_every_position(self):
+        generator = random.Random(4)
+        grid, entries = create_random_grid(generator, 200)
+        for _ in range(100):
+            position = MousePosition(generator.randrange(0, 2000), generator.randrange(0, 1000))
+            for direction in DIRECTIONS:
+                predicate = lambda entry: is_in_direction(position, entry[0], direction)
+
+                nearest = grid.find_nearest_in_direction(position, direction)
+
+                expected_distance = find_nearest_distance_by_scanning(entries, position, predicate)
+                if expected_distance is None:
+                    self.assertIsNone(nearest)
+                else:
+                    self.assertEqual(expected_distance, compute_distance(position, nearest[0]))
+    def test_rectangle_matches_scanning_every_position(self):
+        generator = random.Random(5)
+        grid, entries = create_random_grid(generator, 300)
+
+        found_items = sorted(item for _, item in grid.find_in_rectangle(100, 200, 900, 650))
+
+        expected_items = [item for position, item in entries if 100 <= position.get_horizontal() <= 900 and 200 <= position.get_vertical() <= 650]
+        self.assertEqual(expected_items, found_items)
+
+class TestIsInDirection(unittest.TestCase):
+    def test_directions_use_screen_coordinates(self):
+        origin = MousePosition(100, 100)
+
+        self.assertTrue(is_in_direction(origin, MousePosition(150, 120), 'right'))
+        self.assertTrue(is_in_direction(origin, MousePosition(90, 20), 'up'))
+        self.assertFalse(is_in_direction(origin, MousePosition(90, 20), 'down'))
+        self.assertFalse(is_in_direction(origin, MousePosition(110, 200), 'right'))
+        self.assertFalse(is_in_direction(origin, origin, 'left'))
+
+if __name__ == '__main__':
+    unittest.main()
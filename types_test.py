@@ -1,77 +1,191 @@
-from project_types import *
-
-import unittest
-
-
-class TestMousePosition(unittest.TestCase):
-    def test_accessors_return_expected(self):
-        horizontal = 1
-        vertical = 2
-        position = MousePosition(horizontal, vertical)
-
-        self.assertEqual(horizontal, position.get_horizontal())
-        self.assertEqual(vertical, position.get_vertical())
-    def test_one_two_string_as_expected(self):
-        horizontal = 1
-        vertical = 2
-        position = MousePosition(horizontal, vertical)
-
-        expected_string = f'({horizontal}, {vertical})'
-
-        self.assertEqual(str(position), expected_string)
-    def test_parses_string_properly(self):
-        text = '(1, 2)'
-        actual_position = MousePosition.from_text(text)
-
-        expected_position = MousePosition(1, 2)
-
-        self.assertEqual(expected_position.get_horizontal(), actual_position.get_horizontal())
-        self.assertEqual(expected_position.get_vertical(), actual_position.get_vertical())
-    def test_assign_add(self):
-        original = MousePosition(10, 20)
-        other = MousePosition(2, 3)
-
-        original += other
-
-        expected_horizontal = 10 + 2
-        expected_vertical = 20 + 3
-
-        self.assertEqual(expected_horizontal, original.get_horizontal())
-        self.assertEqual(expected_vertical, original.get_vertical())
-    def test_add(self):
-        original = MousePosition(1, 2)
-        other = MousePosition(14, 200)
-
-        result = original + other
-
-        expected_horizontal = 1 + 14
-        expected_vertical = 2 + 200
-
-        self.assertEqual(expected_horizontal, result.get_horizontal())
-        self.assertEqual(expected_vertical, result.get_vertical())
-    def test_assign_sub(self):
-        original = MousePosition(10, 20)
-        other = MousePosition(1, 2)
-
-        original -= other
-
-        expected_horizontal = 10 - 1
-        expected_vertical = 20 - 2
-
-        self.assertEqual(expected_horizontal, original.get_horizontal())
-        self.assertEqual(expected_vertical, original.get_vertical())
-    def test_sub(self):
-        original = MousePosition(1, 2)
-        other = MousePosition(239, 175)
-
-        result = original - other
-
-        expected_horizontal = 1 - 239
-        expected_vertical = 2 - 175
-
-        self.assertEqual(expected_horizontal, result.get_horizontal())
-        self.assertEqual(expected_vertical, result.get_vertical())
-
-
-if __name__ == '__main__':
+from project_types import *
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+
+def measure_allocated_bytes(create):
+    tracemalloc.start()
+    try:
+        result = create()
+        allocated_bytes, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return allocated_bytes, result
+
+class TestMousePosition(unittest.TestCase):
+    def test_accessors_return_expected(self):
+        horizontal = 1
+        vertical = 2
+        position = MousePosition(horizontal, vertical)
+
+        self.assertEqual(horizontal, position.get_horizontal())
+        self.assertEqual(vertical, position.get_vertical())
+    def test_one_two_string_as_expected(self):
+        horizontal = 1
+        vertical = 2
+        position = MousePosition(horizontal, vertical)
+
+        expected_string = f'({horizontal}, {vertical})'
+
+        self.assertEqual(str(position), expected_string)
+    def test_parses_string_properly(self):
+        text = '(1, 2)'
+        actual_position = MousePosition.from_text(text)
+
+        expected_position = MousePosition(1, 2)
+
+        self.assertEqual(expected_position.get_horizontal(), actual_position.get_horizontal())
+        self.assertEqual(expected_position.get_vertical(), actual_position.get_vertical())
+    def test_assign_add(self):
+        original = MousePosition(10, 20)
+        other = MousePosition(2, 3)
+
+        original += other
+
+        expected_horizontal = 10 + 2
+        expected_vertical = 20 + 3
+
+        self.assertEqual(expected_horizontal, original.get_horizontal())
+        self.assertEqual(expected_vertical, original.get_vertical())
+    def test_add(self):
+        original = MousePosition(1, 2)
+        other = MousePosition(14, 200)
+
+        result = original + other
+
+        expected_horizontal = 1 + 14
+        expected_vertical = 2 + 200
+
+        self.assertEqual(expected_horizontal, result.get_horizontal())
+        self.assertEqual(expected_vertical, result.get_vertical())
+    def test_assign_sub(self):
+        original = MousePosition(10, 20)
+        other = MousePosition(1, 2)
+
+        original -= other
+
+        expected_horizontal = 10 - 1
+        expected_vertical = 20 - 2
+
+        self.assertEqual(expected_horizontal, original.get_horizontal())
+        self.assertEqual(expected_vertical, original.get_vertical())
+    def test_sub(self):
+        original = MousePosition(1, 2)
+        other = MousePosition(239, 175)
+
+        result = original - other
+
+        expected_horizontal = 1 - 239
+        expected_vertical = 2 - 175
+
+        self.assertEqual(expected_horizontal, result.get_horizontal())
+        self.assertEqual(expected_vertical, result.get_vertical())
+
+
+class TestMousePositionFile(unittest.TestCase):
+    def test_file_is_not_created_until_set(self):
+        with tempfile.TemporaryDirectory() as directory:
+            position_file = MousePositionFile(os.path.join(directory, 'data'), 'reference point')
+
+            self.assertEqual(0, position_file.get().get_horizontal())
+            self.assertFalse(os.path.exists(position_file.get_path()))
+    def test_set_position_is_read_by_new_object(self):
+        with tempfile.TemporaryDirectory() as directory:
+            MousePositionFile(directory, 'reference point').set(MousePosition(3, 4))
+
+            position = MousePositionFile(directory, 'reference point').get()
+
+            self.assertEqual(3, position.get_horizontal())
+            self.assertEqual(4, position.get_vertical())
+    def test_rereads_file_changed_on_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            position_file = MousePositionFile(directory, 'reference point')
+            position_file.set(MousePosition(1, 2))
+            with open(position_file.get_path(), 'w') as file:
+                file.write('(100, 200)')
+
+            position = position_file.get()
+
+            self.assertEqual(100, position.get_horizontal())
+            self.assertEqual(200, position.get_vertical())
+
+class TestPositionFileData(unittest.TestCase):
+    def test_parses_file_written_by_get_file_text(self):
+        context = PositionContext('application', 'part', 'editing')
+        text = PositionFileData.from_values(MousePosition(-5, 12), context, PositionRelativity.WINDOW).get_file_text()
+
+        data = PositionFileData.from_text(text)
+
+        self.assertEqual(-5, data.get_position().get_horizontal())
+        self.assertEqual(12, data.get_position().get_vertical())
+        self.assertEqual(context, data.get_context())
+        self.assertEqual(PositionRelativity.WINDOW, data.get_relativity())
+    def test_parses_screen_relative_position(self):
+        text = PositionFileData.from_values(MousePosition(5000, 2500), PositionContext(), PositionRelativity.SCREEN, 'side').get_file_text()
+
+        data = PositionFileData.from_text(text)
+
+        self.assertEqual(PositionRelativity.SCREEN, data.get_relativity())
+        self.assertEqual('side', data.get_screen())
+        self.assertEqual(2500, data.get_position().get_vertical())
+    def test_parses_window_anchor(self):
+        text = PositionFileData.from_values(MousePosition(-5, -5), PositionContext(), PositionRelativity.WINDOW, anchor = WindowAnchor.BOTTOM_RIGHT).get_file_text()
+
+        data = PositionFileData.from_text(text)
+
+        self.assertEqual(WindowAnchor.BOTTOM_RIGHT, data.get_anchor())
+    def test_top_left_anchor_is_not_written(self):
+        text = PositionFileData.from_values(MousePosition(5, 5), PositionContext(), PositionRelativity.WINDOW).get_file_text()
+
+        self.assertNotIn(PositionFileData.ANCHOR_START, text)
+        self.assertEqual(WindowAnchor.TOP_LEFT, PositionFileData.from_text(text).get_anchor())
+    def test_parses_windows_line_endings_and_blank_lines(self):
+        data = PositionFileData.from_text('app:application\r\n\r\n(1, 2)\r\n')
+
+        self.assertEqual('application', data.get_context().app)
+        self.assertEqual(2, data.get_position().get_vertical())
+        self.assertEqual(PositionRelativity.ABSOLUTE, data.get_relativity())
+    def test_malformed_position_reports_line_number(self):
+        with self.assertRaises(PositionFileFormatError) as context:
+            PositionFileData.from_text('app:application\n(1; 2)', 'name.txt')
+
+        self.assertEqual(2, context.exception.line_number)
+        self.assertIn('name.txt', str(context.exception))
+    def test_text_without_position_is_rejected(self):
+        with self.assertRaises(PositionFileFormatError) as context:
+            PositionFileData.from_text('app:application\n\nPositionRelativity.WINDOW\n', 'name.txt')
+
+        self.assertEqual(3, context.exception.line_number)
+    def test_empty_text_has_no_position(self):
+        self.assertIsNone(PositionFileData.from_text('\n').get_position())
+    def test_unknown_relativity_reports_line_number(self):
+        with self.assertRaises(PositionFileFormatError) as context:
+            PositionFileData.from_text('(1, 2)\nPositionRelativity.SIDEWAYS')
+
+        self.assertEqual(2, context.exception.line_number)
+        self.assertIn('SIDEWAYS', str(context.exception))
+
+class TestMemoryFootprint(unittest.TestCase):
+    def test_slotted_position_is_smaller_than_dictionary_backed_position(self):
+        class DictionaryBackedPosition:
+            def __init__(self, horizontal, vertical):
+                self.horizontal = horizontal
+                self.vertical = vertical
+        dictionary_bytes, _ = measure_allocated_bytes(lambda: [DictionaryBackedPosition(number, number) for number in range(10000)])
+        slotted_bytes, _ = measure_allocated_bytes(lambda: [MousePosition(number, number) for number in range(10000)])
+
+        self.assertFalse(hasattr(MousePosition(0, 0), '__dict__'))
+        self.assertLess(slotted_bytes, dictionary_bytes)
+    def test_parsed_contexts_share_interned_strings(self):
+        text = 'app:application\ntitle:part\n(1, 2)'
+        first_context = PositionFileData.from_text(text).get_context()
+        second_context = PositionFileData.from_text(text).get_context()
+
+        self.assertIs(first_context.app, second_context.app)
+        self.assertIs(first_context.title_part, second_context.title_part)
+
+if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,44 @@
+import time
+
+
+#Remembers values describing the active window until window events invalidate or update them or their lifetime runs out
+class ActiveWindowContextCache:
+    APPLICATION_NAME = 'application name'
+    TITLE = 'title'
+    RECTANGLE = 'rectangle'
+    def __init__(self, queries: dict, get_lifetime_in_seconds, clock = time.monotonic):
+        self.queries = queries
+        self.get_lifetime_in_seconds = get_lifetime_in_seconds
+        self.clock = clock
+        self.values = {}
+        self.expiration_time = 0
+
+    def get(self, value_name: str):
+        self._forget_values_if_expired()
+        if value_name not in self.values:
+            self.values[value_name] = self.queries[value_name]()
+        return self.values[value_name]
+
+    def get_application_name(self):
+        return self.get(ActiveWindowContextCache.APPLICATION_NAME)
+    def get_title(self):
+        return self.get(ActiveWindowContextCache.TITLE)
+    def get_rectangle(self):
+        return self.get(ActiveWindowContextCache.RECTANGLE)
+
+    #Remembers a value reported by a window event so that the next get does not need to query it
+    def set(self, value_name: str, value):
+        self._forget_values_if_expired()
+        self.values[value_name] = value
+
+    def invalidate(self, value_name: str = ''):
+        if value_name:
+            self.values.pop(value_name, None)
+        else:
+            self.values.clear()
+
+    def _forget_values_if_expired(self):
+        current_time = self.clock()
+        if current_time >= self.expiration_time:
+            self.values.clear()
+            self.expiration_time = current_time + self.get_lifetime_in_seconds()
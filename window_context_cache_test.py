@@ -0,0 +1,74 @@
+from window_context_cache import *
+
+import unittest
+
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0
+    def __call__(self):
+        return self.time
+
+class CountingQuery:
+    def __init__(self, value):
+        self.value = value
+        self.count = 0
+    def __call__(self):
+        self.count += 1
+        return self.value
+
+class TestActiveWindowContextCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.application_name_query = CountingQuery('app')
+        self.title_query = CountingQuery('title')
+        queries = {
+            ActiveWindowContextCache.APPLICATION_NAME: self.application_name_query,
+            ActiveWindowContextCache.TITLE: self.title_query,
+        }
+        self.cache = ActiveWindowContextCache(queries, lambda: 2, self.clock)
+    def test_repeated_gets_query_once(self):
+        self.cache.get_application_name()
+        self.cache.get_application_name()
+
+        self.assertEqual('app', self.cache.get_application_name())
+        self.assertEqual(1, self.application_name_query.count)
+    def test_expired_values_are_queried_again(self):
+        self.cache.get_application_name()
+        self.clock.time = 3
+
+        self.cache.get_application_name()
+
+        self.assertEqual(2, self.application_name_query.count)
+    def test_invalidating_one_value_keeps_the_others(self):
+        self.cache.get_application_name()
+        self.cache.get_title()
+
+        self.cache.invalidate(ActiveWindowContextCache.TITLE)
+        self.cache.get_application_name()
+        self.cache.get_title()
+
+        self.assertEqual(1, self.application_name_query.count)
+        self.assertEqual(2, self.title_query.count)
+    def test_invalidating_everything(self):
+        self.cache.get_application_name()
+        self.application_name_query.value = 'other'
+
+        self.cache.invalidate()
+
+        self.assertEqual('other', self.cache.get_application_name())
+    def test_set_value_is_returned_without_query(self):
+        self.cache.set(ActiveWindowContextCache.TITLE, 'new title')
+
+        self.assertEqual('new title', self.cache.get_title())
+        self.assertEqual(0, self.title_query.count)
+    def test_set_value_expires(self):
+        self.cache.set(ActiveWindowContextCache.TITLE, 'new title')
+
+        self.clock.time = 3
+
+        self.assertEqual('title', self.cache.get_title())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+try:
+    from .project_types import MousePosition, WindowAnchor
+except ImportError:
+    from project_types import MousePosition, WindowAnchor
+
+
+#Positions anchored proportionally are stored as fractions of the window size in units of one ten thousandth
+NORMALIZED_WINDOW_SIZE = 10000
+
+class WindowRectangle:
+    def __init__(self, left: int, top: int, width: int, height: int):
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+
+    def get_top_left(self):
+        return MousePosition(self.left, self.top)
+
+    def __eq__(self, other):
+        return isinstance(other, WindowRectangle) and (self.left, self.top, self.width, self.height) == (other.left, other.top, other.width, other.height)
+
+    def __hash__(self):
+        return hash((self.left, self.top, self.width, self.height))
+
+    #Returns the corner of the window that positions with the anchor are stored relative to
+    def get_anchor_corner(self, anchor: WindowAnchor):
+        right = self.left + self.width
+        bottom = self.top + self.height
+        if anchor == WindowAnchor.TOP_RIGHT:
+            return MousePosition(right, self.top)
+        if anchor == WindowAnchor.BOTTOM_LEFT:
+            return MousePosition(self.left, bottom)
+        if anchor == WindowAnchor.BOTTOM_RIGHT:
+            return MousePosition(right, bottom)
+        return self.get_top_left()
+
+def make_position_relative_to_window(position: MousePosition, rectangle: WindowRectangle, anchor: WindowAnchor):
+    if anchor == WindowAnchor.PROPORTIONAL:
+        horizontal = round((position.get_horizontal() - rectangle.left)*NORMALIZED_WINDOW_SIZE/max(rectangle.width, 1))
+        vertical = round((position.get_vertical() - rectangle.top)*NORMALIZED_WINDOW_SIZE/max(rectangle.height, 1))
+        return MousePosition(horizontal, vertical)
+    return position - rectangle.get_anchor_corner(anchor)
+
+def make_window_relative_position_absolute(position: MousePosition, rectangle: WindowRectangle, anchor: WindowAnchor):
+    if anchor == WindowAnchor.PROPORTIONAL:
+        horizontal = rectangle.left + round(position.get_horizontal()*rectangle.width/NORMALIZED_WINDOW_SIZE)
+        vertical = rectangle.top + round(position.get_vertical()*rectangle.height/NORMALIZED_WINDOW_SIZE)
+        return MousePosition(horizontal, vertical)
+    return position + rectangle.get_anchor_corner(anchor)
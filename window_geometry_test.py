@@ -0,0 +1,40 @@
+from window_geometry import *
+
+import unittest
+
+
+class TestWindowRelativePositions(unittest.TestCase):
+    def setUp(self):
+        self.rectangle = WindowRectangle(100, 50, 800, 600)
+        self.resized_rectangle = WindowRectangle(100, 50, 400, 300)
+
+    def assert_position(self, horizontal, vertical, position):
+        self.assertEqual((horizontal, vertical), (position.get_horizontal(), position.get_vertical()))
+
+    def test_every_anchor_round_trips(self):
+        position = MousePosition(350, 275)
+        for anchor in WindowAnchor:
+            relative_position = make_position_relative_to_window(position, self.rectangle, anchor)
+
+            self.assert_position(350, 275, make_window_relative_position_absolute(relative_position, self.rectangle, anchor))
+    def test_corner_anchors_keep_distance_from_corner_after_resize(self):
+        position = MousePosition(880, 630)
+
+        relative_position = make_position_relative_to_window(position, self.rectangle, WindowAnchor.BOTTOM_RIGHT)
+
+        self.assert_position(-20, -20, relative_position)
+        self.assert_position(480, 330, make_window_relative_position_absolute(relative_position, self.resized_rectangle, WindowAnchor.BOTTOM_RIGHT))
+        top_right_position = make_position_relative_to_window(position, self.rectangle, WindowAnchor.TOP_RIGHT)
+        self.assert_position(480, 630, make_window_relative_position_absolute(top_right_position, self.resized_rectangle, WindowAnchor.TOP_RIGHT))
+    def test_proportional_anchor_scales_with_window(self):
+        relative_position = make_position_relative_to_window(MousePosition(500, 350), self.rectangle, WindowAnchor.PROPORTIONAL)
+
+        self.assert_position(5000, 5000, relative_position)
+        self.assert_position(300, 200, make_window_relative_position_absolute(relative_position, self.resized_rectangle, WindowAnchor.PROPORTIONAL))
+    def test_proportional_anchor_handles_empty_window(self):
+        relative_position = make_position_relative_to_window(MousePosition(100, 50), WindowRectangle(100, 50, 0, 0), WindowAnchor.PROPORTIONAL)
+
+        self.assert_position(0, 0, relative_position)
+
+if __name__ == '__main__':
+    unittest.main()
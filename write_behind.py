@@ -0,0 +1,50 @@
+import threading
+
+
+#Runs operations on a background thread, keeping only the latest operation submitted for every key that has not run yet
+class WriteBehindQueue:
+    def __init__(self):
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.running = False
+        self.worker = None
+
+    def submit(self, key, operation):
+        with self.condition:
+            self.pending.pop(key, None)
+            self.pending[key] = operation
+            self._start_worker_if_needed()
+            self.condition.notify_all()
+
+    def has_pending(self, key):
+        with self.condition:
+            return key in self.pending
+
+    #Returns whether every submitted operation finished before the timeout
+    def wait_until_flushed(self, timeout: float = None):
+        with self.condition:
+            return self.condition.wait_for(self._is_flushed, timeout)
+
+    def _is_flushed(self):
+        return not self.pending and not self.running
+
+    def _start_worker_if_needed(self):
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target = self._run_operations, name = 'mouse position storage writer', daemon = True)
+            self.worker.start()
+
+    def _run_operations(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending)
+                key = next(iter(self.pending))
+                operation = self.pending.pop(key)
+                self.running = True
+            try:
+                operation()
+            except Exception as exception:
+                print(f'Could not save the mouse position storage change for {key}: {exception}')
+            finally:
+                with self.condition:
+                    self.running = False
+                    self.condition.notify_all()
@@ -0,0 +1,53 @@
+from write_behind import *
+
+import threading
+import unittest
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    def test_runs_submitted_operations(self):
+        queue = WriteBehindQueue()
+        results = []
+
+        for number in range(10):
+            queue.submit(number, lambda number = number: results.append(number))
+
+        self.assertTrue(queue.wait_until_flushed(5))
+        self.assertEqual(list(range(10)), results)
+    def test_keeps_only_latest_pending_operation_for_key(self):
+        queue = WriteBehindQueue()
+        release_worker = threading.Event()
+        results = []
+        queue.submit('blocker', release_worker.wait)
+
+        queue.submit('position', lambda: results.append('old'))
+        queue.submit('position', lambda: results.append('new'))
+        self.assertTrue(queue.has_pending('position'))
+        release_worker.set()
+
+        self.assertTrue(queue.wait_until_flushed(5))
+        self.assertEqual(['new'], results)
+        self.assertFalse(queue.has_pending('position'))
+    def test_failing_operation_does_not_stop_later_operations(self):
+        queue = WriteBehindQueue()
+        results = []
+        def fail():
+            raise OSError('disk unavailable')
+
+        queue.submit('first', fail)
+        queue.submit('second', lambda: results.append('second'))
+
+        self.assertTrue(queue.wait_until_flushed(5))
+        self.assertEqual(['second'], results)
+    def test_wait_times_out_while_operation_runs(self):
+        queue = WriteBehindQueue()
+        release_worker = threading.Event()
+        queue.submit('blocker', release_worker.wait)
+
+        self.assertFalse(queue.wait_until_flushed(0.01))
+        release_worker.set()
+        self.assertTrue(queue.wait_until_flushed(5))
+
+
+if __name__ == '__main__':
+    unittest.main()